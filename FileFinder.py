@@ -1,36 +1,35 @@
+# Здесь только то, что нужно для первого окна. Тяжелые модули (конвейер с
+# пулами и zipfile, SQLite, сигнатуры, subprocess, webbrowser) импортируются
+# при первом использовании: exe запускается быстрее, а рабочие процессы
+# анализа, которые импортируют этот модуль заново, не тянут лишнего.
 import os
-import zipfile
-import subprocess
 import tkinter as tk
-from tkinter import messagebox, Listbox, Scrollbar, RIGHT, LEFT, BOTH, END, Y, X
-import webbrowser
+from tkinter import messagebox, ttk, Listbox, Scrollbar, RIGHT, LEFT, BOTH, END, Y, X
 from datetime import datetime
-import asyncio
-from concurrent.futures import ThreadPoolExecutor
+import threading
+import queue
+import time
 import logging
 import json
 
+from filefinder.metrics import STOP_REASONS, format_summary
+from filefinder.paths import TEMP_DIR, INDEX_PATH, HISTORY_PATH, LEGACY_HISTORY_PATH, METRICS_PATH, ensure_temp_dir
+from filefinder.results import ResultModel
+from filefinder.resultview import VirtualResults
+from filefinder.walker import DEFAULT_DEFER, DEFAULT_FIRST, FILE, ScanPolicy, WalkProgress
+
 CONFIG_FILE = 'config.json'
-TEMP_DIR = os.path.join(os.getenv('TEMP'), 'FileFinder')
-if not os.path.exists(TEMP_DIR):
-    os.makedirs(TEMP_DIR)
+SIGNATURES_FILE = 'signatures.json'  # Внешняя база сигнатур, дополняет встроенные
+SIGNATURES_CACHE = 'signatures.cache'  # Скомпилированная база, пересобирается при изменении источников
+KNOWN_GOOD_FILE = 'known_good.txt'  # Хеши заведомо чистых файлов, по одному в строке
+KNOWN_CHEATS_FILE = 'known_cheats.txt'  # Хеши известных читов
+ensure_temp_dir()
 
+# Настройка логирования: один журнал в рабочей папке, уровень меняется в config.json
 log_path = os.path.join(TEMP_DIR, 'app.log')
-logging.basicConfig(filename=log_path, level=logging.DEBUG, format='%(asctime)s - %(levelname)s - %(message)s')
+logging.basicConfig(filename=log_path, level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
 logger = logging.getLogger()
 
-def is_hidden(path):
-    """Проверка на скрытые файлы и папки."""
-    if os.name == 'nt':
-        # На Windows файлы/папки скрыты, если у них установлен скрытый атрибут
-        try:
-            return bool(os.stat(path).st_file_attributes & 0x2)
-        except AttributeError:
-            return False
-    else:
-        # На Unix-подобных системах скрыты те, которые начинаются с '.'
-        return os.path.basename(path).startswith('.')
-
 def open_executable_directory():
     """Открыть папку, где находится исполняемый файл."""
     try:
@@ -38,35 +37,63 @@ def open_executable_directory():
         if os.name == 'nt':  # Windows
             os.startfile(exe_dir)
         elif os.name == 'posix':  # macOS, Linux
+            import subprocess
             subprocess.call(['xdg-open', exe_dir])  # Используем xdg-open для Linux
     except Exception as e:
         logger.error(f"Ошибка открытия папки {exe_dir}: {e}")
         messagebox.showerror("Ошибка", f"Ошибка открытия папки {exe_dir}: {e}")
 
 
-def check_jar_for_suspicious_strings(file_path, suspicious_keywords):
-    """Проверка содержимого .jar файла на подозрительные строки."""
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+
+# Сигнатуры читов: компилируются один раз и используются всеми проверками.
+# Загружаются в фоне при запуске, окно при этом уже показано
+signatures = None
+signatures_error = None
+signatures_ready = threading.Event()
+startup_thread = None
+startup_lock = threading.Lock()
+
+
+def load_signatures():
+    """Загрузить базу сигнатур и подготовить конвейер проверки. Выполняется в фоновом потоке."""
+    global signatures, signatures_error
     try:
-        with zipfile.ZipFile(file_path, 'r') as jar_file:
-            for file in jar_file.namelist():
-                with jar_file.open(file) as f:
-                    content = f.read().decode('utf-8', errors='ignore')
-                    if any(keyword in content.lower() for keyword in suspicious_keywords):
-                        return True
-        return False
+        from filefinder.signatures import SignatureSet
+        started = time.perf_counter()
+        signatures = SignatureSet.load_cached(SIGNATURES_CACHE,
+                                             [path for path in [SIGNATURES_FILE] if os.path.exists(path)],
+                                             known_good_paths=[path for path in [KNOWN_GOOD_FILE] if os.path.exists(path)],
+                                             known_cheat_paths=[path for path in [KNOWN_CHEATS_FILE] if os.path.exists(path)])
+        logger.info(f"База сигнатур загружена за {time.perf_counter() - started:.3f} с")
     except Exception as e:
-        logger.error(f"Ошибка проверки содержимого .jar файла {file_path}: {e}")
-        return False
+        logger.error(f"Ошибка загрузки базы сигнатур: {e}")
+        signatures_error = e
+    finally:
+        signatures_ready.set()
+    if signatures is not None:
+        try:
+            get_scanner()
+        except Exception as e:
+            logger.error(f"Ошибка подготовки проверки: {e}")
 
 
-BASE_DIR = os.path.dirname(os.path.abspath(__file__))
-
-# Настройка логирования
-log_path = os.path.join(BASE_DIR, 'app.log')
-logging.basicConfig(filename=log_path, level=logging.DEBUG, format='%(asctime)s - %(levelname)s - %(message)s')
-logger = logging.getLogger()
+def start_loading():
+    """Запустить фоновую загрузку сигнатур, если она еще не запущена."""
+    global startup_thread
+    with startup_lock:
+        if startup_thread is None:
+            startup_thread = threading.Thread(target=load_signatures, name='filefinder-startup', daemon=True)
+            startup_thread.start()
 
 
+def get_signatures():
+    """База сигнатур; если фоновая загрузка еще идет - дождаться ее."""
+    start_loading()
+    signatures_ready.wait()
+    if signatures is None:
+        raise RuntimeError(f"База сигнатур не загружена: {signatures_error}")
+    return signatures
 
 
 # Цвета для интерфейса
@@ -86,7 +113,18 @@ THEMES = {
 current_theme = 'light'  # По умолчанию светлая тема
 
 configS = {
-    'theme': 'light'
+    'theme': 'light',
+    'scan_threads': None,     # Потоков для анализа файлов (None - по числу ядер)
+    'scan_processes': None,   # Процессов для анализа .jar (None - по числу ядер, на одном ядре без процессов; 0 - без процессов)
+    'log_level': 'INFO',      # Уровень журнала app.log (DEBUG для разбора проблем)
+    'profile': None,          # Профилирование проверки: None, 'cprofile' или 'tracemalloc'
+    'scan_first': [],         # Папки, которые проверяются раньше остальных (кроме mods, versions, config...)
+    'scan_defer': [],         # Папки, которые проверяются в последнюю очередь (кроме assets, saves, logs...)
+    'scan_skip': [],          # Папки, в которые проверка не заходит
+    'stop_after_cheats': None,  # Остановить проверку после стольких найденных читов (None - проверять все)
+    'time_budget': None,      # Сколько секунд проверка обходит папки (None - без ограничения)
+    'bundle_dir': None,       # Папка для пакетов с итогом каждой проверки (None - не сохранять)
+    'bundle_key': None        # Ключ подписи пакетов (None - из переменной FILEFINDER_BUNDLE_KEY)
 }
 
 def apply_theme(widget, theme):
@@ -102,132 +140,83 @@ def apply_theme(widget, theme):
             child.config(bg=colors['button'], fg=colors['text'])
         elif isinstance(child, tk.Frame):
             apply_theme(child, theme)
+    # Таблица результатов - виджет ttk, цвета задаются через стиль
+    ttk.Style(widget).configure('Results.Treeview', background=colors['button'], fieldbackground=colors['button'], foreground=colors['text'])
+
+history = None
 
-def save_run_history(total_files, total_folders, total_cheats):
-    """Сохранить количество запусков проверки, дату/время и информацию о читах."""
-    try:
-        now = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-        history_path = os.path.join(TEMP_DIR, "check_history.txt")
-        
-        if os.path.exists(history_path):
-            with open(history_path, "r") as file:
-                lines = file.readlines()
-            count = int(lines[0].strip().split(': ')[1])
-            count += 1
-            with open(history_path, "w") as file:
-                file.write(f"Запусков: {count}\n")
-                file.write(f"Последний запуск: {now}\n")
-                file.write(f"Обнаружено файлов: {total_files}\n")
-                file.write(f"Обнаружено папок: {total_folders}\n")
-                file.write(f"Обнаружено читов: {total_cheats}\n")
-        else:
-            with open(history_path, "w") as file:
-                file.write("Запусков: 1\n")
-                file.write(f"Первый запуск: {now}\n")
-                file.write(f"Обнаружено файлов: {total_files}\n")
-                file.write(f"Обнаружено папок: {total_folders}\n")
-                file.write(f"Обнаружено читов: {total_cheats}\n")
-        logger.info(f"История проверки сохранена: {total_files} файлов, {total_folders} папок, {total_cheats} читов")
-    except Exception as e:
-        logger.error(f"Ошибка сохранения истории: {e}")
 
+def get_history():
+    """Журнал запусков: открывается при первом обращении, None - если недоступен."""
+    global history
+    if history is None:
+        from filefinder.history import open_history
+        history = open_history(HISTORY_PATH, LEGACY_HISTORY_PATH)
+    return history
 
 
-def load_run_history():
-    """Загрузить историю запусков и отобразить ее в приложении."""
-    history_text = ""
+def save_run_history(started, roots, findings, cancelled, metrics):
+    """Добавить запуск со всеми находками в журнал. Возвращает id запуска или None."""
+    store = get_history()
+    if store is None:
+        return None
     try:
-        history_path = os.path.join(TEMP_DIR, "check_history.txt")
-        if os.path.exists(history_path):
-            with open(history_path, "r") as file:
-                history_text = file.read()
-        else:
-            history_text = "История запусков не найдена."
+        summary = metrics.summary()
+        loaded = get_signatures()
+        run_id = store.record(started.strftime("%Y-%m-%d %H:%M:%S"), datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
+                              summary['wall_seconds'], loaded.version, roots, findings, cancelled, summary,
+                              release=loaded.release)
+        logger.info(f"Запуск {run_id} сохранен в историю: {len(findings)} находок")
+        return run_id
     except Exception as e:
-        logger.error(f"Ошибка загрузки истории: {e}")
-        history_text = "Ошибка загрузки истории."
-    return history_text
+        logger.error(f"Ошибка сохранения истории: {e}")
+        return None
 
 
-def find_files_by_keywords(root_dir, keywords):
-    """Поиск файлов по ключевым словам, включая скрытые файлы."""
-    found_files = []
-    keywords = [keyword.lower() for keyword in keywords]
+def save_bundle(roots, findings, cancelled, metrics):
+    """Сохранить итог проверки в подписанный пакет для сводки по всем компьютерам. Возвращает путь или None."""
     try:
-        for dirpath, dirnames, filenames in os.walk(root_dir):
-            for filename in filenames:
-                full_path = os.path.join(dirpath, filename)
-                is_hidden_file = is_hidden(full_path)
-                
-                filename_lower = filename.lower()
-                if any(keyword in filename_lower for keyword in keywords):
-                    # Указываем, если файл скрыт
-                    if is_hidden_file:
-                        found_files.append(f"{full_path} (скрытый)")
-                    else:
-                        found_files.append(full_path)
+        from filefinder.bundle import bundle_name, load_key, write_bundle
+        key = configS['bundle_key'].encode('utf-8') if configS.get('bundle_key') else load_key()
+        os.makedirs(configS['bundle_dir'], exist_ok=True)
+        summary = metrics.summary()
+        loaded = get_signatures()
+        path = write_bundle(os.path.join(configS['bundle_dir'], bundle_name()), key, findings, roots,
+                            loaded.version, summary['wall_seconds'], cancelled, summary, release=loaded.release)
+        logger.info(f"Пакет проверки сохранен: {path}")
+        return path
     except Exception as e:
-        logger.error(f"Ошибка поиска файлов: {e}")
-        print(f"Ошибка поиска файлов: {e}")
-    return found_files
+        logger.error(f"Ошибка сохранения пакета проверки: {e}")
+        return None
 
 
-def find_folders_by_keywords(root_dir, folder_keywords, blacklisted_folders):
-    """Поиск папок по ключевым словам, включая скрытые папки."""
-    found_folders = set()
-    folder_keywords = [keyword.lower() for keyword in folder_keywords]
-    blacklisted_folders = [folder.lower() for folder in blacklisted_folders]
+def save_scan_metrics(metrics):
+    """Сохранить метрики последней проверки в JSON рядом с историей запусков."""
     try:
-        for dirpath, dirnames, filenames in os.walk(root_dir):
-            for dirname in dirnames:
-                full_path = os.path.join(dirpath, dirname)
-                is_hidden_folder = is_hidden(full_path)
-                
-                dirname_lower = dirname.lower()
-                if dirname_lower in blacklisted_folders:
-                    continue
-                if any(keyword in dirname_lower for keyword in folder_keywords):
-                    # Указываем, если папка скрыта
-                    if is_hidden_folder:
-                        found_folders.add(f"{full_path} (скрытая)")
-                    else:
-                        found_folders.add(full_path)
+        with open(METRICS_PATH, 'w', encoding='utf-8') as file:
+            json.dump(metrics.summary(), file, ensure_ascii=False, indent=2)
     except Exception as e:
-        logger.error(f"Ошибка поиска папок: {e}")
-        print(f"Ошибка поиска папок: {e}")
-    return list(found_folders)
+        logger.error(f"Ошибка сохранения метрик: {e}")
 
-def analyze_jar_file(file_path):
-    """Анализ содержимого .jar файла."""
-    try:
-        with zipfile.ZipFile(file_path, 'r') as jar_file:
-            for file in jar_file.namelist():
-                if any(keyword in file.lower() for keyword in ["xray", "baritone", "meteorclient", "aristois", "killaura", "rage", "antiafk", "autototem", "autoeat", "wallhack"]):
-                    return True
-        return False
-    except Exception as e:
-        print(f"Ошибка анализа файла {file_path}: {e}")
-        return False
 
-def analyze_file(file_path):
-    """Анализ содержимого файла."""
-    try:
-        if file_path.endswith(".jar"):
-            return analyze_jar_file(file_path)
-        with open(file_path, 'r', errors='ignore') as file:
-            content = file.read()
-            cheat_signatures = [
-                "class xray", "baritone", "meteorclient", "aristois",
-                "modded client", "freecam", "aimbot", "esp", "wallhack"
-            ]
-            for signature in cheat_signatures:
-                if signature in content.lower():
-                    return True
-        return False
-    except Exception as e:
-        logger.error(f"Ошибка анализа файла {file_path}: {e}")
-        print(f"Ошибка анализа файла {file_path}: {e}")
-        return False
+scanner = None
+scanner_lock = threading.Lock()
+
+
+def get_scanner():
+    """Общий конвейер проверки: пулы создаются при первой проверке и живут до выхода."""
+    global scanner
+    with scanner_lock:
+        if scanner is None:
+            from filefinder.index import open_index
+            from filefinder.pipeline import Scanner
+            loaded = get_signatures()
+            policy = ScanPolicy(DEFAULT_FIRST + tuple(configS.get('scan_first') or ()),
+                                DEFAULT_DEFER + tuple(configS.get('scan_defer') or ()), configS.get('scan_skip') or ())
+            scanner = Scanner.from_signatures(loaded, index=open_index(INDEX_PATH, loaded.analysis_version),
+                                              threads=configS.get('scan_threads'),
+                                              processes=configS.get('scan_processes'), policy=policy)
+        return scanner
 
 
 def open_folder_of_file(file_path):
@@ -237,6 +226,7 @@ def open_folder_of_file(file_path):
         if os.name == 'nt':  # Windows
             os.startfile(folder_path)
         elif os.name == 'posix':  # macOS, Linux
+            import subprocess
             subprocess.call(['xdg-open', folder_path])  # Используем xdg-open для Linux
     except Exception as e:
         logger.error(f"Ошибка открытия папки {folder_path}: {e}")
@@ -248,96 +238,199 @@ def open_folder_of_path(path):
         if os.name == 'nt':  # Windows
             os.startfile(path)
         elif os.name == 'posix':  # macOS, Linux
+            import subprocess
             subprocess.call(['xdg-open', path])  # Используем xdg-open для Linux
     except Exception as e:
         logger.error(f"Ошибка открытия {path}: {e}")
         print(f"Ошибка открытия {path}: {e}")
 
 
-def find_minecraft_directory():
-    """Найти директорию .minecraft."""
-    home_dir = os.path.expanduser("~")
-    return os.path.join(home_dir, 'AppData', 'Roaming', '.minecraft')
+# Состояние фоновой проверки: поток, флаг отмены и очередь сообщений для главного цикла Tk
+check_thread = None
+check_cancel = threading.Event()
+check_messages = queue.Queue()
+check_progress = None
+check_started = 0.0
 
-async def on_check():
-    """Запуск проверки на читы."""
-    try:
-        listbox.delete(0, END)  # Очищаем список перед новой проверкой
-        root_dir = find_minecraft_directory()
+POLL_INTERVAL_MS = 100  # Период опроса очереди результатов
+POLL_BATCH = 5000  # Максимум находок, переносимых в таблицу за один опрос
+NOTES_LINES = 10  # Сколько последних сообщений показывать под таблицей
+WATCH_LABELS = {'added': "Новое", 'removed': "Исчезло", 'changed': "Изменилось"}
 
-        if not os.path.isdir(root_dir):
-            messagebox.showerror("Ошибка", f".minecraft не найдена по пути: {root_dir}")
-            logger.error(f".minecraft не найдена по пути: {root_dir}")
-            return
-        
-        keywords = [
-            'xray', 'impact', 'meteorclient', 'fullbright', 'freecam', 
-            'aristois', 'auto aim', 'chestesp', 'trajectory preview', 
-            'x-ray', 'baritone', 'fabritone', 'entity outliner',
-            'wwe', 'matix', 'enemyz', 'noplayerdamage', 
-            'detection', 'player highlighter'
-        ]
-
-        folder_keywords = ['impact', 'cheat', 'hacks', 'aristois', 'meteorclient', 'hack']
-        blacklisted_folders = ['grossjava9hacks']
-
-        found_files = await find_files_by_keywords_async(root_dir, keywords)
-        found_folders = await find_folders_by_keywords_async(root_dir, folder_keywords, blacklisted_folders)
-
-        total_cheats = 0
-
-        if not found_files and not found_folders:
-            listbox.insert(END, "Читов не обнаружено.")
-            save_run_history(0, 0, 0)
-            return
 
-        # Обработка файлов
-        if found_files:
-            for file_path in found_files:
-                if await analyze_file_async(file_path):
-                    listbox.insert(END, f"Файл: {file_path} (чит)")
-                    total_cheats += 1
-                else:
-                    listbox.insert(END, f"Файл: {file_path}")
-
-        # Обработка папок с проверкой их существования
-        if found_folders:
-            for folder_path in found_folders:
-                logger.info(f"Найдена папка: {folder_path}")  # Логируем путь найденной папки
-                if os.path.exists(folder_path):  # Проверяем, существует ли папка
-                    listbox.insert(END, f"Папка: {folder_path} (чит)")
-                    total_cheats += 1
+def on_check(roots, cancel, progress, messages):
+    """Проверка на читы в фоновом потоке. С виджетами не работает: строки уходят в messages."""
+    try:
+        total_files = 0
+        total_folders = 0
+        findings = []
+        started = datetime.now()
+        profiler = None
+        if configS.get('profile'):
+            from filefinder.metrics import Profiler
+            profiler = Profiler(configS['profile'], TEMP_DIR).start()
+
+        for finding in get_scanner().scan_roots(roots, cancel, progress, profiler=profiler,
+                                                max_cheats=configS.get('stop_after_cheats'),
+                                                time_budget=configS.get('time_budget')):
+            findings.append(finding)
+            if finding.kind == FILE:
+                total_files += 1
+                if finding.verdict:
+                    logger.info(f"Файл {finding.path} совпал с сигнатурой: {finding.verdict}")
+                messages.put(('finding', finding))
+            else:
+                total_folders += 1
+                logger.info(f"Найдена папка: {finding.path}")  # Логируем путь найденной папки
+                if os.path.exists(finding.path):  # Проверяем, существует ли папка
+                    messages.put(('finding', finding))
                 else:
-                    logger.info(f"Папка была удалена: {folder_path}")  # Логируем, что папка была удалена
+                    logger.info(f"Папка была удалена: {finding.path}")  # Логируем, что папка была удалена
+
+        metrics = scanner.metrics
+        if profiler is not None:
+            metrics.profile = profiler.stop()
+            logger.info(f"Профиль проверки сохранен: {metrics.profile.get('report')}")
+        save_scan_metrics(metrics)
+        # Досрочно остановленная проверка неполна и не служит базой для сравнения
+        run_id = save_run_history(started, roots, findings, cancel.is_set() or bool(metrics.stop_reason), metrics)
+        if configS.get('bundle_dir'):
+            bundle_path = save_bundle(roots, findings, cancel.is_set() or bool(metrics.stop_reason), metrics)
+            if bundle_path is not None:
+                messages.put(('line', f"Итог сохранен в пакет: {bundle_path}"))
+        if cancel.is_set():
+            logger.info("Проверка отменена пользователем")
+            messages.put(('line', "Проверка отменена."))
+        elif metrics.stop_reason:
+            logger.info(f"Проверка остановлена досрочно: {STOP_REASONS[metrics.stop_reason]}")
+            messages.put(('line', f"Проверка остановлена досрочно: {STOP_REASONS[metrics.stop_reason]}."))
+        else:
+            if not total_files and not total_folders:
+                messages.put(('line', "Читов не обнаружено."))
+            if run_id is not None:
+                changes = get_history().changes(run_id)
+                if changes.previous_id is not None:
+                    messages.put(('line', f"С прошлой проверки: новых {len(changes.added)}, "
+                                          f"исчезло {len(changes.removed)}, изменилось {len(changes.changed)}"))
 
-        save_run_history(len(found_files), len(found_folders), total_cheats)
+    except Exception as e:
+        logger.error(f"Ошибка проверки: {e}")
+        messages.put(('error', f"Ошибка: {e}"))
+    finally:
+        messages.put(('done', None))
 
-        # Отключаем кнопку "Открыть" до тех пор, пока не будет выбран элемент
-        open_button.config(state=tk.DISABLED)
 
+def on_watch(roots, cancel, progress, messages):
+    """Проверка и затем наблюдение за изменениями в фоновом потоке, пока не нажата "Отмена"."""
+    session = None
+    try:
+        from filefinder.watch import WatchSession
+        session = WatchSession(get_scanner(), roots)
+        for finding in session.start(cancel, progress):
+            messages.put(('finding', finding))
+        if not cancel.is_set():
+            logger.info(f"Наблюдение за изменениями: {', '.join(roots)}")
+            messages.put(('line', "Наблюдение за изменениями включено."))
+        for events in session.watch(cancel):
+            for event in events:
+                logger.info(f"{WATCH_LABELS[event.action]}: {event.finding.path} (чит: {event.finding.verdict})")
+            messages.put(('changes', events))
     except Exception as e:
-        logger.error(f"Ошибка проверки: {e}")
-        messagebox.showerror("Ошибка", f"Ошибка: {e}")
+        logger.error(f"Ошибка наблюдения: {e}")
+        messages.put(('error', f"Ошибка: {e}"))
+    finally:
+        if session is not None:
+            session.close()
+        messages.put(('done', None))
 
 
+def discover_and_run(target, cancel, progress, messages):
+    """Найти игровые папки и запустить в этом же фоновом потоке target (on_check или on_watch).
+
+    Поиск проверяет все буквы дисков, и отключенный сетевой или съемный диск
+    может отвечать секундами: в главном потоке это подвешивало бы окно.
+    """
+    try:
+        from filefinder.roots import discover_roots
+        game_roots = discover_roots()
+    except Exception as e:
+        logger.error(f"Ошибка поиска игровых папок: {e}")
+        messages.put(('error', f"Ошибка: {e}"))
+        messages.put(('done', None))
+        return
+    if not game_roots:
+        logger.error("Игровые папки не найдены")
+        messages.put(('error', "Не найдено ни .minecraft, ни папок других лаунчеров"))
+        messages.put(('done', None))
+        return
+    for game_root in game_roots:
+        logger.info(f"Найдена папка {game_root.launcher}: {game_root.path}")
+    target([game_root.path for game_root in game_roots], cancel, progress, messages)
+
+
+def poll_check_messages():
+    """Перенести накопленные результаты проверки в таблицу пачкой и обновить счетчик."""
+    found = []
+    events = []
+    lines = []
+    done = False
+    try:
+        while len(found) < POLL_BATCH:
+            kind, payload = check_messages.get_nowait()
+            if kind == 'finding':
+                found.append(payload)
+            elif kind == 'changes':
+                events.extend(payload)
+            elif kind == 'line':
+                lines.append(payload)
+            elif kind == 'error':
+                messagebox.showerror("Ошибка", payload)
+            elif kind == 'done':
+                done = True
+                break
+    except queue.Empty:
+        pass
+    if found:
+        results.add(found)
+        results_view.refresh()
+    if events:
+        # Изменившаяся находка заменяет прежнюю запись
+        results_view.update([event.finding.path for event in events if event.action != 'added'],
+                            [event.finding for event in events if event.action != 'removed'])
+        for event in events:
+            verdict = f" (чит: {event.finding.verdict})" if event.finding.verdict else ""
+            lines.append(f"{WATCH_LABELS[event.action]}: {event.finding.path}{verdict}")
+        if any(event.finding.verdict for event in events if event.action != 'removed'):
+            root.bell()
+    if lines:
+        notes = notes_label.cget('text').splitlines() + lines
+        notes_label.config(text='\n'.join(notes[-NOTES_LINES:]))
+
+    elapsed = max(time.monotonic() - check_started, 1e-6)
+    status_label.config(text=f"Просмотрено: {check_progress.entries} ({check_progress.entries / elapsed:.0f} файлов/с), "
+                             f"найдено: {len(results.records)}, показано: {len(results)}")
+
+    if done:
+        check_button.config(state=tk.NORMAL)
+        watch_button.config(state=tk.NORMAL)
+        cancel_button.config(state=tk.DISABLED)
+    else:
+        root.after(POLL_INTERVAL_MS, poll_check_messages)
 
 
 def open_selected_item():
     """Открыть выбранный файл или папку."""
     try:
-        selected = listbox.curselection()
-        if selected:
-            item = listbox.get(selected[0]).strip()
-            if item.startswith("Файл:"):
-                file_path = item[len("Файл: "):].split(" (чит)")[0].strip()
-                if not os.path.exists(file_path):
-                    raise FileNotFoundError(f"Файл не найден: {file_path}")
-                open_folder_of_file(file_path)
-            elif item.startswith("Папка:"):
-                folder_path = item[len("Папка: "):].split(" (чит)")[0].strip()
-                if not os.path.exists(folder_path):
-                    raise FileNotFoundError(f"Папка не найдена: {folder_path}")
-                open_folder_of_path(folder_path)
+        record = results_view.selected
+        if record is not None:
+            if record.is_file:
+                if not os.path.exists(record.path):
+                    raise FileNotFoundError(f"Файл не найден: {record.path}")
+                open_folder_of_file(record.path)
+            else:
+                if not os.path.exists(record.path):
+                    raise FileNotFoundError(f"Папка не найдена: {record.path}")
+                open_folder_of_path(record.path)
     except FileNotFoundError as e:
         logger.error(f"Ошибка: {e}")
         messagebox.showerror("Ошибка", str(e))
@@ -346,13 +439,19 @@ def open_selected_item():
         messagebox.showerror("Ошибка", f"Ошибка открытия: {e}")
 
 
-def on_select(event):
-    """Обработчик выбора элемента из списка."""
-    if listbox.curselection():
+def on_select(record):
+    """Обработчик выбора строки в таблице результатов."""
+    if record is not None:
         open_button.config(state=tk.NORMAL)
     else:
         open_button.config(state=tk.DISABLED)
 
+
+def apply_filter(*args):
+    """Отфильтровать таблицу по строке поиска и флажку "Только читы" без повторной проверки."""
+    results_view.set_filter(filter_var.get(), cheats_only_var.get())
+    status_label.config(text=f"Найдено: {len(results.records)}, показано: {len(results)}")
+
 def show_help():
     """Показать окно помощи."""
     global help_window  # Declare help_window as global
@@ -367,9 +466,10 @@ def show_help():
     Для этого выполните следующие шаги:
     
     1. Нажмите кнопку "Искать", чтобы начать проверку файлов и папок.
-    2. Результаты проверки отобразятся в списке справа.
-    3. Вы можете открыть любой найденный файл или папку, выбрав его и нажав кнопку "Открыть".
-    4. Настройки приложения можно изменить через кнопку "Настройки".
+    2. Результаты проверки отобразятся в таблице справа. Щелчок по заголовку сортирует таблицу, строка "Поиск" и флажок "Только читы" фильтруют ее.
+    3. Вы можете открыть любой найденный файл или папку, выбрав его и нажав кнопку "Открыть" или дважды щелкнув по строке.
+    4. Кнопка "Наблюдать" проверяет папки и дальше сразу проверяет новые и измененные файлы, пока не нажата "Отмена".
+    5. Настройки приложения можно изменить через кнопку "Настройки".
 
     Если программа нашла папку которая не открывается и если это реально читы(программа может ошибаться мы проверяли) или вовсе не написала что у вас нету читов, то надо открыть архивочные приложение(WinRAR или 7-zip) Там ищите папку которая должна быть удалена и удаляйте её! Если вас такими темпами поймали на проверке, покажите инструкцию модератору чтобы он мог понять что у вас были читы, но они были удалены
     """
@@ -402,6 +502,7 @@ def show_settings():
             if os.name == 'nt':  # Windows
                 os.startfile(folder_path)
             elif os.name == 'posix':  # macOS, Linux
+                import subprocess
                 subprocess.call(['xdg-open', folder_path])  # Используем xdg-open для Linux
         except Exception as e:
             logger.error(f"Ошибка открытия папки {folder_path}: {e}")
@@ -426,40 +527,157 @@ def show_settings():
 
 def open_website():
     """Открыть веб-сайт."""
+    import webbrowser
     webbrowser.open("https://filefinder.mutetds.ru")  # Замените на ваш сайт
 
+HISTORY_PAGE = 50  # Запусков, подгружаемых в окно истории за раз
+HISTORY_FINDINGS_PAGE = 200  # Находок выбранного запуска, подгружаемых за раз
+
+
 def show_history():
-    """Показать окно истории запусков."""
+    """Показать окно истории запусков. Запуски и находки подгружаются по мере прокрутки."""
     history_window = tk.Toplevel(root)
     history_window.title("История запусков")
-    history_window.geometry("600x300")  # Размер окна
+    history_window.geometry("900x400")  # Размер окна
     apply_theme(history_window, current_theme)
 
-    history_text = load_run_history()  # Загрузка истории запусков
-    history_label = tk.Label(history_window, text=history_text, fg=THEMES[current_theme]['text'], bg=THEMES[current_theme]['background'], font=('Arial', 12), wraplength=580, justify=tk.LEFT)
-    history_label.pack(padx=10, pady=10, fill=BOTH, expand=True)
+    store = get_history()
+    if store is None:
+        tk.Label(history_window, text="История запусков недоступна.", fg=THEMES[current_theme]['text'], bg=THEMES[current_theme]['background'], font=('Arial', 12)).pack(padx=10, pady=10)
+        return
+
+    count_label = tk.Label(history_window, text=f"Запусков: {store.count()}", fg=THEMES[current_theme]['text'], bg=THEMES[current_theme]['background'], font=('Arial', 12))
+    count_label.pack(fill=X, padx=10, pady=5)
 
-async def find_files_by_keywords_async(root_dir, keywords):
-    loop = asyncio.get_event_loop()
-    with ThreadPoolExecutor() as executor:
-        found_files = await loop.run_in_executor(executor, find_files_by_keywords, root_dir, keywords)
-    return found_files
+    def make_list(parent, width):
+        frame = tk.Frame(parent, bg=THEMES[current_theme]['background'])
+        frame.pack(side=LEFT, fill=BOTH, expand=True, padx=10, pady=10)
+        scrollbar = Scrollbar(frame)
+        scrollbar.pack(side=RIGHT, fill=Y)
+        items = Listbox(frame, width=width, bg=THEMES[current_theme]['button'], fg=THEMES[current_theme]['text'], font=('Arial', 10), bd=0, highlightthickness=0, exportselection=False)
+        items.pack(fill=BOTH, expand=True)
+        scrollbar.config(command=items.yview)
+        return items, scrollbar
 
-async def find_folders_by_keywords_async(root_dir, folder_keywords, blacklisted_folders):
-    loop = asyncio.get_event_loop()
-    with ThreadPoolExecutor() as executor:
-        found_folders = await loop.run_in_executor(executor, find_folders_by_keywords, root_dir, folder_keywords, blacklisted_folders)
-    return found_folders
+    runs_list, runs_scrollbar = make_list(history_window, 40)
+    details_list, details_scrollbar = make_list(history_window, 80)
 
-async def analyze_file_async(file_path):
-    loop = asyncio.get_event_loop()
-    with ThreadPoolExecutor() as executor:
-        result = await loop.run_in_executor(executor, analyze_file, file_path)
-    return result
+    run_ids = []
+    state = {'runs_done': False, 'run_id': None, 'findings_offset': 0, 'findings_done': True}
+
+    def load_runs():
+        if state['runs_done']:
+            return
+        page = store.runs(run_ids[-1] if run_ids else None, HISTORY_PAGE)
+        state['runs_done'] = len(page) < HISTORY_PAGE
+        for run in page:
+            run_ids.append(run.id)
+            # Без папок бывает только запись, перенесенная из check_history.txt
+            note = " (из check_history.txt)" if not run.roots else " (отменена)" if run.cancelled else ""
+            runs_list.insert(END, f"{run.started} - читов: {run.cheats}{note}")
+
+    def load_findings():
+        if state['findings_done']:
+            return
+        page = store.findings(state['run_id'], state['findings_offset'], HISTORY_FINDINGS_PAGE)
+        state['findings_offset'] += len(page)
+        state['findings_done'] = len(page) < HISTORY_FINDINGS_PAGE
+        for finding in page:
+            kind = "Файл" if finding.kind == FILE else "Папка"
+            verdict = f" (чит: {finding.verdict})" if finding.verdict else ""
+            details_list.insert(END, f"{kind}: {finding.path}{verdict}")
+
+    def on_run_selected(event):
+        selected = runs_list.curselection()
+        if not selected:
+            return
+        run = store.run(run_ids[selected[0]])
+        details_list.delete(0, END)
+        lines = [f"Запуск {run.id}: {run.started} - {run.finished}",
+                 f"Папки: {', '.join(run.roots)}",
+                 f"Файлов: {run.files}, папок: {run.folders}, читов: {run.cheats}",
+                 f"Версия сигнатур: {run.signature_release or '-'} ({run.signature_version})"]
+        if run.metrics:
+            lines.extend(format_summary(run.metrics).splitlines())
+        changes = store.changes(run.id)
+        if changes.previous_id is not None:
+            lines.append(f"С прошлой проверки (запуск {changes.previous_id}):")
+            lines.extend(f"  + {finding.path}" for finding in changes.added)
+            lines.extend(f"  - {finding.path}" for finding in changes.removed)
+            lines.extend(f"  * {finding.path} (чит: {finding.verdict})" for finding in changes.changed)
+        lines.append("Находки:")
+        details_list.insert(END, *lines)
+        state.update(run_id=run.id, findings_offset=0, findings_done=False)
+        load_findings()
+
+    def lazy_scroll(scrollbar, load):
+        """Подгрузить следующую страницу, когда прокрутка дошла почти до конца."""
+        def on_scroll(first, last):
+            scrollbar.set(first, last)
+            if float(last) > 0.9:
+                load()
+        return on_scroll
+
+    runs_list.config(yscrollcommand=lazy_scroll(runs_scrollbar, load_runs))
+    details_list.config(yscrollcommand=lazy_scroll(details_scrollbar, load_findings))
+    runs_list.bind('<<ListboxSelect>>', on_run_selected)
+    load_runs()
 
 def start_check():
-    """Запуск проверки на читы в асинхронном режиме."""
-    asyncio.run(on_check())
+    """Запуск проверки на читы в фоновом потоке, окно при этом не блокируется."""
+    start_background(on_check)
+
+
+def start_watch():
+    """Проверка с наблюдением: после нее новые и измененные файлы проверяются сразу по мере появления."""
+    start_background(on_watch)
+
+
+def start_background(target):
+    """Запустить target (on_check или on_watch) в фоновом потоке с общей очередью сообщений."""
+    global check_thread, check_progress, check_started
+    if check_thread is not None and check_thread.is_alive():
+        return
+    results_view.clear()  # Очищаем таблицу перед новой проверкой
+    notes_label.config(text="")
+    # Отключаем кнопку "Открыть" до тех пор, пока не будет выбран элемент
+    open_button.config(state=tk.DISABLED)
+    check_button.config(state=tk.DISABLED)
+    watch_button.config(state=tk.DISABLED)
+    cancel_button.config(state=tk.NORMAL)
+
+    check_cancel.clear()
+    check_progress = WalkProgress()
+    check_started = time.monotonic()
+    check_thread = threading.Thread(target=discover_and_run, args=(target, check_cancel, check_progress, check_messages),
+                                    daemon=True)
+    check_thread.start()
+    root.after(POLL_INTERVAL_MS, poll_check_messages)
+
+def cancel_check():
+    """Остановить текущую проверку."""
+    check_cancel.set()
+    cancel_button.config(state=tk.DISABLED)
+
+def poll_loading():
+    """Показывать в строке состояния загрузку базы сигнатур, пока она не закончится."""
+    if not signatures_ready.is_set():
+        root.after(100, poll_loading)
+    elif signatures is None:
+        status_label.config(text=f"Ошибка загрузки базы сигнатур: {signatures_error}")
+    elif status_label.cget('text') == "Загрузка базы сигнатур...":
+        status_label.config(text="")
+
+def log_level(level):
+    """Уровень журнала из config.json; неизвестный заменяется на INFO с предупреждением."""
+    if isinstance(level, str):
+        level = level.upper()
+        if isinstance(logging.getLevelName(level), int):
+            return level
+    elif isinstance(level, int) and not isinstance(level, bool):
+        return level
+    logger.warning(f"Неизвестный уровень журнала {level!r} в config.json, используется INFO")
+    return 'INFO'
 
 def load_config():
     """Load configuration from the config file and apply it."""
@@ -468,6 +686,17 @@ def load_config():
         with open(CONFIG_FILE, 'r') as conf:
             config = json.load(conf)
             current_theme = config.get('theme', 'light')
+            configS['scan_threads'] = config.get('scan_threads')
+            configS['scan_processes'] = config.get('scan_processes')
+            configS['log_level'] = log_level(config.get('log_level', 'INFO'))
+            configS['profile'] = config.get('profile')
+            for key in ('scan_first', 'scan_defer', 'scan_skip'):
+                configS[key] = config.get(key, [])
+            configS['stop_after_cheats'] = config.get('stop_after_cheats')
+            configS['time_budget'] = config.get('time_budget')
+            configS['bundle_dir'] = config.get('bundle_dir')
+            configS['bundle_key'] = config.get('bundle_key')
+            logger.setLevel(configS['log_level'])
             apply_theme(root, current_theme)
     else:
         save_config()  # Save default config if not exists
@@ -479,65 +708,89 @@ def save_config():
         json.dump(configS, conf, indent=4)
     logger.info('Configuration saved successfully')
 
-# Создаем GUI
-root = tk.Tk()
-root.title("FileFinder v1.0")
-root.geometry("800x400")  # Размер окна
-apply_theme(root, current_theme)  # Применяем тему к основному окну
-root.minsize(width=800, height=400)
-load_config()
+if __name__ == '__main__':
+    # Рабочие процессы анализа запускают этот модуль заново: GUI строим только в главном
+    import multiprocessing
+    multiprocessing.freeze_support()
+
+    # Создаем GUI
+    root = tk.Tk()
+    root.title("FileFinder v1.0")
+    root.geometry("800x400")  # Размер окна
+    apply_theme(root, current_theme)  # Применяем тему к основному окну
+    root.minsize(width=800, height=400)
+    load_config()  # Нужна сразу: тема окна и настройки конвейера
+    start_loading()  # Сигнатуры и конвейер готовятся, пока строится окно
+
+    frame_left = tk.Frame(root, bg=THEMES[current_theme]['background'])
+    frame_left.pack(side=LEFT, fill=BOTH, expand=True, padx=10, pady=10)
+
+    frame_right = tk.Frame(root, bg=THEMES[current_theme]['background'])
+    frame_right.pack(side=RIGHT, fill=BOTH, expand=True, padx=10, pady=10)
 
-frame_left = tk.Frame(root, bg=THEMES[current_theme]['background'])
-frame_left.pack(side=LEFT, fill=BOTH, expand=True, padx=10, pady=10)
+    # Левый фрейм с кнопками
+    label = tk.Label(frame_left, text="FileFinder v1.0", fg=THEMES[current_theme]['text'], bg=THEMES[current_theme]['background'], font=('Arial', 14))
+    label.pack(pady=5)
 
-frame_right = tk.Frame(root, bg=THEMES[current_theme]['background'])
-frame_right.pack(side=RIGHT, fill=BOTH, expand=True, padx=10, pady=10)
+    check_button = tk.Button(frame_left, text="Искать", command=start_check, bg=THEMES[current_theme]['button'], fg=THEMES[current_theme]['text'], font=('Arial', 12), width=15, bd=0)
+    check_button.pack(pady=5)
 
-# Левый фрейм с кнопками
-label = tk.Label(frame_left, text="FileFinder v1.0", fg=THEMES[current_theme]['text'], bg=THEMES[current_theme]['background'], font=('Arial', 14))
-label.pack(pady=5)
+    watch_button = tk.Button(frame_left, text="Наблюдать", command=start_watch, bg=THEMES[current_theme]['button'], fg=THEMES[current_theme]['text'], font=('Arial', 12), width=15, bd=0)
+    watch_button.pack(pady=5)
 
-check_button = tk.Button(frame_left, text="Искать", command=start_check, bg=THEMES[current_theme]['button'], fg=THEMES[current_theme]['text'], font=('Arial', 12), width=15, bd=0)
-check_button.pack(pady=5)
+    cancel_button = tk.Button(frame_left, text="Отмена", command=cancel_check, bg=THEMES[current_theme]['button'], fg=THEMES[current_theme]['text'], font=('Arial', 12), width=15, bd=0)
+    cancel_button.pack(pady=5)
+    cancel_button.config(state=tk.DISABLED)  # Доступна только во время проверки
 
-help_button = tk.Button(frame_left, text="Инструкция", command=show_help, bg=THEMES[current_theme]['button'], fg=THEMES[current_theme]['text'], font=('Arial', 12), width=15, bd=0)
-help_button.pack(pady=5)
+    help_button = tk.Button(frame_left, text="Инструкция", command=show_help, bg=THEMES[current_theme]['button'], fg=THEMES[current_theme]['text'], font=('Arial', 12), width=15, bd=0)
+    help_button.pack(pady=5)
 
-website_button = tk.Button(frame_left, text="Посетить сайт", command=open_website, bg=THEMES[current_theme]['button'], fg=THEMES[current_theme]['text'], font=('Arial', 12), width=15, bd=0)
-website_button.pack(pady=5)
+    website_button = tk.Button(frame_left, text="Посетить сайт", command=open_website, bg=THEMES[current_theme]['button'], fg=THEMES[current_theme]['text'], font=('Arial', 12), width=15, bd=0)
+    website_button.pack(pady=5)
 
-settings_button = tk.Button(frame_left, text="Настройки", command=show_settings, bg=THEMES[current_theme]['button'], fg=THEMES[current_theme]['text'], font=('Arial', 12), width=15, bd=0)
-settings_button.pack(pady=5)
+    settings_button = tk.Button(frame_left, text="Настройки", command=show_settings, bg=THEMES[current_theme]['button'], fg=THEMES[current_theme]['text'], font=('Arial', 12), width=15, bd=0)
+    settings_button.pack(pady=5)
 
-# Добавляем кнопку "История" в левом фрейме
-history_button = tk.Button(frame_left, text="История", command=show_history, bg=THEMES[current_theme]['button'], fg=THEMES[current_theme]['text'], font=('Arial', 12), width=15, bd=0)
-history_button.pack(pady=5)
+    # Добавляем кнопку "История" в левом фрейме
+    history_button = tk.Button(frame_left, text="История", command=show_history, bg=THEMES[current_theme]['button'], fg=THEMES[current_theme]['text'], font=('Arial', 12), width=15, bd=0)
+    history_button.pack(pady=5)
 
-exit_button = tk.Button(frame_left, text="Выход", command=root.destroy, bg=THEMES[current_theme]['button'], fg=THEMES[current_theme]['text'], font=('Arial', 12), width=15, bd=0)
-exit_button.pack(pady=5)
+    exit_button = tk.Button(frame_left, text="Выход", command=root.destroy, bg=THEMES[current_theme]['button'], fg=THEMES[current_theme]['text'], font=('Arial', 12), width=15, bd=0)
+    exit_button.pack(pady=5)
 
-# Правый фрейм с результатами и скроллом
-listbox_frame = tk.Frame(frame_right, bg=THEMES[current_theme]['background'])
-listbox_frame.pack(fill=BOTH, expand=True)
+    # Правый фрейм: фильтр, таблица результатов и счетчики
+    filter_frame = tk.Frame(frame_right, bg=THEMES[current_theme]['background'])
+    filter_frame.pack(fill=X, pady=(0, 5))
 
-scrollbar_y = Scrollbar(listbox_frame)
-scrollbar_y.pack(side=RIGHT, fill=Y)
+    tk.Label(filter_frame, text="Поиск:", fg=THEMES[current_theme]['text'], bg=THEMES[current_theme]['background'], font=('Arial', 10)).pack(side=LEFT)
+    filter_var = tk.StringVar()
+    filter_var.trace_add('write', apply_filter)
+    tk.Entry(filter_frame, textvariable=filter_var, font=('Arial', 10)).pack(side=LEFT, fill=X, expand=True, padx=5)
+    cheats_only_var = tk.BooleanVar()
+    tk.Checkbutton(filter_frame, text="Только читы", variable=cheats_only_var, command=apply_filter, bg=THEMES[current_theme]['background'], fg=THEMES[current_theme]['text'], font=('Arial', 10), selectcolor=THEMES[current_theme]['background']).pack(side=LEFT)
 
-scrollbar_x = Scrollbar(listbox_frame, orient=tk.HORIZONTAL)
-scrollbar_x.pack(side=tk.BOTTOM, fill=X)
+    # Таблица создает только видимые строки: десятки тысяч находок не замедляют окно
+    results = ResultModel()
+    results_view = VirtualResults(frame_right, results, on_select=on_select)
+    results_view.pack(fill=BOTH, expand=True)
 
-listbox = Listbox(listbox_frame, yscrollcommand=scrollbar_y.set, xscrollcommand=scrollbar_x.set, height=15, bg=THEMES[current_theme]['button'], fg=THEMES[current_theme]['text'], font=('Arial', 10), bd=0, highlightthickness=0)
-listbox.pack(fill=BOTH, expand=True)
+    # Счетчик просмотренных файлов во время проверки
+    status_label = tk.Label(frame_right, text="", fg=THEMES[current_theme]['text'], bg=THEMES[current_theme]['background'], font=('Arial', 10))
+    status_label.pack(fill=X)
+    if not signatures_ready.is_set():
+        status_label.config(text="Загрузка базы сигнатур...")
+        root.after(100, poll_loading)
 
-scrollbar_y.config(command=listbox.yview)
-scrollbar_x.config(command=listbox.xview)
+    # Итог проверки: отмена, отсутствие читов, изменения с прошлого запуска
+    notes_label = tk.Label(frame_right, text="", justify=LEFT, fg=THEMES[current_theme]['text'], bg=THEMES[current_theme]['background'], font=('Arial', 10))
+    notes_label.pack(fill=X)
 
-# Кнопка для открытия выбранного элемента
-open_button = tk.Button(frame_right, text="Открыть", command=open_selected_item, bg=THEMES[current_theme]['button'], fg=THEMES[current_theme]['text'], font=('Arial', 12), width=30, bd=0)
-open_button.pack(pady=10)
-open_button.config(state=tk.DISABLED)  # По умолчанию отключена
+    # Кнопка для открытия выбранного элемента
+    open_button = tk.Button(frame_right, text="Открыть", command=open_selected_item, bg=THEMES[current_theme]['button'], fg=THEMES[current_theme]['text'], font=('Arial', 12), width=30, bd=0)
+    open_button.pack(pady=10)
+    open_button.config(state=tk.DISABLED)  # По умолчанию отключена
 
-# Привязываем обработчик события выбора элемента
-listbox.bind('<<ListboxSelect>>', on_select)
+    # Двойной щелчок по строке открывает ее папку
+    results_view.bind('<Double-1>', lambda event: open_selected_item())
 
-root.mainloop()
+    root.mainloop()
@@ -0,0 +1,101 @@
+"""Замер сводки пакетов проверок: скорость, пиковая память и точность самых частых хешей.
+
+Создает --bundles подписанных пакетов по --findings находок в каждом.
+Хеши и пути распределены по закону Ципфа, как моды на реальных
+компьютерах: немного очень частых и длинный хвост редких. Затем сводит
+их FleetReport с --capacity счетчиками и сравнивает верхние --top хешей
+с точным подсчетом.
+
+Запуск из корня репозитория:
+    python benchmarks/bench_aggregate.py --bundles 5000 --capacity 1000
+"""
+import os
+import sys
+import json
+import time
+import bisect
+import random
+import shutil
+import argparse
+import tempfile
+import tracemalloc
+from collections import Counter
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from filefinder.aggregate import FleetReport  # noqa: E402
+from filefinder.bundle import write_bundle  # noqa: E402
+from filefinder.pipeline import Finding  # noqa: E402
+from filefinder.walker import FILE  # noqa: E402
+
+KEY = b'bench'
+
+
+def zipf_index(rng, weights_total, cumulative):
+    """Номер элемента с вероятностью, обратной его рангу."""
+    return bisect.bisect_left(cumulative, rng.random() * weights_total)
+
+
+def generate(directory, args):
+    """Пакеты с Ципф-распределенными находками; возвращает точные счета хешей по машинам."""
+    rng = random.Random(args.seed)
+    cumulative = []
+    total = 0.0
+    for rank in range(1, args.distinct + 1):
+        total += 1.0 / rank
+        cumulative.append(total)
+    exact = Counter()
+    root = os.path.join(directory, '.minecraft')
+    for number in range(args.bundles):
+        items = {zipf_index(rng, total, cumulative) for _ in range(args.findings)}
+        exact.update(f"{item:032x}" for item in items)
+        # Хеши подставляются без чтения файлов: замеряется сводка, а не хеширование
+        findings = [Finding(os.path.join(root, 'mods', f"mod-{item}.jar"), FILE, None, False,
+                            'cheat' if item % 7 == 0 else None, root, f"{item:032x}") for item in items]
+        write_bundle(os.path.join(directory, f"pc{number:06d}.ffb"), KEY, findings, [root], 'bench', 1.0,
+                     machine=f"pc{number}")
+    return exact
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--bundles', type=int, default=2000)
+    parser.add_argument('--findings', type=int, default=50, help="находок в пакете")
+    parser.add_argument('--distinct', type=int, default=100000, help="разных хешей во всем парке")
+    parser.add_argument('--capacity', type=int, default=1000)
+    parser.add_argument('--top', type=int, default=50)
+    parser.add_argument('--seed', type=int, default=1)
+    args = parser.parse_args()
+
+    directory = tempfile.mkdtemp(prefix='filefinder-fleet-')
+    try:
+        start = time.perf_counter()
+        exact = generate(directory, args)
+        print(f"Пакеты созданы за {time.perf_counter() - start:.1f} с: {directory}", file=sys.stderr)
+        start = time.perf_counter()
+        summary = FleetReport(args.capacity).add_directory(directory, KEY).summary(args.top)
+        elapsed = time.perf_counter() - start
+        # Память - отдельным проходом: tracemalloc в разы замедляет сводку
+        tracemalloc.start()
+        FleetReport(args.capacity).add_directory(directory, KEY).summary(args.top)
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+    finally:
+        shutil.rmtree(directory, ignore_errors=True)
+
+    true_top = {item for item, _ in exact.most_common(args.top)}
+    found_top = {hitter['item'] for hitter in summary['top_hashes']}
+    worst = max((hitter['machines'] - exact[hitter['item']] for hitter in summary['top_hashes']), default=0)
+    print(json.dumps({
+        'bundles': summary['bundles'],
+        'seconds': round(elapsed, 3),
+        'bundles_per_s': round(summary['bundles'] / elapsed, 1) if elapsed else None,
+        'peak_traced_kb': peak // 1024,
+        'distinct_hashes': len(exact),
+        'top_recall': round(len(true_top & found_top) / len(true_top), 3) if true_top else None,
+        'max_overcount': worst,
+    }, ensure_ascii=False, indent=2))
+
+
+if __name__ == '__main__':
+    main()
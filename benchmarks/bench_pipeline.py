@@ -0,0 +1,100 @@
+"""Сравнение последовательного анализа найденных файлов с конвейером Scanner.
+
+Конвейер замеряется дважды: только с пулом потоков (--processes 0) и с
+пулом процессов для .jar и крупных файлов. Результаты и условия замеров
+записаны в benchmarks/README.md.
+
+Запуск из корня репозитория:
+    python benchmarks/bench_pipeline.py --files 200 --size 1048576
+"""
+import os
+import sys
+import time
+import shutil
+import random
+import zipfile
+import argparse
+import tempfile
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from filefinder.analysis import Analyzer  # noqa: E402
+from filefinder.matcher import KeywordMatcher  # noqa: E402
+from filefinder.rules import NameRules  # noqa: E402
+from filefinder.pipeline import Scanner, default_processes, default_threads  # noqa: E402
+from filefinder.walker import scan_tree, FILE  # noqa: E402
+
+file_matcher = NameRules(['xray'])
+folder_matcher = NameRules(['hacks'])
+analyzer = Analyzer(NameRules(['killaura', 'wallhack']),
+                    KeywordMatcher(['class xray', 'baritone', 'meteorclient', 'aimbot', 'wallhack'], chunks=True),
+                    KeywordMatcher(['baritone', 'meteorclient', 'aimbot', 'wallhack'], chunks=True))
+
+
+def generate_tree(root_dir, files, size, seed=0):
+    """Найденные по имени файлы: половина текстовых, половина .jar с классами."""
+    rng = random.Random(seed)
+    # Случайные байты без сигнатур: проверка проходит файл целиком
+    alphabet = bytes(range(0x30, 0x3a))
+    for i in range(files):
+        folder = os.path.join(root_dir, 'mods', f"{i % 16:02d}")
+        os.makedirs(folder, exist_ok=True)
+        data = bytes(rng.choice(alphabet) for _ in range(1024)) * (size // 1024)
+        if i % 2:
+            with zipfile.ZipFile(os.path.join(folder, f"xray-{i}.jar"), 'w', zipfile.ZIP_DEFLATED) as jar:
+                for j in range(16):
+                    jar.writestr(f"net/example/Class{j}.class", data[:size // 16])
+        else:
+            with open(os.path.join(folder, f"xray-{i}.txt"), 'wb') as file:
+                file.write(data)
+
+
+def sequential(root_dir):
+    results = []
+    for match in scan_tree(root_dir, file_matcher, folder_matcher):
+        if match.kind == FILE:
+            results.append(analyzer.analyze_measured(match.path).verdict)
+    return len(results)
+
+
+def pipeline(root_dir, threads, processes):
+    scanner = Scanner(analyzer, file_matcher, folder_matcher, threads=threads, processes=processes)
+    try:
+        # Первый прогон поднимает пулы, как и первое нажатие "Искать"
+        list(scanner.scan(root_dir))
+        start = time.perf_counter()
+        count = sum(1 for _ in scanner.scan(root_dir))
+        return time.perf_counter() - start, count
+    finally:
+        scanner.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--files', type=int, default=200)
+    parser.add_argument('--size', type=int, default=1024 * 1024)
+    parser.add_argument('--threads', type=int, default=default_threads())
+    parser.add_argument('--processes', type=int, default=default_processes())
+    args = parser.parse_args()
+
+    root_dir = tempfile.mkdtemp(prefix='filefinder-bench-')
+    try:
+        generate_tree(root_dir, args.files, args.size)
+        start = time.perf_counter()
+        count = sequential(root_dir)
+        sequential_time = time.perf_counter() - start
+        print(f"ядер: {os.cpu_count()}, потоков: {args.threads}, процессов: {args.processes}")
+        print(f"последовательно:     {sequential_time:.3f} с ({count} файлов)")
+        modes = [('потоки', 0)]
+        if args.processes:
+            modes.append(('потоки и процессы', args.processes))
+        for name, processes in modes:
+            pipeline_time, pipeline_count = pipeline(root_dir, args.threads, processes)
+            print(f"{name + ':':<20} {pipeline_time:.3f} с ({pipeline_count} файлов), "
+                  f"ускорение x{sequential_time / pipeline_time:.2f}")
+    finally:
+        shutil.rmtree(root_dir, ignore_errors=True)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,171 @@
+"""Замер запуска FileFinder: время импорта по модулям (-X importtime) и готовность к проверке.
+
+Каждый замер идет в новом интерпретаторе с пустыми временной и рабочей
+папками, как первый запуск exe. Отчет содержит:
+- import: полное время `import FileFinder` по -X importtime и самые
+  дорогие модули (собственное время и время вместе с зависимостями);
+- wall: время до конца импорта, до загрузки базы сигнатур и до готового
+  конвейера проверки; cold - первый запуск без кэша сигнатур, warm -
+  лучший из --repeat запусков с кэшем.
+Отчеты разных версий сравниваются ключом --compare.
+
+Запуск из корня репозитория:
+    python benchmarks/bench_startup.py --out startup.json
+    python benchmarks/bench_startup.py --compare startup.json
+"""
+import os
+import sys
+import json
+import time
+import shutil
+import platform
+import argparse
+import tempfile
+import subprocess
+
+REPO = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Выполняется в дочернем интерпретаторе: время до импорта, сигнатур и конвейера
+WALL_SCRIPT = """
+import sys, time, json
+start = time.perf_counter()
+sys.path.insert(0, {repo!r})
+import FileFinder
+imported = time.perf_counter()
+FileFinder.start_loading()
+FileFinder.get_signatures()
+signatures = time.perf_counter()
+FileFinder.startup_thread.join()
+ready = time.perf_counter()
+print(json.dumps({{'import': imported - start, 'signatures': signatures - start, 'scanner': ready - start}}))
+"""
+
+
+def child_env(temp_dir):
+    env = dict(os.environ)
+    env['TEMP'] = temp_dir
+    env.pop('PYTHONPROFILEIMPORTTIME', None)
+    return env
+
+
+def parse_importtime(stderr):
+    """Строки -X importtime в список (модуль, собственное время, с зависимостями) в секундах."""
+    modules = []
+    for line in stderr.splitlines():
+        if not line.startswith('import time:') or 'self [us]' in line:
+            continue
+        try:
+            own, cumulative, name = line[len('import time:'):].split('|')
+            modules.append((name.strip(), int(own) / 1e6, int(cumulative) / 1e6))
+        except ValueError:
+            continue
+    return modules
+
+
+def measure_imports(work_dir, top):
+    """Один запуск `python -X importtime -c "import FileFinder"`."""
+    code = f"import sys; sys.path.insert(0, {REPO!r}); import FileFinder"
+    result = subprocess.run([sys.executable, '-X', 'importtime', '-c', code], cwd=work_dir,
+                            env=child_env(work_dir), capture_output=True, text=True, timeout=120)
+    if result.returncode:
+        raise RuntimeError(f"Импорт FileFinder завершился с ошибкой:\n{result.stderr[-2000:]}")
+    modules = parse_importtime(result.stderr)
+    total = next((cumulative for name, _, cumulative in modules if name == 'FileFinder'), None)
+    by_self = sorted(modules, key=lambda module: module[1], reverse=True)[:top]
+    return {
+        'total_seconds': round(total, 4) if total is not None else None,
+        'modules': len(modules),
+        'top_self': [{'module': name, 'self_seconds': round(own, 4), 'cumulative_seconds': round(cumulative, 4)}
+                     for name, own, cumulative in by_self],
+    }
+
+
+def measure_wall(work_dir):
+    """Один запуск WALL_SCRIPT: секунды до импорта, сигнатур и конвейера."""
+    result = subprocess.run([sys.executable, '-c', WALL_SCRIPT.format(repo=REPO)], cwd=work_dir,
+                            env=child_env(work_dir), capture_output=True, text=True, timeout=300)
+    if result.returncode:
+        raise RuntimeError(f"Запуск FileFinder завершился с ошибкой:\n{result.stderr[-2000:]}")
+    return json.loads(result.stdout.strip().splitlines()[-1])
+
+
+def interpreter_seconds(repeat):
+    """Лучшее время запуска пустого интерпретатора: нижняя граница для всего остального."""
+    best = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        subprocess.run([sys.executable, '-c', 'pass'], check=True)
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return round(best, 4)
+
+
+def revision():
+    """Ревизия git, если замер запущен из репозитория."""
+    try:
+        return subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], capture_output=True, text=True,
+                              cwd=REPO, timeout=10).stdout.strip() or None
+    except (OSError, subprocess.SubprocessError):
+        return None
+
+
+def run(args):
+    work_dir = tempfile.mkdtemp(prefix='filefinder-startup-')
+    try:
+        cold = measure_wall(work_dir)  # Кэша сигнатур еще нет
+        warm = [measure_wall(work_dir) for _ in range(args.repeat)]
+        imports = [measure_imports(work_dir, args.top) for _ in range(args.repeat)]
+    finally:
+        shutil.rmtree(work_dir, ignore_errors=True)
+    best_import = min(imports, key=lambda record: record['total_seconds'] or float('inf'))
+    return {
+        'revision': revision(),
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'interpreter_seconds': interpreter_seconds(args.repeat),
+        'import': best_import,
+        'wall': {
+            'cold': {key: round(value, 4) for key, value in cold.items()},
+            'warm': {key: round(min(record[key] for record in warm), 4) for key in cold},
+        },
+    }
+
+
+def compare(report, baseline):
+    """Сравнение с прежним отчетом: импорт и время до готовности."""
+    lines = [f"ревизия {baseline.get('revision')} -> {report.get('revision')}"]
+    pairs = [('import', baseline.get('import', {}).get('total_seconds'), report['import']['total_seconds'])]
+    for mode in ('cold', 'warm'):
+        for key, value in report['wall'][mode].items():
+            pairs.append((f"{mode}.{key}", baseline.get('wall', {}).get(mode, {}).get(key), value))
+    for name, before, after in pairs:
+        if not before or after is None:
+            lines.append(f"{name:<16} {after} с (нет в прежнем отчете)")
+            continue
+        ratio = before / after if after else float('inf')
+        lines.append(f"{name:<16} {before:.3f} с -> {after:.3f} с (x{ratio:.2f})")
+    return '\n'.join(lines)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--repeat', type=int, default=5)
+    parser.add_argument('--top', type=int, default=15, help="сколько самых дорогих модулей показать")
+    parser.add_argument('--out', help="файл для отчета; по умолчанию отчет выводится в stdout")
+    parser.add_argument('--compare', metavar='JSON', help="прежний отчет для сравнения")
+    args = parser.parse_args()
+
+    report = run(args)
+    text = json.dumps(report, ensure_ascii=False, indent=2)
+    if args.out:
+        with open(args.out, 'w', encoding='utf-8') as file:
+            file.write(text + '\n')
+    else:
+        print(text)
+    if args.compare:
+        with open(args.compare, 'r', encoding='utf-8') as file:
+            print(compare(report, json.load(file)), file=sys.stderr)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,229 @@
+"""Замер всех стадий проверки на синтетической папке .minecraft с отчетом в JSON.
+
+Стадии: walk (обход), name_match (сопоставление имен), content (проверка
+содержимого обычных файлов), jar (проверка .jar) и pipeline (вся проверка
+через Scanner). Для каждой - лучшее время из --repeat запусков, пропускная
+способность и пиковый RSS процесса после стадии. Отчеты разных версий
+сравниваются ключом --compare.
+
+Запуск из корня репозитория:
+    python benchmarks/bench_suite.py --files 20000 --jars 200 --out bench.json
+    python benchmarks/bench_suite.py --compare bench.json
+"""
+import os
+import sys
+import json
+import time
+import shutil
+import platform
+import argparse
+import tempfile
+import subprocess
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from synthetic import DEFAULT_SPEC, TreeSpec, generate  # noqa: E402
+from filefinder.content import scan_file  # noqa: E402
+from filefinder.jar import JarInspector  # noqa: E402
+from filefinder.pipeline import Scanner, default_processes, default_threads  # noqa: E402
+from filefinder.rules import NameRules  # noqa: E402
+from filefinder.signatures import SignatureSet  # noqa: E402
+from filefinder.walker import scan_tree, ScanPolicy, WalkProgress  # noqa: E402
+
+
+def peak_rss_kb():
+    """Пиковый RSS текущего процесса в КиБ."""
+    try:
+        import resource
+    except ImportError:
+        return _windows_peak_rss_kb()
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # На macOS ru_maxrss в байтах, на Linux - в КиБ
+    return peak // 1024 if sys.platform == 'darwin' else peak
+
+
+def _windows_peak_rss_kb():
+    import ctypes
+    from ctypes import wintypes
+
+    class Counters(ctypes.Structure):
+        _fields_ = [('cb', wintypes.DWORD), ('PageFaultCount', wintypes.DWORD)] + [
+            (name, ctypes.c_size_t) for name in (
+                'PeakWorkingSetSize', 'WorkingSetSize', 'QuotaPeakPagedPoolUsage', 'QuotaPagedPoolUsage',
+                'QuotaPeakNonPagedPoolUsage', 'QuotaNonPagedPoolUsage', 'PagefileUsage', 'PeakPagefileUsage')]
+
+    counters = Counters()
+    counters.cb = ctypes.sizeof(counters)
+    process = ctypes.windll.kernel32.GetCurrentProcess()
+    if not ctypes.windll.psapi.GetProcessMemoryInfo(process, ctypes.byref(counters), counters.cb):
+        return None
+    return counters.PeakWorkingSetSize // 1024
+
+
+def revision():
+    """Ревизия git, если замер запущен из репозитория."""
+    try:
+        return subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], capture_output=True, text=True,
+                              cwd=os.path.dirname(os.path.abspath(__file__)), timeout=10).stdout.strip() or None
+    except (OSError, subprocess.SubprocessError):
+        return None
+
+
+def list_tree(root_dir):
+    """Все файлы и имена папок дерева: входные данные для стадий после обхода."""
+    files, folder_names = [], []
+    for dirpath, dirnames, filenames in os.walk(root_dir):
+        folder_names.extend(dirnames)
+        files.extend(os.path.join(dirpath, filename) for filename in filenames)
+    return files, folder_names
+
+
+def measure(func, repeat):
+    """Лучшее время из repeat запусков и результат последнего."""
+    best = None
+    result = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = func()
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best, result
+
+
+def stage_record(seconds, items, size=None, **extra):
+    record = {'seconds': round(seconds, 4), 'items': items,
+              'items_per_s': round(items / seconds, 1) if seconds else None}
+    if size is not None:
+        record['bytes'] = size
+        record['mb_per_s'] = round(size / seconds / 1e6, 2) if seconds else None
+    record.update(extra)
+    record['peak_rss_kb'] = peak_rss_kb()
+    return record
+
+
+def run_stages(root_dir, planted, signatures, args):
+    stages = {}
+    files, folder_names = list_tree(root_dir)
+    jars = [path for path in files if path.lower().endswith('.jar')]
+    plain = [path for path in files if not path.lower().endswith('.jar')]
+
+    def walk():
+        progress = WalkProgress()
+        for _ in scan_tree(root_dir, NameRules(()), NameRules(()), progress=progress):
+            pass
+        return progress.entries
+    seconds, entries = measure(walk, args.repeat)
+    stages['walk'] = stage_record(seconds, entries)
+
+    names = [os.path.basename(path).lower() for path in files]
+    folders = [name.lower() for name in folder_names]
+
+    def name_match():
+        file_matcher, folder_matcher = signatures.file_matcher, signatures.folder_matcher
+        return (sum(1 for name in names if file_matcher.search(name))
+                + sum(1 for name in folders if folder_matcher.search(name)))
+    seconds, matched = measure(name_match, args.repeat)
+    stages['name_match'] = stage_record(seconds, len(names) + len(folders), matched=matched,
+                                        planted=len(planted.by_name))
+
+    def content():
+        return {path for path in plain if scan_file(path, signatures.content_matcher)}
+    seconds, found = measure(content, args.repeat)
+    stages['content'] = stage_record(seconds, len(plain), sum(os.path.getsize(path) for path in plain),
+                                     found=len(found), planted=len(planted.by_content),
+                                     missed=len(set(planted.by_content) - found))
+
+    inspector = JarInspector(signatures.jar_member_matcher, signatures.jar_content_matcher)
+
+    def jar():
+        return {path for path in jars if inspector.inspect(path)}
+    seconds, found = measure(jar, args.repeat)
+    stages['jar'] = stage_record(seconds, len(jars), sum(os.path.getsize(path) for path in jars),
+                                 found=len(found), planted=len(planted.jars),
+                                 missed=len(set(planted.jars) - found))
+
+    policy = None if args.no_priority else ScanPolicy()
+    scanner = Scanner.from_signatures(signatures, threads=args.threads, processes=args.processes, policy=policy)
+    try:
+        # Первый прогон поднимает пулы, как и первое нажатие "Искать"
+        list(scanner.scan(root_dir))
+        seconds, findings = measure(lambda: list(scanner.scan(root_dir)), args.repeat)
+    finally:
+        scanner.close()
+    flagged = {finding.path for finding in findings if finding.verdict}
+    # Время до первого вердикта последнего прогона: главный показатель для живой проверки
+    stages['pipeline'] = stage_record(seconds, len(files), findings=len(findings), flagged=len(flagged),
+                                      missed_jars=len(set(planted.jars) - flagged),
+                                      first_verdict_seconds=scanner.metrics.summary()['first_verdict_seconds'],
+                                      priority=policy is not None, threads=args.threads, processes=args.processes)
+    return stages
+
+
+def compare(report, baseline):
+    """Сравнение стадий с прежним отчетом: время и пиковый RSS."""
+    lines = [f"ревизия {baseline.get('revision')} -> {report.get('revision')}"]
+    for name, stage in report['stages'].items():
+        before = baseline.get('stages', {}).get(name)
+        if not before or not before.get('seconds'):
+            lines.append(f"{name:<11} {stage['seconds']:.3f} с (нет в прежнем отчете)")
+            continue
+        ratio = before['seconds'] / stage['seconds'] if stage['seconds'] else float('inf')
+        lines.append(f"{name:<11} {before['seconds']:.3f} с -> {stage['seconds']:.3f} с (x{ratio:.2f}), "
+                     f"RSS {before.get('peak_rss_kb')} -> {stage.get('peak_rss_kb')} КиБ")
+    return '\n'.join(lines)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--files', type=int, default=DEFAULT_SPEC.files)
+    parser.add_argument('--dirs', type=int, default=DEFAULT_SPEC.dirs)
+    parser.add_argument('--jars', type=int, default=DEFAULT_SPEC.jars)
+    parser.add_argument('--members', type=int, default=DEFAULT_SPEC.members, help="записей в каждом .jar")
+    parser.add_argument('--member-size', type=int, default=DEFAULT_SPEC.member_size)
+    parser.add_argument('--file-size', type=int, default=DEFAULT_SPEC.file_size)
+    parser.add_argument('--cheat-fraction', type=float, default=DEFAULT_SPEC.cheat_fraction)
+    parser.add_argument('--seed', type=int, default=DEFAULT_SPEC.seed)
+    parser.add_argument('--repeat', type=int, default=3)
+    parser.add_argument('--threads', type=int, default=default_threads())
+    parser.add_argument('--processes', type=int, default=default_processes())
+    parser.add_argument('--no-priority', action='store_true', help="конвейер без очередности обхода по риску")
+    parser.add_argument('--root', help="папка для дерева; по умолчанию временная и удаляется после замера")
+    parser.add_argument('--out', help="файл для отчета; по умолчанию отчет выводится в stdout")
+    parser.add_argument('--compare', metavar='JSON', help="прежний отчет для сравнения")
+    args = parser.parse_args()
+
+    spec = TreeSpec(args.files, args.dirs, args.jars, args.members, args.member_size, args.file_size,
+                    args.cheat_fraction, args.seed)
+    root_dir = args.root or tempfile.mkdtemp(prefix='filefinder-bench-')
+    try:
+        start = time.perf_counter()
+        planted = generate(root_dir, spec)
+        generated = time.perf_counter() - start
+        print(f"Дерево создано за {generated:.1f} с: {root_dir}", file=sys.stderr)
+        signatures = SignatureSet.load()
+        report = {
+            'revision': revision(),
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+            'cpu_count': os.cpu_count(),
+            'spec': spec._asdict(),
+            'stages': run_stages(root_dir, planted, signatures, args),
+            'peak_rss_kb': peak_rss_kb(),
+        }
+    finally:
+        if not args.root:
+            shutil.rmtree(root_dir, ignore_errors=True)
+
+    text = json.dumps(report, ensure_ascii=False, indent=2)
+    if args.out:
+        with open(args.out, 'w', encoding='utf-8') as file:
+            file.write(text + '\n')
+    else:
+        print(text)
+    if args.compare:
+        with open(args.compare, 'r', encoding='utf-8') as file:
+            print(compare(report, json.load(file)), file=sys.stderr)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,127 @@
+"""Сравнение однопроходного обхода с прежними двумя os.walk.
+
+Запуск из корня репозитория:
+    python benchmarks/bench_walk.py --entries 500000
+"""
+import os
+import sys
+import time
+import shutil
+import random
+import argparse
+import tempfile
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from filefinder.rules import NameRules  # noqa: E402
+from filefinder.walker import scan_tree, FILE  # noqa: E402
+
+KEYWORDS = [
+    'xray', 'impact', 'meteorclient', 'fullbright', 'freecam',
+    'aristois', 'auto aim', 'chestesp', 'trajectory preview',
+    'x-ray', 'baritone', 'fabritone', 'entity outliner',
+    'wwe', 'matix', 'enemyz', 'noplayerdamage',
+    'detection', 'player highlighter'
+]
+FOLDER_KEYWORDS = ['impact', 'cheat', 'hacks', 'aristois', 'meteorclient', 'hack']
+BLACKLISTED_FOLDERS = ['grossjava9hacks']
+
+
+def generate_tree(root_dir, entries, seed=0):
+    """Синтетическое дерево примерно из entries файлов и папок в духе assets/objects."""
+    rng = random.Random(seed)
+    created = 0
+    dir_index = 0
+    while created < entries:
+        group = os.path.join(root_dir, 'assets', 'objects', f"{dir_index // 256:02x}", f"{dir_index % 256:02x}")
+        os.makedirs(group, exist_ok=True)
+        created += 1
+        for _ in range(min(200, entries - created)):
+            name = f"{rng.getrandbits(64):016x}"
+            if rng.random() < 0.001:
+                name += '-xray.jar'
+            open(os.path.join(group, name), 'w').close()
+            created += 1
+        dir_index += 1
+    os.makedirs(os.path.join(root_dir, 'mods', 'hacks'), exist_ok=True)
+    os.makedirs(os.path.join(root_dir, 'config', 'grossjava9hacks', 'impact'), exist_ok=True)
+    return created
+
+
+def legacy_two_walks(root_dir):
+    """Прежний путь: отдельный os.walk для файлов и для папок."""
+    keywords = [keyword.lower() for keyword in KEYWORDS]
+    found_files = []
+    for dirpath, dirnames, filenames in os.walk(root_dir):
+        for filename in filenames:
+            full_path = os.path.join(dirpath, filename)
+            os.path.basename(full_path).startswith('.')
+            if any(keyword in filename.lower() for keyword in keywords):
+                found_files.append(full_path)
+
+    folder_keywords = [keyword.lower() for keyword in FOLDER_KEYWORDS]
+    blacklisted = [folder.lower() for folder in BLACKLISTED_FOLDERS]
+    found_folders = set()
+    for dirpath, dirnames, filenames in os.walk(root_dir):
+        for dirname in dirnames:
+            full_path = os.path.join(dirpath, dirname)
+            os.path.basename(full_path).startswith('.')
+            dirname_lower = dirname.lower()
+            if dirname_lower in blacklisted:
+                continue
+            if any(keyword in dirname_lower for keyword in folder_keywords):
+                found_folders.add(full_path)
+    return found_files, list(found_folders)
+
+
+def single_pass(root_dir):
+    found_files = []
+    found_folders = []
+    file_matcher = NameRules(KEYWORDS)
+    folder_matcher = NameRules(FOLDER_KEYWORDS)
+    for match in scan_tree(root_dir, file_matcher, folder_matcher, BLACKLISTED_FOLDERS):
+        (found_files if match.kind == FILE else found_folders).append(match.path)
+    return found_files, found_folders
+
+
+def best_of(func, root_dir, repeat):
+    best = None
+    result = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = func(root_dir)
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best, result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--entries', type=int, default=500000)
+    parser.add_argument('--repeat', type=int, default=3)
+    parser.add_argument('--root', help="готовое дерево; по умолчанию создается во временной папке")
+    args = parser.parse_args()
+
+    root_dir = args.root
+    cleanup = root_dir is None
+    if cleanup:
+        root_dir = tempfile.mkdtemp(prefix='filefinder-bench-')
+        start = time.perf_counter()
+        created = generate_tree(root_dir, args.entries)
+        print(f"Создано {created} элементов за {time.perf_counter() - start:.1f} с")
+
+    try:
+        legacy_time, (legacy_files, legacy_folders) = best_of(legacy_two_walks, root_dir, args.repeat)
+        new_time, (new_files, new_folders) = best_of(single_pass, root_dir, args.repeat)
+        print(f"два os.walk:   {legacy_time:.3f} с ({len(legacy_files)} файлов, {len(legacy_folders)} папок)")
+        print(f"один scandir:  {new_time:.3f} с ({len(new_files)} файлов, {len(new_folders)} папок)")
+        print(f"ускорение:     x{legacy_time / new_time:.2f}")
+        if sorted(legacy_files) != sorted(new_files):
+            print("ВНИМАНИЕ: списки файлов различаются")
+    finally:
+        if cleanup:
+            shutil.rmtree(root_dir, ignore_errors=True)
+
+
+if __name__ == '__main__':
+    main()
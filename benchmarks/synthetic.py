@@ -0,0 +1,117 @@
+"""Генератор воспроизводимых синтетических папок .minecraft для замеров.
+
+При одинаковых параметрах и seed дерево получается байт в байт одинаковым.
+Часть файлов и .jar получает подложенные читы: по имени, по содержимому,
+по имени записи .jar и по строке в пуле констант класса в обфусцированном .jar.
+"""
+import os
+import json
+import struct
+import random
+import zipfile
+from collections import namedtuple
+
+# Параметры дерева: files обычных файлов в dirs папках, jars архивов по members записей
+TreeSpec = namedtuple('TreeSpec', ['files', 'dirs', 'jars', 'members', 'member_size', 'file_size',
+                                   'cheat_fraction', 'seed'])
+# Что подложено: пути, которые проверка обязана найти
+Planted = namedtuple('Planted', ['by_name', 'by_content', 'jars'])
+
+DEFAULT_SPEC = TreeSpec(files=20000, dirs=400, jars=200, members=64, member_size=4096,
+                        file_size=4096, cheat_fraction=0.01, seed=0)
+
+TOP_DIRS = ['config', 'saves/world/region', 'resourcepacks', 'shaderpacks', 'logs',
+            'versions/1.20.1', 'assets/objects', 'screenshots']
+TEXT_EXTENSIONS = ['.txt', '.json', '.toml', '.log', '.properties', '.dat']
+CHEAT_NAMES = ['xray', 'freecam', 'baritone', 'fullbright']
+CHEAT_CONTENT = [b'aimbot', b'meteorclient', b'wallhack', b'baritone']
+CHEAT_MEMBERS = ['meteordevelopment/meteorclient/MeteorClient.class', 'baritone/api/BaritoneAPI.class',
+                 'net/wurstclient/hacks/KillauraHack.class']
+CHEAT_POOL = ['baritone/api/IBaritone', 'meteordevelopment/meteorclient/systems/modules/Module']
+# Фиксированная дата записей: иначе архивы отличаются от запуска к запуску
+ZIP_DATE = (2020, 1, 1, 0, 0, 0)
+
+
+def class_bytes(rng, names, code_size):
+    """Минимальный class-файл: пул констант из строк names и случайный "байт-код"."""
+    pool = []
+    for name in names:
+        data = name.encode('utf-8')
+        pool.append(b'\x01' + struct.pack('>H', len(data)) + data)
+    pool.append(b'\x07\x00\x01')
+    pool.append(b'\x0c\x00\x01\x00\x02')
+    header = b'\xca\xfe\xba\xbe\x00\x00\x00\x3d' + struct.pack('>H', len(pool) + 1)
+    code = bytes(rng.getrandbits(8) & 0x7f for _ in range(min(code_size, 512)))
+    code = (code * (code_size // max(len(code), 1) + 1))[:code_size]
+    return header + b''.join(pool) + b'\x00\x21' + code
+
+
+def write_member(jar, name, data):
+    info = zipfile.ZipInfo(name, date_time=ZIP_DATE)
+    info.compress_type = zipfile.ZIP_DEFLATED
+    jar.writestr(info, data)
+
+
+def text_bytes(rng, size):
+    words = [b'block', b'entity', b'render', b'chunk', b'player', b'option', b'true', b'false', b'0.5']
+    out = bytearray()
+    while len(out) < size:
+        out += rng.choice(words) + (b'\n' if rng.random() < 0.1 else b' ')
+    return bytes(out[:size])
+
+
+def generate(root_dir, spec=DEFAULT_SPEC):
+    """Создать дерево в root_dir по spec. Возвращает Planted."""
+    rng = random.Random(spec.seed)
+    by_name, by_content, jars = [], [], []
+
+    folders = []
+    for i in range(max(spec.dirs, 1)):
+        top = TOP_DIRS[i % len(TOP_DIRS)]
+        folder = os.path.join(root_dir, *top.split('/'), f"{i // len(TOP_DIRS):04d}")
+        os.makedirs(folder, exist_ok=True)
+        folders.append(folder)
+
+    for i in range(spec.files):
+        folder = folders[i % len(folders)]
+        extension = TEXT_EXTENSIONS[i % len(TEXT_EXTENSIONS)]
+        data = text_bytes(rng, spec.file_size)
+        roll = rng.random()
+        if roll < spec.cheat_fraction / 2:
+            path = os.path.join(folder, f"{rng.choice(CHEAT_NAMES)}-{i}{extension}")
+            by_name.append(path)
+        else:
+            path = os.path.join(folder, f"file-{i}{extension}")
+            if roll < spec.cheat_fraction:
+                # Имя чистое, сигнатура внутри содержимого: такие файлы находит стадия content
+                position = rng.randrange(max(len(data) - 16, 1))
+                data = data[:position] + rng.choice(CHEAT_CONTENT) + data[position:]
+                by_content.append(path)
+        with open(path, 'wb') as file:
+            file.write(data)
+
+    mods = os.path.join(root_dir, 'mods')
+    os.makedirs(mods, exist_ok=True)
+    for i in range(spec.jars):
+        path = os.path.join(mods, f"mod-{i:05d}.jar")
+        kind = None
+        if rng.random() < spec.cheat_fraction:
+            kind = rng.choice(['member', 'pool'])
+            jars.append(path)
+        with zipfile.ZipFile(path, 'w') as jar:
+            if kind != 'pool':
+                write_member(jar, 'fabric.mod.json', json.dumps({'schemaVersion': 1, 'id': f"mod{i}", 'version': '1.0.0'}))
+            for j in range(spec.members):
+                if kind == 'pool':
+                    # Обфусцированный архив без описания: найти чит можно только в пуле констант
+                    name = f"{chr(97 + j % 26)}{chr(97 + j // 26 % 26)}.class"
+                    strings = ['java/lang/Object', name[:-6]]
+                    if j == spec.members // 2:
+                        strings.append(rng.choice(CHEAT_POOL))
+                else:
+                    name = f"net/example/mod{i}/Class{j}.class"
+                    strings = ['java/lang/Object', name[:-6], 'render', '(Ljava/lang/String;)V']
+                write_member(jar, name, class_bytes(rng, strings, spec.member_size))
+            if kind == 'member':
+                write_member(jar, rng.choice(CHEAT_MEMBERS), class_bytes(rng, ['java/lang/Object'], 256))
+    return Planted(by_name, by_content, jars)
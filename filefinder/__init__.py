@@ -0,0 +1 @@
+"""Движок проверки FileFinder: обход, сопоставление и анализ без зависимости от GUI."""
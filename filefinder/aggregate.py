@@ -0,0 +1,151 @@
+import heapq
+import logging
+from collections import namedtuple
+
+from .bundle import BundleError, iter_bundles
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_CAPACITY = 10000  # Счетчиков на каждый вид (хеши, пути); память не зависит от числа пакетов
+
+# Частый элемент: сколько машин его видели и насколько счет может быть завышен
+HeavyHitter = namedtuple('HeavyHitter', ['item', 'count', 'error', 'example'])
+
+
+class SpaceSaving:
+    """Приближенный подсчет самых частых элементов потока в фиксированной памяти (Space-Saving).
+
+    Хранит не более capacity счетчиков. Новый элемент при заполнении
+    вытесняет элемент с наименьшим счетом и наследует этот счет как
+    возможную ошибку. Любой элемент, встретившийся чаще total / capacity
+    раз, гарантированно остается в таблице, а его настоящий счет лежит
+    между count - error и count. Минимум ищется по куче с ленивым
+    удалением устаревших записей.
+    """
+
+    def __init__(self, capacity=DEFAULT_CAPACITY):
+        if capacity < 1:
+            raise ValueError("Число счетчиков должно быть положительным")
+        self.capacity = capacity
+        self.total = 0
+        self._counts = {}
+        self._errors = {}
+        self._examples = {}
+        self._heap = []
+
+    def add(self, item, example=None):
+        self.total += 1
+        count = self._counts.get(item)
+        if count is None:
+            error = 0
+            if len(self._counts) >= self.capacity:
+                error = self._evict()
+            count = error
+            self._errors[item] = error
+            self._examples[item] = example
+        count += 1
+        self._counts[item] = count
+        heapq.heappush(self._heap, (count, item))
+        if len(self._heap) > 4 * self.capacity:
+            self._heap = [(count, item) for item, count in self._counts.items()]
+            heapq.heapify(self._heap)
+
+    def _evict(self):
+        while True:
+            count, item = heapq.heappop(self._heap)
+            if self._counts.get(item) == count:
+                del self._counts[item]
+                del self._errors[item]
+                del self._examples[item]
+                return count
+
+    def top(self, limit=None):
+        """Элементы по убыванию счета."""
+        ranked = sorted(self._counts.items(), key=lambda pair: (-pair[1], pair[0]))
+        return [HeavyHitter(item, count, self._errors[item], self._examples[item])
+                for item, count in ranked[:limit]]
+
+    def __len__(self):
+        return len(self._counts)
+
+
+class FleetReport:
+    """Сводка по пакетам проверок многих компьютеров за один проход.
+
+    Пакеты читаются по одному; хеши, пути и версии сигнатур считаются
+    в SpaceSaving, поэтому память ограничена числом счетчиков, а не
+    числом пакетов. Каждый хеш и путь засчитывается один раз на пакет:
+    счет - это число машин, где он встретился.
+    """
+
+    def __init__(self, capacity=DEFAULT_CAPACITY):
+        self.hashes = SpaceSaving(capacity)  # Хеши файлов-находок, пример - путь
+        self.paths = SpaceSaving(capacity)  # Пути от папки лаунчера, пример - вердикт или правило
+        self.cheat_hashes = SpaceSaving(capacity)  # Хеши файлов с вердиктом, пример - вердикт
+        self.versions = SpaceSaving(64)
+        self.bundles = 0
+        self.rejected = 0
+        self.cancelled = 0
+        self.findings = 0
+        self.cheats = 0
+        self.machines_with_cheats = 0
+        self.seconds = 0.0
+        self.max_seconds = 0.0
+
+    def add(self, bundle):
+        self.bundles += 1
+        self.cancelled += bool(bundle.cancelled)
+        self.seconds += bundle.seconds or 0.0
+        self.max_seconds = max(self.max_seconds, bundle.seconds or 0.0)
+        self.versions.add(bundle.signature_version or '')
+        hashes = {}
+        paths = {}
+        cheats = {}
+        found_cheat = False
+        for finding in bundle.findings:
+            self.findings += 1
+            if finding.verdict:
+                self.cheats += 1
+                found_cheat = True
+            paths.setdefault(finding.path.lower(), finding.verdict or finding.keyword)
+            if finding.digest:
+                hashes.setdefault(finding.digest, finding.path)
+                if finding.verdict:
+                    cheats.setdefault(finding.digest, finding.verdict)
+        self.machines_with_cheats += found_cheat
+        for digest, example in hashes.items():
+            self.hashes.add(digest, example)
+        for path, example in paths.items():
+            self.paths.add(path, example)
+        for digest, example in cheats.items():
+            self.cheat_hashes.add(digest, example)
+
+    def add_directory(self, directory, key):
+        """Добавить все пакеты папки. Пакеты с неверной подписью пропускаются с предупреждением."""
+        for path, bundle in iter_bundles(directory, key):
+            if isinstance(bundle, BundleError):
+                logger.warning(f"Пакет пропущен: {bundle}")
+                self.rejected += 1
+                continue
+            self.add(bundle)
+        return self
+
+    def summary(self, top=50):
+        def hitters(counter):
+            return [{'item': hitter.item, 'machines': hitter.count, 'error': hitter.error, 'example': hitter.example}
+                    for hitter in counter.top(top)]
+
+        return {
+            'bundles': self.bundles,
+            'rejected': self.rejected,
+            'cancelled': self.cancelled,
+            'findings': self.findings,
+            'cheats': self.cheats,
+            'machines_with_cheats': self.machines_with_cheats,
+            'mean_seconds': round(self.seconds / self.bundles, 3) if self.bundles else None,
+            'max_seconds': round(self.max_seconds, 3),
+            'signature_versions': {hitter.item: hitter.count for hitter in self.versions.top()},
+            'top_hashes': hitters(self.hashes),
+            'top_cheat_hashes': hitters(self.cheat_hashes),
+            'top_paths': hitters(self.paths),
+        }
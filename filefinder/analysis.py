@@ -0,0 +1,89 @@
+import os
+import sys
+import time
+import hashlib
+import logging
+import functools
+from collections import namedtuple
+
+from .content import CountingReader, scan_stream
+from .jar import InflateBudget, JarInspector
+
+logger = logging.getLogger(__name__)
+
+# Меняется вместе с логикой анализа: входит в версию набора сигнатур и сбрасывает индекс проверки.
+# Вместе с ним в версию входит хеш кода анализа (analyzer_code_version), так что правка кода
+# без смены номера тоже сбрасывает индекс и кеш сигнатур
+ANALYZER_VERSION = '2'
+
+# Виды анализа: архив проверяется JarInspector, остальные файлы - по содержимому
+JAR, CONTENT = 'jar', 'content'
+
+# Результат анализа с замерами: вердикт, стенное и процессорное время, прочитано и распаковано байт.
+# incomplete - файл проверен не до конца (ошибка чтения, поврежденный архив,
+# исчерпан предел распаковки): отсутствие вердикта тогда не значит, что файл чистый
+Analysis = namedtuple('Analysis', ['verdict', 'wall', 'cpu', 'read', 'inflated', 'incomplete'])
+
+
+def code_version(*modules):
+    """Хеш исходного кода модулей.
+
+    В собранном exe исходников нет, и вместо них учитываются путь, размер
+    и время изменения exe: код там меняется только вместе с ним.
+    """
+    digest = hashlib.sha1()
+    for module in modules:
+        try:
+            with open(module.__file__, 'rb') as file:
+                digest.update(file.read())
+        except (OSError, TypeError, AttributeError):
+            stat_result = os.stat(sys.executable)
+            digest.update(f"{sys.executable}\0{stat_result.st_size}\0{stat_result.st_mtime_ns}".encode('utf-8'))
+    return digest.hexdigest()
+
+
+@functools.lru_cache(maxsize=None)
+def analyzer_code_version():
+    """Хеш кода, от которого зависят вердикты: анализ, .jar, классы, потоковая проверка и автоматы."""
+    from . import classfile, content, jar, matcher, rules
+    return code_version(sys.modules[__name__], jar, classfile, content, matcher, rules)
+
+
+class Analyzer:
+    """Анализ содержимого найденных файлов по скомпилированным наборам сигнатур.
+
+    Содержит только данные, поэтому передается в рабочие процессы.
+    """
+
+    def __init__(self, jar_member_matcher, content_matcher, jar_content_matcher):
+        self.content_matcher = content_matcher
+        self.jar = JarInspector(jar_member_matcher, jar_content_matcher)
+
+    @staticmethod
+    def kind(file_path):
+        """Вид анализа файла: от него, а не только от содержимого, зависит вердикт."""
+        return JAR if file_path.lower().endswith(".jar") else CONTENT
+
+    def analyze_measured(self, file_path):
+        """Анализ содержимого файла с замерами для метрик проверки.
+
+        Возвращает Analysis; verdict - сработавшая сигнатура или None.
+        """
+        started, cpu_started = time.perf_counter(), time.thread_time()
+        budget = InflateBudget(self.jar.max_inflate)
+        failed = False
+        reader = None
+        try:
+            with open(file_path, 'rb') as file:
+                reader = CountingReader(file)
+                if self.kind(file_path) == JAR:
+                    verdict = self.jar.inspect(reader, budget)
+                else:
+                    verdict = scan_stream(reader, self.content_matcher)
+        except Exception as e:
+            logger.error(f"Ошибка анализа файла {file_path}: {e}")
+            verdict = None
+            failed = True
+        return Analysis(verdict, time.perf_counter() - started, time.thread_time() - cpu_started,
+                        reader.bytes_read if reader is not None else 0, budget.used,
+                        verdict is None and (failed or budget.exhausted))
@@ -0,0 +1,138 @@
+import os
+import hmac
+import json
+import zlib
+import hashlib
+import logging
+import platform
+from collections import namedtuple
+from datetime import datetime
+
+from .content import file_digest
+from .walker import FILE
+
+logger = logging.getLogger(__name__)
+
+MAGIC = b'FFB1'  # Формат файла: MAGIC, HMAC-SHA256 сжатых данных, сжатый JSON
+TAG_SIZE = 32
+BUNDLE_EXT = '.ffb'
+KEY_ENV = 'FILEFINDER_BUNDLE_KEY'  # Общий ключ подписи, если не указан файл ключа
+
+# Находка в пакете: путь относительно папки лаунчера, а не полный путь с именем пользователя
+BundleFinding = namedtuple('BundleFinding', ['root', 'path', 'kind', 'keyword', 'hidden', 'verdict', 'digest'])
+Bundle = namedtuple('Bundle', ['machine', 'created', 'signature_version', 'roots', 'seconds', 'cancelled',
+                               'metrics', 'findings', 'signature_release'])
+
+
+class BundleError(ValueError):
+    """Пакет поврежден, подделан или подписан другим ключом."""
+
+
+def load_key(key_file=None):
+    """Ключ подписи из файла или переменной FILEFINDER_BUNDLE_KEY; None, если его нет."""
+    if key_file:
+        with open(key_file, 'rb') as file:
+            key = file.read().strip()
+    else:
+        key = os.environ.get(KEY_ENV, '').encode('utf-8')
+    return key or None
+
+
+def relative_path(path, root):
+    """Путь находки от папки лаунчера включительно: '.minecraft/mods/x.jar' на любом компьютере."""
+    if not root:
+        return path.replace('\\', '/')
+    rel = os.path.relpath(path, root) if path != root else ''
+    name = os.path.basename(root.rstrip('\\/'))
+    return '/'.join(part for part in [name] + rel.replace('\\', '/').split('/') if part and part != '.')
+
+
+def _digest(finding):
+    if finding.kind != FILE:
+        return None
+    if finding.digest:
+        return finding.digest
+    try:
+        return file_digest(finding.path).hex()
+    except OSError as e:
+        logger.warning(f"Не удалось вычислить хеш {finding.path}: {e}")
+        return None
+
+
+def write_bundle(path, key, findings, roots, signature_version, seconds, cancelled=False, metrics=None,
+                 machine=None, release=None):
+    """Сохранить итог проверки в сжатый подписанный пакет path.
+
+    Для файлов-находок сохраняется BLAKE2b-хеш содержимого - тот же, что в
+    списках --known-good/--known-cheat. Обычно его уже посчитал конвейер
+    (Finding.digest), и файл читается заново, только если хеша нет.
+    release - версия базы сигнатур.
+    Запись атомарна: сначала во временный файл, затем переименование.
+    """
+    if not key:
+        raise ValueError(f"Не задан ключ подписи пакетов ({KEY_ENV} или файл ключа)")
+    roots = list(roots)
+    positions = {root: index for index, root in enumerate(roots)}
+    records = []
+    for finding in findings:
+        root = positions.get(finding.root)
+        records.append([root, relative_path(finding.path, finding.root), finding.kind, finding.keyword,
+                        int(bool(finding.hidden)), finding.verdict, _digest(finding)])
+    payload = {
+        'machine': machine or platform.node(),
+        'created': datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
+        'signature_version': signature_version,
+        'signature_release': release,
+        'roots': roots,
+        'seconds': seconds,
+        'cancelled': bool(cancelled),
+        'metrics': metrics,
+        'findings': records,
+    }
+    data = zlib.compress(json.dumps(payload, ensure_ascii=False, separators=(',', ':')).encode('utf-8'), 9)
+    tag = hmac.new(key, data, hashlib.sha256).digest()
+    temp_path = path + '.tmp'
+    with open(temp_path, 'wb') as file:
+        file.write(MAGIC + tag + data)
+    os.replace(temp_path, path)
+    return path
+
+
+def bundle_name(machine=None):
+    """Имя файла пакета: компьютер и время, чтобы пакеты разных машин не совпадали."""
+    machine = ''.join(char if char.isalnum() or char in '-_' else '_' for char in (machine or platform.node()))
+    return f"{machine or 'pc'}-{datetime.now().strftime('%Y%m%d-%H%M%S')}{BUNDLE_EXT}"
+
+
+def read_bundle(path, key):
+    """Прочитать и проверить пакет. BundleError, если подпись не сходится или данные повреждены."""
+    with open(path, 'rb') as file:
+        blob = file.read()
+    if len(blob) < len(MAGIC) + TAG_SIZE or not blob.startswith(MAGIC):
+        raise BundleError(f"{path}: не пакет FileFinder")
+    tag = blob[len(MAGIC):len(MAGIC) + TAG_SIZE]
+    data = blob[len(MAGIC) + TAG_SIZE:]
+    if not hmac.compare_digest(tag, hmac.new(key, data, hashlib.sha256).digest()):
+        raise BundleError(f"{path}: подпись не совпадает")
+    try:
+        payload = json.loads(zlib.decompress(data).decode('utf-8'))
+        roots = payload['roots']
+        findings = [BundleFinding(roots[root] if root is not None else None, rel, kind, keyword, bool(hidden),
+                                  verdict, digest)
+                    for root, rel, kind, keyword, hidden, verdict, digest in payload['findings']]
+        return Bundle(payload['machine'], payload['created'], payload['signature_version'], roots,
+                      payload['seconds'], payload['cancelled'], payload.get('metrics'), findings,
+                      payload.get('signature_release'))
+    except (zlib.error, UnicodeDecodeError, ValueError, KeyError, TypeError, IndexError) as e:
+        raise BundleError(f"{path}: поврежденные данные: {e}")
+
+
+def iter_bundles(directory, key):
+    """Пакеты папки по одному: в памяти всегда только текущий. Выдает (путь, пакет или BundleError)."""
+    with os.scandir(directory) as entries:
+        paths = sorted(entry.path for entry in entries if entry.name.endswith(BUNDLE_EXT) and entry.is_file())
+    for path in paths:
+        try:
+            yield path, read_bundle(path, key)
+        except (OSError, BundleError) as e:
+            yield path, e if isinstance(e, BundleError) else BundleError(f"{path}: {e}")
@@ -0,0 +1,103 @@
+import logging
+
+from .content import scan_stream
+
+logger = logging.getLogger(__name__)
+
+CLASS_MAGIC = b'\xca\xfe\xba\xbe'
+CLASS_CHUNK_SIZE = 64 * 1024  # Классы читаются блоками, пока не закончится пул констант
+
+CONSTANT_UTF8 = 1
+# Размер записи пула констант без байта тега, для всех тегов кроме Utf8
+_CONSTANT_SIZES = {
+    3: 4,   # Integer
+    4: 4,   # Float
+    5: 8,   # Long
+    6: 8,   # Double
+    7: 2,   # Class
+    8: 2,   # String
+    9: 4,   # Fieldref
+    10: 4,  # Methodref
+    11: 4,  # InterfaceMethodref
+    12: 4,  # NameAndType
+    15: 3,  # MethodHandle
+    16: 2,  # MethodType
+    17: 4,  # Dynamic
+    18: 4,  # InvokeDynamic
+    19: 2,  # Module
+    20: 2,  # Package
+}
+# Long и Double занимают в пуле по две позиции
+_WIDE_CONSTANTS = (5, 6)
+
+
+class _TruncatedClass(Exception):
+    """Class-файл закончился посреди пула констант."""
+
+
+class _Reader:
+    """Буфер, дочитывающий поток по мере разбора, без копирования уже прочитанного."""
+
+    __slots__ = ('stream', 'buffer', 'chunk_size')
+
+    def __init__(self, stream, chunk_size):
+        self.stream = stream
+        self.buffer = bytearray()
+        self.chunk_size = chunk_size
+
+    def need(self, end):
+        while len(self.buffer) < end:
+            chunk = self.stream.read(max(self.chunk_size, end - len(self.buffer)))
+            if not chunk:
+                raise _TruncatedClass()
+            self.buffer += chunk
+
+
+def scan_class(stream, matcher, chunk_size=CLASS_CHUNK_SIZE):
+    """Проверка class-файла по строкам пула констант. Возвращает сигнатуру или None.
+
+    Разбирается только пул констант: все имена классов, методов и полей,
+    дескрипторы и строковые литералы лежат в его записях Utf8. Байт-код
+    методов после пула не читается и не распаковывается. Строки
+    проверяются по отдельности: сигнатура не складывается из соседних.
+    Поток, который не является class-файлом, проверяется целиком, как
+    обычное содержимое.
+    """
+    reader = _Reader(stream, chunk_size)
+    try:
+        reader.need(10)
+    except _TruncatedClass:
+        return matcher.search_chunk(reader.buffer)[0]
+    buffer = reader.buffer
+    if buffer[:4] != CLASS_MAGIC:
+        signature, tail = matcher.search_chunk(buffer)
+        return signature or scan_stream(stream, matcher, chunk_size, tail)
+
+    count = int.from_bytes(buffer[8:10], 'big')
+    position = 10
+    index = 1
+    strings = []
+    try:
+        while index < count:
+            reader.need(position + 3)
+            tag = buffer[position]
+            if tag == CONSTANT_UTF8:
+                length = int.from_bytes(buffer[position + 1:position + 3], 'big')
+                start = position + 3
+                position = start + length
+                reader.need(position)
+                strings.append(buffer[start:position])
+            else:
+                size = _CONSTANT_SIZES.get(tag)
+                if size is None:
+                    logger.debug(f"Неизвестный тег {tag} в пуле констант, разбор остановлен")
+                    break
+                position += 1 + size
+            index += 2 if tag in _WIDE_CONSTANTS else 1
+    except _TruncatedClass:
+        logger.debug("Class-файл обрезан посреди пула констант")
+    # В modified UTF-8 class-файлов нет нулевых байтов: разделитель не даст сигнатуре
+    # сложиться из соседних строк, а весь пул проверяется одним поиском. Копии строк
+    # и склейка дешевле поиска по каждому срезу буфера: один вызов регулярного выражения
+    # на весь пул вместо вызова на каждую из тысяч строк
+    return matcher.search_chunk(b'\0'.join(strings))[0]
@@ -0,0 +1,361 @@
+"""Консольный запуск проверки без GUI: python -m filefinder scan <папка>."""
+import os
+import sys
+import json
+import time
+import logging
+import argparse
+import threading
+from datetime import datetime
+
+from .aggregate import DEFAULT_CAPACITY, FleetReport
+from .bundle import bundle_name, load_key, write_bundle
+from .content import file_digest
+from .history import open_history
+from .index import open_index
+from .metrics import PROFILE_MODES, STOP_REASONS, Profiler
+from .paths import HISTORY_PATH, INDEX_PATH, LEGACY_HISTORY_PATH, ensure_temp_dir
+from .pipeline import Scanner
+from .roots import candidate_roots, merge_roots
+from .signatures import SignatureSet
+from .walker import DEFAULT_DEFER, DEFAULT_FIRST, FILE, ScanPolicy, WalkProgress
+from .watch import WatchSession
+
+logger = logging.getLogger(__name__)
+
+EXIT_CLEAN = 0
+EXIT_CHEATS = 1
+EXIT_ERROR = 2
+
+# Префиксы строк текстового вывода watch
+WATCH_ACTIONS = {'found': "", 'added': "+ ", 'removed': "- ", 'changed': "* "}
+
+
+def finding_record(finding):
+    """Запись находки для машинного вывода."""
+    record = finding._asdict()
+    # Файл без срабатывания по содержимому - только подозрение по имени
+    record['cheat'] = bool(finding.verdict)
+    return record
+
+
+def format_text(finding):
+    hidden = " (скрытый)" if finding.hidden else ""
+    kind = "Файл" if finding.kind == FILE else "Папка"
+    verdict = f" (чит: {finding.verdict})" if finding.verdict else ""
+    return f"{kind}: {finding.path}{hidden}{verdict}"
+
+
+def add_source_arguments(command):
+    """Общие ключи scan и watch: папки, сигнатуры, пулы и индекс."""
+    command.add_argument('roots', nargs='*', help="папки для проверки (по умолчанию все найденные папки лаунчеров)")
+    command.add_argument('--discover', action='store_true', help="добавить к указанным папкам найденные папки лаунчеров")
+    command.add_argument('-s', '--signatures', action='append', default=[], metavar='FILE',
+                         help="файл базы сигнатур (JSON), можно указать несколько раз")
+    command.add_argument('--signature-cache', metavar='PATH',
+                         help="скомпилированный кеш сигнатур: пересобирается, только если источники изменились")
+    command.add_argument('--no-builtin', action='store_true', help="не использовать встроенные сигнатуры")
+    command.add_argument('--known-good', action='append', default=[], metavar='FILE',
+                         help="список хешей заведомо чистых файлов: такие файлы не анализируются")
+    command.add_argument('--known-cheat', action='append', default=[], metavar='FILE',
+                         help="список хешей известных читов: совпадение сразу считается читом")
+    command.add_argument('-w', '--workers', type=int, help="потоков для анализа файлов")
+    command.add_argument('-p', '--processes', type=int, help="процессов для анализа .jar (0 - без процессов)")
+    command.add_argument('--index', default=INDEX_PATH, metavar='PATH', help="файл индекса проверки")
+    command.add_argument('--no-index', action='store_true', help="проверять все файлы заново, без индекса")
+    command.add_argument('--first', action='append', default=[], metavar='DIR',
+                         help=f"проверять папку раньше остальных (кроме {', '.join(DEFAULT_FIRST)})")
+    command.add_argument('--defer', action='append', default=[], metavar='DIR',
+                         help=f"проверять папку в последнюю очередь (кроме {', '.join(DEFAULT_DEFER)})")
+    command.add_argument('--skip', action='append', default=[], metavar='DIR', help="не заходить в папку")
+    command.add_argument('--no-priority', action='store_true',
+                         help="обходить папки по порядку, без очередности по риску")
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(prog='filefinder', description="Проверка папок Minecraft на читы без GUI.")
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    scan = commands.add_parser('scan', help="проверить одну или несколько папок")
+    add_source_arguments(scan)
+    scan.add_argument('--per-device', type=int, default=1, metavar='N',
+                      help="сколько папок на одном диске обходить одновременно")
+    scan.add_argument('--stop-after', type=int, metavar='N', help="остановиться после N найденных читов")
+    scan.add_argument('--time-budget', type=float, metavar='SEC',
+                      help="через SEC секунд перестать обходить папки и выдать найденное")
+    scan.add_argument('-f', '--format', choices=['ndjson', 'json', 'text'], default='ndjson',
+                      help="формат вывода: ndjson - запись на находку по мере готовности")
+    scan.add_argument('--history', default=HISTORY_PATH, metavar='PATH', help="журнал запусков")
+    scan.add_argument('--no-history', action='store_true', help="не записывать запуск в журнал")
+    scan.add_argument('--metrics', metavar='PATH', help="сохранить метрики проверки в JSON")
+    scan.add_argument('--profile', choices=PROFILE_MODES,
+                      help="профилировать проверку; отчет сохраняется в текущую папку")
+    scan.add_argument('--bundle', metavar='PATH',
+                      help="сохранить итог в сжатый подписанный пакет (файл или папка) для команды aggregate")
+    scan.add_argument('--key-file', metavar='FILE',
+                      help="ключ подписи пакета (по умолчанию - переменная FILEFINDER_BUNDLE_KEY)")
+
+    watch = commands.add_parser('watch', help="проверить папки и следить за их изменениями")
+    add_source_arguments(watch)
+    watch.add_argument('-f', '--format', choices=['ndjson', 'text'], default='ndjson',
+                       help="формат вывода: запись на находку и на каждое изменение")
+    watch.add_argument('--polling', action='store_true', help="опрашивать папки вместо уведомлений inotify")
+
+    log = commands.add_parser('history', help="показать журнал запусков")
+    log.add_argument('--history', default=HISTORY_PATH, metavar='PATH', help="журнал запусков")
+    log.add_argument('-n', '--limit', type=int, default=20, help="сколько последних запусков показать")
+    log.add_argument('--changes', nargs='?', type=int, const=0, metavar='RUN',
+                     help="что изменилось в запуске RUN (по умолчанию - в последнем) с прошлой проверки")
+
+    fleet = commands.add_parser('aggregate', help="свести пакеты проверок многих компьютеров")
+    fleet.add_argument('directory', help="папка с пакетами .ffb")
+    fleet.add_argument('--key-file', metavar='FILE',
+                       help="ключ подписи пакетов (по умолчанию - переменная FILEFINDER_BUNDLE_KEY)")
+    fleet.add_argument('-n', '--top', type=int, default=50, help="сколько самых частых хешей и путей показать")
+    fleet.add_argument('--capacity', type=int, default=DEFAULT_CAPACITY,
+                       help="счетчиков на хеши и на пути: ограничивает память, точность для редких элементов")
+    fleet.add_argument('-f', '--format', choices=['json', 'text'], default='json')
+
+    digest = commands.add_parser('hash', help="вывести хеши файлов для списков --known-good/--known-cheat")
+    digest.add_argument('files', nargs='+')
+    return parser
+
+
+def load_signatures(args):
+    sources = dict(paths=args.signatures, include_builtin=not args.no_builtin,
+                   known_good_paths=args.known_good, known_cheat_paths=args.known_cheat)
+    if args.signature_cache:
+        return SignatureSet.load_cached(args.signature_cache, **sources)
+    return SignatureSet.load(**sources)
+
+
+def scan_policy(args):
+    """Очередность обхода из ключей --first, --defer, --skip; None при --no-priority."""
+    if args.no_priority:
+        return None
+    return ScanPolicy(DEFAULT_FIRST + tuple(args.first), DEFAULT_DEFER + tuple(args.defer), args.skip)
+
+
+def open_scan_index(args, signatures):
+    if args.no_index:
+        return None
+    if args.index == INDEX_PATH:
+        ensure_temp_dir()
+    return open_index(args.index, signatures.analysis_version)
+
+
+def open_run_history(args):
+    """Журнал запусков; в журнал по умолчанию переносится check_history.txt прежних версий."""
+    if args.history != HISTORY_PATH:
+        return open_history(args.history)
+    ensure_temp_dir()
+    return open_history(args.history, LEGACY_HISTORY_PATH)
+
+
+def resolve_roots(args):
+    """Папки для проверки из аргументов и найденных лаунчеров. Возвращает (папки, число ошибок)."""
+    errors = 0
+    candidates = []
+    for root_dir in args.roots:
+        if os.path.isdir(root_dir):
+            candidates.append((root_dir, 'custom'))
+        else:
+            print(f"Папка не найдена: {root_dir}", file=sys.stderr)
+            errors += 1
+    if not args.roots or args.discover:
+        candidates += candidate_roots()
+    roots = []
+    for game_root in merge_roots(candidates):
+        if game_root.launcher != 'custom':
+            print(f"Найдена папка {game_root.launcher}: {game_root.path}", file=sys.stderr)
+        roots.append(game_root.path)
+    return roots, errors
+
+
+def run_scan(args, out):
+    bundle_key = load_key(args.key_file) if args.bundle else None
+    if args.bundle and bundle_key is None:
+        print("Не задан ключ подписи пакетов", file=sys.stderr)
+        return EXIT_ERROR
+    signatures = load_signatures(args)
+    index = open_scan_index(args, signatures)
+    scanner = Scanner.from_signatures(signatures, index=index, threads=args.workers, processes=args.processes,
+                                      policy=scan_policy(args))
+
+    roots, errors = resolve_roots(args)
+    if not roots:
+        print("Игровые папки не найдены", file=sys.stderr)
+        return EXIT_ERROR
+
+    report = []
+    found = dict.fromkeys(roots, 0)
+    cheats = 0
+    progress = WalkProgress()
+    findings = []
+    started_at = datetime.now()
+    profiler = Profiler(args.profile, os.getcwd()).start() if args.profile else None
+    started = time.perf_counter()
+    try:
+        for finding in scanner.scan_roots(roots, progress=progress, per_device=args.per_device, profiler=profiler,
+                                          max_cheats=args.stop_after, time_budget=args.time_budget):
+            findings.append(finding)
+            found[finding.root] += 1
+            cheats += bool(finding.verdict)
+            if args.format == 'ndjson':
+                out.write(json.dumps(finding_record(finding), ensure_ascii=False) + '\n')
+                out.flush()
+            elif args.format == 'json':
+                report.append(finding_record(finding))
+            else:
+                out.write(format_text(finding) + '\n')
+    finally:
+        scanner.close()
+        if index is not None:
+            index.close()
+    elapsed = time.perf_counter() - started
+    for root_dir, count in found.items():
+        print(f"{root_dir}: находок {count}", file=sys.stderr)
+    print(f"Просмотрено {progress.entries} в {len(roots)} папках за {elapsed:.2f} с", file=sys.stderr)
+    summary = scanner.metrics.summary()
+    if summary['first_verdict_seconds'] is not None:
+        print(f"Первый чит найден через {summary['first_verdict_seconds']:.2f} с", file=sys.stderr)
+    if summary['stop_reason']:
+        print(f"Проверка остановлена досрочно: {STOP_REASONS[summary['stop_reason']]}", file=sys.stderr)
+    if profiler is not None:
+        scanner.metrics.profile = profiler.stop()
+        print(f"Профиль: {scanner.metrics.profile.get('report')}", file=sys.stderr)
+    if args.metrics:
+        with open(args.metrics, 'w', encoding='utf-8') as file:
+            json.dump(scanner.metrics.summary(), file, ensure_ascii=False, indent=2)
+    if not args.no_history:
+        store = open_run_history(args)
+        if store is not None:
+            summary = scanner.metrics.summary()
+            store.record(started_at.strftime("%Y-%m-%d %H:%M:%S"), datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
+                         summary['wall_seconds'], signatures.version, roots, findings,
+                         # Досрочно остановленная проверка неполна и не служит базой для сравнения
+                         cancelled=bool(summary['stop_reason']), metrics=summary, release=signatures.release)
+            store.close()
+    if args.bundle:
+        path = os.path.join(args.bundle, bundle_name()) if os.path.isdir(args.bundle) else args.bundle
+        summary = scanner.metrics.summary()
+        write_bundle(path, bundle_key, findings, roots, signatures.version, summary['wall_seconds'],
+                     cancelled=bool(summary['stop_reason']), metrics=summary, release=signatures.release)
+        print(f"Пакет сохранен: {path}", file=sys.stderr)
+
+    if args.format == 'json':
+        json.dump({'signature_version': signatures.version, 'signature_release': signatures.release, 'roots': roots, 'findings': report}, out, ensure_ascii=False, indent=2)
+        out.write('\n')
+    if errors:
+        return EXIT_ERROR
+    return EXIT_CHEATS if cheats else EXIT_CLEAN
+
+
+def run_watch(args, out):
+    signatures = load_signatures(args)
+    index = open_scan_index(args, signatures)
+    scanner = Scanner.from_signatures(signatures, index=index, threads=args.workers, processes=args.processes,
+                                      policy=scan_policy(args))
+    roots, errors = resolve_roots(args)
+    if not roots:
+        print("Игровые папки не найдены", file=sys.stderr)
+        return EXIT_ERROR
+
+    def emit(action, finding):
+        if args.format == 'ndjson':
+            record = finding_record(finding)
+            record['event'] = action
+            out.write(json.dumps(record, ensure_ascii=False) + '\n')
+        else:
+            out.write(f"{WATCH_ACTIONS[action]}{format_text(finding)}\n")
+        out.flush()
+
+    session = WatchSession(scanner, roots, polling=args.polling)
+    cancel = threading.Event()
+    try:
+        for finding in session.start(cancel):
+            emit('found', finding)
+        print(f"Наблюдение за {len(roots)} папками, Ctrl+C - выход", file=sys.stderr)
+        for events in session.watch(cancel):
+            for event in events:
+                emit(event.action, event.finding)
+    except KeyboardInterrupt:
+        cancel.set()
+    finally:
+        session.close()
+        scanner.close()
+        if index is not None:
+            index.close()
+    return EXIT_ERROR if errors else EXIT_CLEAN
+
+
+def run_history(args, out):
+    store = open_run_history(args)
+    if store is None:
+        return EXIT_ERROR
+    try:
+        if args.changes is not None:
+            run_id = args.changes or next(iter(run.id for run in store.runs(limit=1)), None)
+            if run_id is None:
+                print("Журнал пуст", file=sys.stderr)
+                return EXIT_ERROR
+            changes = store.changes(run_id)
+            json.dump({'run': changes.run_id, 'previous': changes.previous_id,
+                       'added': [finding._asdict() for finding in changes.added],
+                       'removed': [finding._asdict() for finding in changes.removed],
+                       'changed': [finding._asdict() for finding in changes.changed]},
+                      out, ensure_ascii=False, indent=2)
+            out.write('\n')
+            return EXIT_CHEATS if any(finding.verdict for finding in changes.added + changes.changed) else EXIT_CLEAN
+        for run in store.runs(limit=args.limit):
+            cancelled = " (отменена)" if run.cancelled else ""
+            out.write(f"{run.id}\t{run.started}\t{run.seconds:.1f} с\tфайлов: {run.files}, папок: {run.folders}, "
+                      f"читов: {run.cheats}{cancelled}\n")
+        return EXIT_CLEAN
+    finally:
+        store.close()
+
+
+def run_aggregate(args, out):
+    key = load_key(args.key_file)
+    if key is None:
+        print("Не задан ключ подписи пакетов", file=sys.stderr)
+        return EXIT_ERROR
+    summary = FleetReport(args.capacity).add_directory(args.directory, key).summary(args.top)
+    if args.format == 'json':
+        json.dump(summary, out, ensure_ascii=False, indent=2)
+        out.write('\n')
+    else:
+        out.write(f"Пакетов: {summary['bundles']} (отклонено {summary['rejected']}), "
+                  f"с читами: {summary['machines_with_cheats']}, находок: {summary['findings']}\n")
+        for title, key_name in (("Хеши читов", 'top_cheat_hashes'), ("Хеши", 'top_hashes'), ("Пути", 'top_paths')):
+            out.write(f"\n{title}:\n")
+            for hitter in summary[key_name]:
+                out.write(f"{hitter['machines']:>7}  {hitter['item']}  # {hitter['example']}\n")
+    return EXIT_ERROR if summary['rejected'] else EXIT_CLEAN
+
+
+def run_hash(args, out):
+    for path in args.files:
+        out.write(f"{file_digest(path).hex()}  # {os.path.basename(path)}\n")
+    return EXIT_CLEAN
+
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    logging.basicConfig(level=logging.WARNING, format='%(levelname)s - %(message)s')
+    try:
+        if args.command == 'scan':
+            return run_scan(args, sys.stdout)
+        if args.command == 'watch':
+            return run_watch(args, sys.stdout)
+        if args.command == 'history':
+            return run_history(args, sys.stdout)
+        if args.command == 'aggregate':
+            return run_aggregate(args, sys.stdout)
+        if args.command == 'hash':
+            return run_hash(args, sys.stdout)
+    except (OSError, ValueError) as e:
+        print(f"Ошибка: {e}", file=sys.stderr)
+        return EXIT_ERROR
+    return EXIT_CLEAN
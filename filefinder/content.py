@@ -0,0 +1,100 @@
+import hashlib
+
+# Размер блока чтения: память на проверку одного файла не зависит от его размера
+CHUNK_SIZE = 1024 * 1024
+
+# Размер хеша содержимого (BLAKE2b) в байтах
+DIGEST_SIZE = 16
+
+
+def new_hasher():
+    """Хешер содержимого файлов для индекса проверки и списков известных хешей."""
+    return hashlib.blake2b(digest_size=DIGEST_SIZE)
+
+
+def hash_stream(stream, hasher, chunk_size=CHUNK_SIZE):
+    """Дочитать поток до конца, обновляя hasher."""
+    buffer = bytearray(chunk_size)
+    view = memoryview(buffer)
+    while True:
+        size = stream.readinto(buffer)
+        if not size:
+            return hasher
+        hasher.update(view[:size])
+
+
+def file_digest(file_path, chunk_size=CHUNK_SIZE):
+    """Хеш содержимого файла, прочитанного блоками."""
+    with open(file_path, 'rb') as file:
+        return hash_stream(file, new_hasher(), chunk_size).digest()
+
+
+class CountingReader:
+    """Обертка файла, считающая прочитанные байты (bytes_read); остальное передается файлу.
+
+    limit - необязательный предел чтения: дальше него поток выглядит
+    закончившимся, а если данные на самом деле остались, ставится truncated.
+    """
+
+    def __init__(self, file, limit=None):
+        self.file = file
+        self.limit = limit
+        self.bytes_read = 0
+        self.truncated = False
+
+    def _left(self, size):
+        """Сколько байт из запрошенных size можно прочитать; 0 - предел исчерпан."""
+        if self.limit is None:
+            return size
+        left = self.limit - self.bytes_read
+        if size is None or size < 0 or size > left:
+            if left <= 0:
+                # Заглядываем на байт вперед: закончился поток или только предел
+                self.truncated = self.truncated or bool(self.file.read(1))
+                return 0
+            return left
+        return size
+
+    def read(self, size=-1):
+        size = self._left(size)
+        if size == 0:
+            return b''
+        data = self.file.read(size)
+        self.bytes_read += len(data)
+        return data
+
+    def readinto(self, buffer):
+        size = self._left(len(buffer))
+        if size == 0:
+            return 0
+        with memoryview(buffer) as view:
+            size = self.file.readinto(view[:size])
+        self.bytes_read += size or 0
+        return size
+
+    def __getattr__(self, name):
+        return getattr(self.file, name)
+
+
+def scan_stream(stream, matcher, chunk_size=CHUNK_SIZE, tail=b''):
+    """Потоковая проверка двоичного потока блоками фиксированного размера.
+
+    Один буфер используется повторно для всех блоков, проверка
+    останавливается на первом совпадении. tail - конец уже проверенного
+    начала потока (см. KeywordMatcher.search_chunk). Возвращает сигнатуру или None.
+    """
+    buffer = bytearray(chunk_size)
+    view = memoryview(buffer)
+    while True:
+        size = stream.readinto(buffer)
+        if not size:
+            return None
+        signature, tail = matcher.search_chunk(view[:size], tail)
+        if signature:
+            return signature
+
+
+def scan_file(file_path, matcher, chunk_size=CHUNK_SIZE):
+    """Потоковая проверка файла на диске. Возвращает сигнатуру или None."""
+    with open(file_path, 'rb') as file:
+        return scan_stream(file, matcher, chunk_size)
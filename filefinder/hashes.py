@@ -0,0 +1,72 @@
+import bisect
+import hashlib
+import logging
+
+from .content import DIGEST_SIZE
+
+logger = logging.getLogger(__name__)
+
+
+class _Packed:
+    """Последовательность хешей поверх упакованного отсортированного буфера для bisect."""
+
+    __slots__ = ('blob', 'size')
+
+    def __init__(self, blob, size):
+        self.blob = blob
+        self.size = size
+
+    def __len__(self):
+        return len(self.blob) // self.size
+
+    def __getitem__(self, i):
+        return self.blob[i * self.size:(i + 1) * self.size]
+
+
+class DigestSet:
+    """Компактный набор известных хешей файлов: отсортированный упакованный буфер.
+
+    Каждый хеш занимает ровно DIGEST_SIZE байт, поиск - двоичный.
+    """
+
+    def __init__(self, digests=()):
+        unique = sorted(set(digest for digest in digests if len(digest) == DIGEST_SIZE))
+        self._packed = _Packed(b''.join(unique), DIGEST_SIZE)
+        self.fingerprint = hashlib.sha1(self._packed.blob).hexdigest()
+
+    @classmethod
+    def load(cls, paths):
+        """Загрузить хеши из текстовых файлов: по одному hex-хешу в строке, # - комментарий."""
+        digests = []
+        for path in paths:
+            with open(path, 'r', encoding='utf-8') as file:
+                digests.extend(parse_digests(file, path))
+        return cls(digests)
+
+    def __contains__(self, digest):
+        i = bisect.bisect_left(self._packed, digest)
+        return i < len(self._packed) and self._packed[i] == digest
+
+    def __len__(self):
+        return len(self._packed)
+
+    def __bool__(self):
+        return len(self._packed) > 0
+
+
+def parse_digests(lines, source):
+    """Хеши из hex-строк; # - комментарий, некорректные строки пропускаются с предупреждением."""
+    digests = []
+    for number, line in enumerate(lines, 1):
+        line = line.split('#', 1)[0].strip()
+        if not line:
+            continue
+        try:
+            digest = bytes.fromhex(line)
+        except ValueError:
+            digest = b''
+        if len(digest) != DIGEST_SIZE:
+            logger.warning(f"{source}:{number}: ожидался BLAKE2b-хеш из {DIGEST_SIZE * 2} hex-символов")
+            continue
+        digests.append(digest)
+    return digests
@@ -0,0 +1,223 @@
+import os
+import json
+import locale
+import sqlite3
+import logging
+import threading
+from collections import namedtuple
+
+from .walker import FILE
+
+logger = logging.getLogger(__name__)
+
+# Запуск проверки: без списка находок, он читается отдельно и постранично
+Run = namedtuple('Run', ['id', 'started', 'finished', 'seconds', 'signature_version', 'roots',
+                         'files', 'folders', 'cheats', 'cancelled', 'metrics', 'signature_release'])
+# Находка сохраненного запуска
+StoredFinding = namedtuple('StoredFinding', ['path', 'kind', 'keyword', 'hidden', 'verdict', 'root'])
+# Изменения между двумя запусками: новые находки, исчезнувшие и сменившие вердикт
+Changes = namedtuple('Changes', ['run_id', 'previous_id', 'added', 'removed', 'changed'])
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS runs (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    started TEXT NOT NULL,
+    finished TEXT NOT NULL,
+    seconds REAL NOT NULL,
+    signature_version TEXT,
+    roots TEXT NOT NULL,
+    files INTEGER NOT NULL,
+    folders INTEGER NOT NULL,
+    cheats INTEGER NOT NULL,
+    cancelled INTEGER NOT NULL,
+    metrics TEXT,
+    signature_release TEXT
+);
+CREATE TABLE IF NOT EXISTS findings (
+    run_id INTEGER NOT NULL REFERENCES runs (id),
+    path TEXT NOT NULL,
+    kind TEXT NOT NULL,
+    keyword TEXT,
+    hidden INTEGER NOT NULL,
+    verdict TEXT,
+    root TEXT
+);
+CREATE INDEX IF NOT EXISTS findings_run_path ON findings (run_id, path);
+"""
+
+_RUN_COLUMNS = ("id, started, finished, seconds, signature_version, roots, files, folders, cheats, cancelled, metrics, "
+                "signature_release")
+
+
+def _finding(row):
+    return StoredFinding(row[0], row[1], row[2], bool(row[3]), row[4], row[5])
+
+
+def _run(row):
+    return Run(row[0], row[1], row[2], row[3], row[4], json.loads(row[5]), row[6], row[7], row[8],
+               bool(row[9]), json.loads(row[10]) if row[10] else None, row[11])
+
+
+class HistoryStore:
+    """Журнал запусков проверки в SQLite: только добавление, чтение постранично.
+
+    Каждый запуск хранится со всеми находками, временем, версией сигнатур
+    и метриками. Страницы запусков выбираются по ключу (id < последнего
+    показанного), поэтому листание не замедляется с ростом истории.
+    Безопасен для потоков.
+    """
+
+    def __init__(self, db_path):
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(db_path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(_SCHEMA)
+        # Журналы прежних версий создавались без версии базы сигнатур
+        columns = {row[1] for row in self._conn.execute("PRAGMA table_info(runs)")}
+        if 'signature_release' not in columns:
+            with self._conn:
+                self._conn.execute("ALTER TABLE runs ADD COLUMN signature_release TEXT")
+
+    def record(self, started, finished, seconds, signature_version, roots, findings, cancelled=False, metrics=None,
+               release=None):
+        """Добавить запуск вместе с находками одной транзакцией. Возвращает id запуска.
+
+        release - версия базы сигнатур (SignatureSet.release), если она указана.
+        """
+        findings = list(findings)
+        files = sum(1 for finding in findings if finding.kind == FILE)
+        cheats = sum(1 for finding in findings if finding.verdict)
+        with self._lock, self._conn:
+            cursor = self._conn.execute(
+                f"INSERT INTO runs ({_RUN_COLUMNS}) VALUES (NULL, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                (started, finished, seconds, signature_version, json.dumps(list(roots), ensure_ascii=False),
+                 files, len(findings) - files, cheats, int(cancelled),
+                 json.dumps(metrics, ensure_ascii=False) if metrics is not None else None, release))
+            run_id = cursor.lastrowid
+            self._conn.executemany(
+                "INSERT INTO findings (run_id, path, kind, keyword, hidden, verdict, root) VALUES (?, ?, ?, ?, ?, ?, ?)",
+                ((run_id, finding.path, finding.kind, finding.keyword, int(bool(finding.hidden)), finding.verdict,
+                  finding.root) for finding in findings))
+        return run_id
+
+    def import_text(self, path):
+        """Перенести итоги из текстовой истории прежних версий (check_history.txt).
+
+        В ней хранились только число запусков, время первого или последнего
+        и счетчики последнего, поэтому переносится одна запись без папок и
+        находок. Она отмечена как неполная и не служит базой для сравнения.
+        Файл переименовывается в *.imported, чтобы не переноситься повторно.
+        Возвращает id записи или None, если файла нет.
+        """
+        try:
+            with open(path, 'rb') as file:
+                data = file.read()
+        except FileNotFoundError:
+            return None
+        try:
+            text = data.decode('utf-8')
+        except UnicodeDecodeError:
+            # Прежние версии писали файл в кодировке системы по умолчанию
+            text = data.decode(locale.getpreferredencoding(False), 'replace')
+        fields = {}
+        for line in text.splitlines():
+            key, separator, value = line.partition(': ')
+            if separator:
+                fields.setdefault(key.strip(), value.strip())
+
+        def number(key):
+            try:
+                return int(fields.get(key, 0))
+            except ValueError:
+                return 0
+
+        when = fields.get("Последний запуск") or fields.get("Первый запуск") or ''
+        with self._lock, self._conn:
+            run_id = self._conn.execute(
+                f"INSERT INTO runs ({_RUN_COLUMNS}) VALUES (NULL, ?, ?, 0, NULL, '[]', ?, ?, ?, 1, NULL, NULL)",
+                (when, when, number("Обнаружено файлов"), number("Обнаружено папок"),
+                 number("Обнаружено читов"))).lastrowid
+        os.replace(path, path + '.imported')
+        logger.info(f"История {path} перенесена в журнал (запуск {run_id}, всего запусков: {number('Запусков')})")
+        return run_id
+
+    def count(self):
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM runs").fetchone()[0]
+
+    def runs(self, before_id=None, limit=50):
+        """Страница запусков от новых к старым, начиная с id меньше before_id."""
+        with self._lock:
+            if before_id is None:
+                rows = self._conn.execute(f"SELECT {_RUN_COLUMNS} FROM runs ORDER BY id DESC LIMIT ?", (limit,))
+            else:
+                rows = self._conn.execute(f"SELECT {_RUN_COLUMNS} FROM runs WHERE id < ? ORDER BY id DESC LIMIT ?",
+                                          (before_id, limit))
+            return [_run(row) for row in rows.fetchall()]
+
+    def run(self, run_id):
+        with self._lock:
+            row = self._conn.execute(f"SELECT {_RUN_COLUMNS} FROM runs WHERE id = ?", (run_id,)).fetchone()
+        return _run(row) if row else None
+
+    def previous_run_id(self, run_id, completed=True):
+        """id предыдущего запуска (по умолчанию - не отмененного) или None."""
+        query = "SELECT id FROM runs WHERE id < ?" + (" AND cancelled = 0" if completed else "") + " ORDER BY id DESC LIMIT 1"
+        with self._lock:
+            row = self._conn.execute(query, (run_id,)).fetchone()
+        return row[0] if row else None
+
+    def findings(self, run_id, offset=0, limit=500):
+        """Страница находок запуска в порядке их появления."""
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT path, kind, keyword, hidden, verdict, root FROM findings WHERE run_id = ? "
+                "ORDER BY rowid LIMIT ? OFFSET ?", (run_id, limit, offset)).fetchall()
+        return [_finding(row) for row in rows]
+
+    def changes(self, run_id, previous_id=None):
+        """Что изменилось в запуске run_id по сравнению с previous_id (по умолчанию - с прошлым запуском)."""
+        if previous_id is None:
+            previous_id = self.previous_run_id(run_id)
+        if previous_id is None:
+            return Changes(run_id, None, self.findings(run_id, limit=-1), [], [])
+        columns = "f.path, f.kind, f.keyword, f.hidden, f.verdict, f.root"
+        with self._lock:
+            added = self._conn.execute(
+                f"SELECT {columns} FROM findings f WHERE f.run_id = ? AND NOT EXISTS "
+                "(SELECT 1 FROM findings g WHERE g.run_id = ? AND g.path = f.path) ORDER BY f.rowid",
+                (run_id, previous_id)).fetchall()
+            removed = self._conn.execute(
+                f"SELECT {columns} FROM findings f WHERE f.run_id = ? AND NOT EXISTS "
+                "(SELECT 1 FROM findings g WHERE g.run_id = ? AND g.path = f.path) ORDER BY f.rowid",
+                (previous_id, run_id)).fetchall()
+            changed = self._conn.execute(
+                f"SELECT {columns} FROM findings f JOIN findings g ON g.run_id = ? AND g.path = f.path "
+                "WHERE f.run_id = ? AND g.verdict IS NOT f.verdict ORDER BY f.rowid",
+                (previous_id, run_id)).fetchall()
+        return Changes(run_id, previous_id, [_finding(row) for row in added], [_finding(row) for row in removed],
+                       [_finding(row) for row in changed])
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+
+def open_history(db_path, legacy_path=None):
+    """Открыть журнал запусков. При ошибке возвращает None: проверка работает и без истории.
+
+    legacy_path - check_history.txt прежних версий: если он есть, его итоги
+    переносятся в журнал (см. HistoryStore.import_text).
+    """
+    try:
+        store = HistoryStore(db_path)
+    except Exception as e:
+        logger.error(f"Ошибка открытия истории проверок: {e}")
+        return None
+    if legacy_path:
+        try:
+            store.import_text(legacy_path)
+        except Exception as e:
+            logger.error(f"Ошибка переноса истории {legacy_path}: {e}")
+    return store
@@ -0,0 +1,105 @@
+import os
+import sqlite3
+import logging
+import threading
+from collections import namedtuple
+
+logger = logging.getLogger(__name__)
+
+# Запись индекса: хеш содержимого и вердикт (сработавшая сигнатура или None)
+IndexEntry = namedtuple('IndexEntry', ['digest', 'verdict'])
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS files (
+    path TEXT PRIMARY KEY,
+    size INTEGER NOT NULL,
+    mtime_ns INTEGER NOT NULL,
+    digest BLOB,
+    verdict TEXT,
+    signature_version TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS meta (
+    key TEXT PRIMARY KEY,
+    value TEXT
+);
+"""
+
+
+class ScanIndex:
+    """Постоянный индекс проверенных файлов: (путь, размер, mtime) -> хеш и вердикт.
+
+    Записи действительны только для версии набора сигнатур, с которой они
+    получены: при смене версии индекс очищается. Безопасен для потоков.
+    """
+
+    def __init__(self, db_path, signature_version):
+        self.signature_version = signature_version
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(db_path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(_SCHEMA)
+        row = self._conn.execute("SELECT value FROM meta WHERE key = 'signature_version'").fetchone()
+        if row is None or row[0] != signature_version:
+            if row is not None:
+                logger.info(f"Набор сигнатур изменился ({row[0]} -> {signature_version}), индекс сброшен")
+            self._conn.execute("DELETE FROM files")
+            self._conn.execute("INSERT OR REPLACE INTO meta (key, value) VALUES ('signature_version', ?)", (signature_version,))
+            self._conn.commit()
+
+    def lookup(self, path, size, mtime_ns):
+        """IndexEntry для неизмененного файла или None, если его нужно проверить заново."""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT digest, verdict FROM files WHERE path = ? AND size = ? AND mtime_ns = ? AND signature_version = ?",
+                (path, size, mtime_ns, self.signature_version)).fetchone()
+            if row is None:
+                self.misses += 1
+                return None
+            self.hits += 1
+            return IndexEntry(row[0], row[1])
+
+    def store(self, path, size, mtime_ns, digest, verdict):
+        """Запомнить результат проверки файла. Изменения фиксируются в flush()."""
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO files (path, size, mtime_ns, digest, verdict, signature_version) VALUES (?, ?, ?, ?, ?, ?)",
+                (path, size, mtime_ns, digest, verdict, self.signature_version))
+
+    def discard(self, path):
+        """Забыть прежний результат файла: его проверка на этот раз не удалась."""
+        with self._lock:
+            self._conn.execute("DELETE FROM files WHERE path = ?", (path,))
+
+    def prune(self, exists=os.path.exists):
+        """Удалить записи файлов, которых больше нет на диске. Возвращает число удаленных."""
+        with self._lock:
+            paths = [row[0] for row in self._conn.execute("SELECT path FROM files")]
+        missing = [(path,) for path in paths if not exists(path)]
+        if missing:
+            with self._lock:
+                self._conn.executemany("DELETE FROM files WHERE path = ?", missing)
+                self._conn.commit()
+            logger.info(f"Из индекса проверки удалено исчезнувших файлов: {len(missing)}")
+        return len(missing)
+
+    def flush(self):
+        """Зафиксировать накопленные записи одной транзакцией."""
+        with self._lock:
+            self._conn.commit()
+
+    def close(self):
+        self.flush()
+        with self._lock:
+            self._conn.close()
+
+
+def open_index(db_path, signature_version):
+    """Открыть индекс проверки. При ошибке возвращает None: файлы просто проверяются заново."""
+    try:
+        return ScanIndex(db_path, signature_version)
+    except Exception as e:
+        logger.error(f"Ошибка открытия индекса проверки: {e}")
+        return None
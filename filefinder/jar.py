@@ -0,0 +1,165 @@
+import io
+import logging
+import zipfile
+import posixpath
+
+from .classfile import scan_class
+from .content import CHUNK_SIZE, CountingReader, scan_stream
+
+logger = logging.getLogger(__name__)
+
+# Описания модов, которые читаются всегда: они маленькие и выдают подмену
+METADATA_MEMBERS = frozenset([
+    'fabric.mod.json', 'quilt.mod.json', 'mcmod.info',
+    'meta-inf/mods.toml', 'meta-inf/neoforge.mods.toml', 'meta-inf/manifest.mf',
+])
+
+MAX_METADATA_SIZE = 256 * 1024  # Описания крупнее этого не распаковываются
+MAX_CLASS_SIZE = 512 * 1024  # Классы крупнее этого не распаковываются
+MAX_INFLATE_BYTES = 32 * 1024 * 1024  # Предел распаковки на один .jar вместе с вложенными
+MAX_NESTED_SIZE = 16 * 1024 * 1024  # Вложенные .jar крупнее этого не открываются
+MAX_NESTED_DEPTH = 3  # Глубина jar-in-jar (META-INF/jars у Fabric, META-INF/jarjar у Forge)
+
+# Доля коротких имен классов (a.class, bc.class), после которой архив считается обфусцированным
+OBFUSCATED_SHARE = 0.5
+
+
+class InflateBudget:
+    """Остаток предела распаковки одного .jar вместе с вложенными.
+
+    exhausted - какие-то записи пропущены из-за исчерпанного предела:
+    проверка неполная, и ее результат нельзя запоминать как чистый.
+    """
+
+    def __init__(self, limit):
+        self.limit = limit
+        self.remaining = limit
+        self.exhausted = False
+
+    def take(self, size):
+        """Списать size байт. False и отметка exhausted, если их уже не хватает."""
+        if size > self.remaining:
+            self.exhausted = True
+            return False
+        self.remaining -= size
+        return True
+
+    def reader(self, stream):
+        """Поток записи, который не прочитает больше остатка предела."""
+        return CountingReader(stream, max(self.remaining, 0))
+
+    def charge(self, reader):
+        """Списать байты, действительно прочитанные через reader()."""
+        self.remaining -= reader.bytes_read
+        if reader.truncated:
+            self.exhausted = True
+
+    @property
+    def used(self):
+        return self.limit - self.remaining
+
+
+class JarInspector:
+    """Проверка .jar: сначала центральный каталог, распаковка - только по необходимости.
+
+    Порядок: имена всех записей (без распаковки), описания мода, вложенные
+    .jar и только затем классы - если у архива нет описания мода или он
+    обфусцирован. В классах проверяются только строки пула констант. Текстуры, звуки и прочие ресурсы не распаковываются никогда.
+    """
+
+    def __init__(self, member_matcher, content_matcher, max_depth=MAX_NESTED_DEPTH,
+                 max_inflate=MAX_INFLATE_BYTES):
+        self.member_matcher = member_matcher
+        self.content_matcher = content_matcher
+        self.max_depth = max_depth
+        self.max_inflate = max_inflate
+
+    def inspect(self, file_path, budget=None):
+        """Проверка .jar на диске. Возвращает сработавшую сигнатуру или None.
+
+        file_path - путь или уже открытый двоичный файл.
+        budget - необязательный InflateBudget: по нему вызывающий узнает,
+        сколько байт распаковано и хватило ли предела.
+        """
+        if budget is None:
+            budget = InflateBudget(self.max_inflate)
+        label = file_path if isinstance(file_path, str) else getattr(file_path, 'name', repr(file_path))
+        with zipfile.ZipFile(file_path, 'r') as jar_file:
+            return self._inspect(jar_file, label, 0, budget)
+
+    def _inspect(self, jar_file, label, depth, budget):
+        infos = jar_file.infolist()
+
+        # 1. Центральный каталог: имена записей, включая вложенные архивы
+        for info in infos:
+            signature = self.member_matcher.search_path(info.filename)
+            if signature:
+                logger.info(f"{label}: запись {info.filename} совпала с сигнатурой {signature}")
+                return signature
+
+        metadata = []
+        nested = []
+        classes = []
+        for info in infos:
+            name = info.filename.lower()
+            if name in METADATA_MEMBERS:
+                metadata.append(info)
+            elif name.endswith('.jar'):
+                nested.append(info)
+            elif name.endswith('.class'):
+                classes.append(info)
+
+        # 2. Описания мода
+        for info in metadata:
+            if info.file_size <= MAX_METADATA_SIZE:
+                signature = self._scan_member(jar_file, info, label, budget)
+                if signature:
+                    return signature
+
+        # 3. Вложенные архивы
+        if depth < self.max_depth:
+            for info in nested:
+                if info.file_size > MAX_NESTED_SIZE or not budget.take(info.file_size):
+                    logger.debug(f"{label}: вложенный {info.filename} пропущен по размеру")
+                    continue
+                try:
+                    with zipfile.ZipFile(io.BytesIO(jar_file.read(info))) as nested_file:
+                        signature = self._inspect(nested_file, f"{label}!{info.filename}", depth + 1, budget)
+                except (zipfile.BadZipFile, OSError) as e:
+                    logger.debug(f"{label}: вложенный {info.filename} не открылся: {e}")
+                    continue
+                if signature:
+                    return signature
+
+        # 4. Классы - только для архивов без описания мода или с обфускацией
+        if classes and (not metadata or self._is_obfuscated(classes)):
+            for info in classes:
+                if info.file_size <= MAX_CLASS_SIZE:
+                    signature = self._scan_member(jar_file, info, label, budget)
+                    if signature:
+                        return signature
+        return None
+
+    def _scan_member(self, jar_file, info, label, budget):
+        if budget.remaining <= 0:
+            budget.exhausted = True
+            logger.debug(f"{label}: {info.filename} пропущен, предел распаковки исчерпан")
+            return None
+        # Списываются только распакованные байты: из класса обычно читается лишь пул констант
+        with jar_file.open(info) as member:
+            reader = budget.reader(member)
+            try:
+                if info.filename.lower().endswith('.class'):
+                    signature = scan_class(reader, self.content_matcher)
+                else:
+                    signature = scan_stream(reader, self.content_matcher, max(1, min(CHUNK_SIZE, info.file_size)))
+            finally:
+                budget.charge(reader)
+        if signature:
+            logger.info(f"{label}: содержимое {info.filename} совпало с сигнатурой {signature}")
+        return signature
+
+    @staticmethod
+    def _is_obfuscated(classes):
+        short = sum(1 for info in classes if len(posixpath.basename(info.filename)) <= len('ab.class'))
+        return short >= len(classes) * OBFUSCATED_SHARE
@@ -0,0 +1,204 @@
+import os
+import time
+import heapq
+import threading
+
+STAGES = ('walk', 'hash', 'analyze')
+SLOWEST_FILES = 10  # Сколько самых долгих файлов попадает в отчет
+# Причины досрочной остановки проверки
+STOP_REASONS = {'cheat_limit': "найдено заданное число читов", 'time_budget': "истекло отведенное время",
+                'cancelled': "отменена пользователем"}
+
+PROFILE_MODES = ('cprofile', 'tracemalloc')
+
+
+class ScanMetrics:
+    """Метрики одной проверки: объемы, время стадий, самые долгие файлы и попадания в кеши.
+
+    Время стадии - сумма по всем задачам стадии (стенное и процессорное), поэтому
+    при параллельной работе оно может превышать общее время проверки.
+    Безопасен для потоков.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.started = time.perf_counter()
+        self._cpu_started = time.process_time()
+        self.finished = None
+        self._cpu_finished = None
+        self.files_walked = 0
+        self.bytes_read = 0
+        self.bytes_inflated = 0
+        self.wall = dict.fromkeys(STAGES, 0.0)
+        self.cpu = dict.fromkeys(STAGES, 0.0)
+        self.tasks = dict.fromkeys(STAGES, 0)
+        self.counters = {'index_hits': 0, 'index_misses': 0, 'duplicates': 0, 'known_good': 0, 'known_cheat': 0,
+                         'incomplete': 0, 'index_pruned': 0}
+        self._slowest = []
+        self.profile = {}
+        self.first_verdict = None
+        self.stop_reason = None
+
+    def add_stage(self, stage, wall, cpu, path=None):
+        with self._lock:
+            self.wall[stage] += wall
+            self.cpu[stage] += cpu
+            self.tasks[stage] += 1
+            if path is not None:
+                item = (wall, path)
+                if len(self._slowest) < SLOWEST_FILES:
+                    heapq.heappush(self._slowest, item)
+                elif item > self._slowest[0]:
+                    heapq.heapreplace(self._slowest, item)
+
+    def add_bytes(self, read=0, inflated=0):
+        with self._lock:
+            self.bytes_read += read
+            self.bytes_inflated += inflated
+
+    def count(self, counter, value=1):
+        with self._lock:
+            self.counters[counter] += value
+
+    def mark_verdict(self):
+        """Отметить находку с вердиктом: запоминается время до первой из них."""
+        with self._lock:
+            if self.first_verdict is None:
+                self.first_verdict = time.perf_counter()
+
+    def stop(self, reason):
+        """Запомнить причину досрочной остановки (первую из сработавших)."""
+        with self._lock:
+            if self.stop_reason is None:
+                self.stop_reason = reason
+
+    def finish(self, files_walked=None):
+        with self._lock:
+            self.finished = time.perf_counter()
+            self._cpu_finished = time.process_time()
+            if files_walked is not None:
+                self.files_walked = files_walked
+
+    def summary(self):
+        """Метрики в виде словаря для JSON."""
+        end = self.finished if self.finished is not None else time.perf_counter()
+        cpu_end = self._cpu_finished if self._cpu_finished is not None else time.process_time()
+        with self._lock:
+            lookups = self.counters['index_hits'] + self.counters['index_misses']
+            return {
+                'wall_seconds': round(end - self.started, 3),
+                'cpu_seconds': round(cpu_end - self._cpu_started, 3),
+                'files_walked': self.files_walked,
+                'bytes_read': self.bytes_read,
+                'bytes_inflated': self.bytes_inflated,
+                'stages': {stage: {'wall_seconds': round(self.wall[stage], 3), 'cpu_seconds': round(self.cpu[stage], 3),
+                                   'tasks': self.tasks[stage]} for stage in STAGES},
+                'index_hit_rate': round(self.counters['index_hits'] / lookups, 3) if lookups else None,
+                'counters': dict(self.counters),
+                'first_verdict_seconds': round(self.first_verdict - self.started, 3) if self.first_verdict else None,
+                'stop_reason': self.stop_reason,
+                'slowest': [{'path': path, 'seconds': round(wall, 3)} for wall, path in sorted(self._slowest, reverse=True)],
+                'profile': dict(self.profile),
+            }
+
+
+class Profiler:
+    """Профилирование проверки: cProfile по всем потокам конвейера или tracemalloc.
+
+    cProfile работает только в том потоке, где включен, поэтому каждая задача
+    конвейера выполняется через wrap() со своим профилем на поток, а в конце
+    профили объединяются. Задачи в рабочих процессах не профилируются:
+    при включенном профиле конвейер отправляет весь анализ в потоки.
+    Отчеты пишутся в out_dir.
+    """
+
+    def __init__(self, mode, out_dir):
+        if mode not in PROFILE_MODES:
+            raise ValueError(f"Неизвестный режим профилирования '{mode}'")
+        self.mode = mode
+        self.out_dir = out_dir
+        self._local = threading.local()
+        self._profiles = []
+        self._lock = threading.Lock()
+
+    def start(self):
+        if self.mode == 'tracemalloc':
+            import tracemalloc
+            tracemalloc.start(10)
+        return self
+
+    def wrap(self, func):
+        """Функция, выполняющая func под профилем текущего потока."""
+        if self.mode != 'cprofile':
+            return func
+
+        def profiled(*args, **kwargs):
+            profile = getattr(self._local, 'profile', None)
+            if profile is None:
+                import cProfile
+                profile = self._local.profile = cProfile.Profile()
+                with self._lock:
+                    self._profiles.append(profile)
+            profile.enable()
+            try:
+                return func(*args, **kwargs)
+            finally:
+                profile.disable()
+        return profiled
+
+    def stop(self):
+        """Записать отчеты. Возвращает словарь для ScanMetrics.profile."""
+        os.makedirs(self.out_dir, exist_ok=True)
+        if self.mode == 'tracemalloc':
+            import tracemalloc
+            snapshot = tracemalloc.take_snapshot()
+            peak = tracemalloc.get_traced_memory()[1]
+            tracemalloc.stop()
+            path = os.path.join(self.out_dir, 'scan_memory.txt')
+            with open(path, 'w', encoding='utf-8') as file:
+                file.write(f"Пик выделенной памяти: {peak / 1e6:.1f} МБ\n")
+                for stat in snapshot.statistics('lineno')[:30]:
+                    file.write(f"{stat}\n")
+            return {'mode': self.mode, 'report': path, 'peak_traced_bytes': peak}
+
+        import pstats
+        with self._lock:
+            profiles = list(self._profiles)
+        if not profiles:
+            return {'mode': self.mode, 'report': None}
+        stats = pstats.Stats(profiles[0])
+        for profile in profiles[1:]:
+            stats.add(profile)
+        dump_path = os.path.join(self.out_dir, 'scan_profile.pstats')
+        stats.dump_stats(dump_path)
+        text_path = os.path.join(self.out_dir, 'scan_profile.txt')
+        with open(text_path, 'w', encoding='utf-8') as file:
+            stats.stream = file
+            stats.sort_stats('cumulative').print_stats(40)
+        return {'mode': self.mode, 'report': text_path, 'pstats': dump_path}
+
+
+def format_summary(data):
+    """Краткий отчет по-русски из словаря ScanMetrics.summary()."""
+    lines = [
+        f"Время проверки: {data['wall_seconds']:.2f} с (процессор: {data['cpu_seconds']:.2f} с)",
+        f"Просмотрено элементов: {data['files_walked']}",
+        f"Прочитано: {data['bytes_read'] / 1e6:.1f} МБ, распаковано: {data['bytes_inflated'] / 1e6:.1f} МБ",
+    ]
+    for stage, names in (('walk', 'обход'), ('hash', 'хеширование'), ('analyze', 'анализ')):
+        stats = data['stages'][stage]
+        lines.append(f"Стадия {names}: {stats['wall_seconds']:.2f} с, процессор {stats['cpu_seconds']:.2f} с, задач {stats['tasks']}")
+    if data['index_hit_rate'] is not None:
+        lines.append(f"Индекс проверки: {data['index_hit_rate']:.0%} файлов без изменений")
+    counters = data['counters']
+    if counters['duplicates'] or counters['known_good'] or counters['known_cheat']:
+        lines.append(f"По хешу: повторов {counters['duplicates']}, известных чистых {counters['known_good']}, "
+                     f"известных читов {counters['known_cheat']}")
+    if data.get('first_verdict_seconds') is not None:
+        lines.append(f"Первый чит найден через {data['first_verdict_seconds']:.2f} с")
+    if data.get('stop_reason'):
+        lines.append(f"Проверка остановлена досрочно: {STOP_REASONS.get(data['stop_reason'], data['stop_reason'])}")
+    if data['slowest']:
+        lines.append("Самые долгие файлы:")
+        lines.extend(f"  {item['seconds']:.2f} с - {item['path']}" for item in data['slowest'])
+    return '\n'.join(lines)
@@ -0,0 +1,24 @@
+import os
+
+
+def _temp_root():
+    # На Windows TEMP задан всегда: tempfile (и shutil, random за ним) нужен только без него
+    temp = os.getenv('TEMP')
+    if temp:
+        return temp
+    import tempfile
+    return tempfile.gettempdir()
+
+
+# Рабочая папка приложения: журнал, история запусков, метрики и индекс проверки
+TEMP_DIR = os.path.join(_temp_root(), 'FileFinder')
+INDEX_PATH = os.path.join(TEMP_DIR, 'scan_index.sqlite3')
+HISTORY_PATH = os.path.join(TEMP_DIR, 'history.sqlite3')  # Журнал всех запусков с находками
+LEGACY_HISTORY_PATH = os.path.join(TEMP_DIR, 'check_history.txt')  # История прежних версий, переносится в журнал
+METRICS_PATH = os.path.join(TEMP_DIR, 'scan_metrics.json')  # Метрики последней проверки
+
+
+def ensure_temp_dir():
+    """Создать рабочую папку, если ее еще нет."""
+    os.makedirs(TEMP_DIR, exist_ok=True)
+    return TEMP_DIR
@@ -0,0 +1,410 @@
+import os
+import time
+import queue
+import logging
+import threading
+from collections import namedtuple
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor, CancelledError
+
+from .analysis import Analyzer
+from .content import file_digest
+from .hashes import DigestSet
+from .metrics import ScanMetrics
+from .walker import scan_tree, match_path, FOLDER, WalkProgress
+
+logger = logging.getLogger(__name__)
+
+# Находка проверки: совпадение при обходе, вердикт анализа содержимого
+# (сработавшая сигнатура или None) и корень, в котором она найдена.
+# Для папок вердикт - сигнатура имени. keyword равен None у файлов,
+# попавших в проверку только по расширению. digest - hex-хеш BLAKE2b
+# содержимого файла, посчитанный для дедупликации или взятый из индекса
+# (None у папок и у файлов, которые не удалось прочитать).
+Finding = namedtuple('Finding', ['path', 'kind', 'keyword', 'hidden', 'verdict', 'root', 'digest'],
+                     defaults=(None,))
+
+_DONE = object()
+
+# Файлы крупнее этого размера сопоставляются дольше, чем читаются: их анализ идет в процессах
+PROCESS_SIZE_THRESHOLD = 256 * 1024
+
+# Анализатор рабочего процесса, передается один раз при запуске процесса
+_worker_analyzer = None
+
+
+def _init_worker(analyzer):
+    global _worker_analyzer
+    _worker_analyzer = analyzer
+
+
+def _analyze_in_process(file_path):
+    return _worker_analyzer.analyze_measured(file_path)
+
+
+def _hash_measured(file_path):
+    """Хеш файла со стенным и процессорным временем для метрик."""
+    started, cpu_started = time.perf_counter(), time.thread_time()
+    digest = file_digest(file_path)
+    return digest, time.perf_counter() - started, time.thread_time() - cpu_started
+
+
+def device_of(path):
+    """Идентификатор устройства, на котором лежит путь."""
+    try:
+        return os.stat(path).st_dev
+    except OSError:
+        return None
+
+
+def default_threads():
+    return min(32, (os.cpu_count() or 1) + 4)
+
+
+def default_processes():
+    # На одном ядре процессы не дают параллельности, только передачу задач между процессами
+    cpus = os.cpu_count() or 1
+    return cpus if cpus > 1 else 0
+
+
+class Scanner:
+    """Долгоживущий конвейер проверки с ограниченным числом задач в работе.
+
+    Обход идет в отдельном потоке и подает найденные файлы в пулы. Сначала
+    в пуле потоков считается хеш содержимого: файлы из списков известных
+    хешей и повторы уже проверенных в этой проверке дальше не анализируются.
+    Остальные .jar и крупные файлы (распаковка и сопоставление нагружают
+    процессор) идут в пул процессов, мелкие файлы - в пул потоков. Пулы
+    создаются один раз и переиспользуются между проверками до вызова close().
+    С политикой обхода (policy) сначала проверяются рискованные папки,
+    поэтому первые вердикты приходят раньше, а проверку можно ограничить
+    числом найденных читов или временем.
+    """
+
+    def __init__(self, analyzer, file_matcher, folder_matcher, blacklisted_folders=(),
+                 index=None, threads=None, processes=None, max_pending=None, analyze_extensions=('.jar',),
+                 known_good=None, known_cheat=None, policy=None):
+        self.analyzer = analyzer
+        self.file_matcher = file_matcher
+        self.folder_matcher = folder_matcher
+        self.blacklisted_folders = blacklisted_folders
+        self.analyze_extensions = analyze_extensions
+        # Очередность обхода (walker.ScanPolicy); None - обход в глубину в порядке листинга
+        self.policy = policy
+        self.known_good = known_good if known_good is not None else DigestSet()
+        self.known_cheat = known_cheat if known_cheat is not None else DigestSet()
+        # Метрики последней проверки (ScanMetrics)
+        self.metrics = None
+        self.index = index
+        self.threads = threads or default_threads()
+        self.processes = default_processes() if processes is None else processes
+        self.max_pending = max_pending or (self.threads + self.processes) * 4
+        self._thread_pool = None
+        self._process_pool = None
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_signatures(cls, signatures, **kwargs):
+        """Конвейер для скомпилированного SignatureSet; kwargs передаются в конструктор."""
+        analyzer = Analyzer(signatures.jar_member_matcher, signatures.content_matcher, signatures.jar_content_matcher)
+        return cls(analyzer, signatures.file_matcher, signatures.folder_matcher, signatures.blacklisted_folders,
+                   known_good=signatures.known_good, known_cheat=signatures.known_cheat, **kwargs)
+
+    def _start_pools(self):
+        with self._lock:
+            if self._thread_pool is None:
+                self._thread_pool = ThreadPoolExecutor(self.threads, thread_name_prefix='filefinder')
+            if self._process_pool is None and self.processes > 0:
+                try:
+                    self._process_pool = ProcessPoolExecutor(self.processes, initializer=_init_worker, initargs=(self.analyzer,))
+                except (OSError, NotImplementedError, ImportError) as e:
+                    logger.error(f"Пул процессов недоступен, анализ .jar пойдет в потоках: {e}")
+                    self.processes = 0
+
+    def _submit(self, match, profiler=None):
+        if profiler is not None:
+            # Рабочие процессы не попадают в профиль: при профилировании весь анализ идет в потоках
+            return self._thread_pool.submit(profiler.wrap(self.analyzer.analyze_measured), match.path)
+        if self._process_pool is not None and (match.size > PROCESS_SIZE_THRESHOLD or match.path.lower().endswith('.jar')):
+            return self._process_pool.submit(_analyze_in_process, match.path)
+        return self._thread_pool.submit(self.analyzer.analyze_measured, match.path)
+
+    def scan(self, root_dir, cancel=None, progress=None):
+        """Проверка дерева root_dir. Находки возвращаются по мере готовности.
+
+        cancel - необязательный threading.Event для остановки проверки,
+        progress - необязательный WalkProgress для счетчика просмотренных элементов.
+        """
+        return self.scan_roots([root_dir], cancel, progress)
+
+    def scan_roots(self, roots, cancel=None, progress=None, per_device=1, profiler=None, max_cheats=None,
+                   time_budget=None):
+        """Проверка нескольких корней одновременно с общим отчетом.
+
+        Каждый корень обходится в своем потоке, но на одном устройстве
+        одновременно идет не больше per_device обходов, чтобы соседние корни
+        не мешали друг другу на одном диске. Пулы анализа и дедупликация по
+        хешу общие для всех корней. Метрики проверки собираются в self.metrics;
+        profiler - необязательный запущенный metrics.Profiler.
+        max_cheats - остановиться после стольких находок с вердиктом,
+        time_budget - через столько секунд перестать обходить и ставить новые
+        файлы в очередь; уже начатый анализ доводится до конца. Причина
+        досрочной остановки попадает в метрики.
+        """
+        if progress is None:
+            progress = WalkProgress()
+        walks = [(root_dir, lambda stop, root_dir=root_dir: scan_tree(root_dir, self.file_matcher, self.folder_matcher,
+                                                                      self.blacklisted_folders, progress,
+                                                                      self.analyze_extensions, policy=self.policy,
+                                                                      stop=stop))
+                 for root_dir in roots]
+        return self._run(walks, cancel, progress, per_device, profiler, max_cheats, time_budget, prune=True)
+
+    def scan_changes(self, changes, cancel=None, progress=None):
+        """Проверка только изменившихся путей: changes - пары (корень, путь).
+
+        Файл сопоставляется и анализируется как при обходе, папка - вместе со
+        всем содержимым. Исчезнувшие пути пропускаются. Правила путей и
+        пропуски политики обхода считаются от корня, поэтому находки
+        совпадают с полной проверкой.
+        """
+        if progress is None:
+            progress = WalkProgress()
+        by_root = {}
+        for root_dir, path in changes:
+            by_root.setdefault(root_dir, []).append(path)
+
+        def walk_changes(root_dir, paths, stop):
+            for path in paths:
+                if stop():
+                    return
+                match = match_path(root_dir, path, self.file_matcher, self.folder_matcher, self.blacklisted_folders,
+                                   self.analyze_extensions, self.policy)
+                if match is not None:
+                    yield match
+                if os.path.isdir(path) and not os.path.islink(path):
+                    yield from scan_tree(root_dir, self.file_matcher, self.folder_matcher, self.blacklisted_folders,
+                                         progress, self.analyze_extensions, start=path, policy=self.policy,
+                                         stop=stop)
+                else:
+                    progress.add(1)
+
+        walks = [(root_dir, lambda stop, root_dir=root_dir, paths=paths: walk_changes(root_dir, paths, stop))
+                 for root_dir, paths in by_root.items()]
+        return self._run(walks, cancel, progress)
+
+    def _run(self, walks, cancel, progress, per_device=1, profiler=None, max_cheats=None, time_budget=None,
+             prune=False):
+        """Общий конвейер: walks - пары (корень, функция обхода).
+
+        Функция обхода получает stop - функцию без аргументов, которая
+        возвращает True, когда обход пора прекратить, - и возвращает совпадения.
+
+        prune - после проверки удалить из индекса записи исчезнувших файлов.
+        """
+        self._start_pools()
+        stop = threading.Event()
+        metrics = self.metrics = ScanMetrics()
+        hash_task = profiler.wrap(_hash_measured) if profiler is not None else _hash_measured
+
+        deadline = time.monotonic() + time_budget if time_budget else None
+
+        def cancelled():
+            return stop.is_set() or (cancel is not None and cancel.is_set())
+
+        def stopped():
+            # По истечении времени останавливается только подача новых файлов
+            if deadline is not None and time.monotonic() > deadline:
+                metrics.stop('time_budget')
+                return True
+            return cancelled()
+
+        results = queue.SimpleQueue()
+        slots = threading.BoundedSemaphore(self.max_pending)
+        # (хеш, вид анализа) -> список ожидающих совпадений, пока файл анализируется, затем (вердикт,).
+        # Вид анализа входит в ключ: тот же файл под именем .jar и под другим проверяется по-разному
+        seen = {}
+        seen_lock = threading.Lock()
+
+        def report(match, verdict, digest=None):
+            # Файлы, взятые только по расширению, попадают в отчет лишь при срабатывании
+            if match.keyword or verdict:
+                results.put(Finding(match.path, match.kind, match.keyword, match.hidden, verdict, match.root,
+                                    digest.hex() if digest else None))
+
+        def finish(match, digest, verdict, complete=True):
+            try:
+                if self.index is not None:
+                    if complete:
+                        self.index.store(match.path, match.size, match.mtime_ns, digest, verdict)
+                    else:
+                        self.index.discard(match.path)
+                report(match, verdict, digest)
+            except Exception as e:
+                logger.error(f"Ошибка записи результата {match.path}: {e}")
+            finally:
+                slots.release()
+
+        def on_analyzed(key, future):
+            analysis = None
+            try:
+                analysis = future.result()
+            except CancelledError:
+                pass
+            except Exception as e:
+                logger.error(f"Ошибка анализа файла: {e}")
+            verdict = analysis.verdict if analysis is not None else None
+            # Отмененный или неполный анализ не запоминается ни в индексе, ни для повторов:
+            # файл проверится заново, а не сочтется чистым
+            complete = analysis is not None and not analysis.incomplete
+            with seen_lock:
+                waiting = seen.pop(key)
+                if complete:
+                    seen[key] = (verdict,)
+            if analysis is not None:
+                metrics.add_stage('analyze', analysis.wall, analysis.cpu, waiting[0].path)
+                # Анализ читает файл второй раз после хеша
+                metrics.add_bytes(read=analysis.read, inflated=analysis.inflated)
+            if not complete:
+                metrics.count('incomplete')
+            for match in waiting:
+                finish(match, key[0], verdict, complete)
+
+        def on_hashed(match, future):
+            try:
+                digest, wall, cpu = future.result()
+            except CancelledError:
+                slots.release()
+                return
+            except Exception as e:
+                logger.error(f"Ошибка чтения файла {match.path}: {e}")
+                report(match, None)
+                slots.release()
+                return
+            metrics.add_stage('hash', wall, cpu)
+            metrics.add_bytes(read=max(match.size, 0))
+
+            if digest in self.known_cheat:
+                metrics.count('known_cheat')
+                finish(match, digest, f"hash:{digest.hex()}")
+                return
+            if digest in self.known_good:
+                metrics.count('known_good')
+                finish(match, digest, None)
+                return
+
+            key = (digest, self.analyzer.kind(match.path))
+            with seen_lock:
+                entry = seen.get(key)
+                if entry is None:
+                    seen[key] = [match]
+                elif isinstance(entry, list):
+                    entry.append(match)
+            if entry is not None:
+                metrics.count('duplicates')
+                if isinstance(entry, list):
+                    return
+                finish(match, digest, entry[0])
+                return
+            try:
+                future = self._submit(match, profiler)
+            except RuntimeError as e:
+                # Пулы закрыты во время проверки
+                logger.error(f"Анализ {match.path} не запущен: {e}")
+                future = None
+            if future is None:
+                with seen_lock:
+                    waiting = seen.pop(key)
+                for _ in waiting:
+                    slots.release()
+                return
+            future.add_done_callback(lambda future: on_analyzed(key, future))
+
+        device_limits = {}
+        for root_dir, _ in walks:
+            device = device_of(root_dir)
+            if device not in device_limits:
+                device_limits[device] = threading.BoundedSemaphore(per_device)
+
+        def produce(root_dir, walk):
+            with device_limits[device_of(root_dir)]:
+                if stopped():
+                    return
+                started, cpu_started = time.perf_counter(), time.thread_time()
+                try:
+                    for match in walk(stopped):
+                        if stopped():
+                            break
+                        if match.kind == FOLDER:
+                            results.put(Finding(match.path, match.kind, match.keyword, match.hidden, match.keyword, match.root))
+                            continue
+                        if self.index is not None:
+                            cached = self.index.lookup(match.path, match.size, match.mtime_ns)
+                            if cached is not None:
+                                metrics.count('index_hits')
+                                report(match, cached.verdict, cached.digest)
+                                continue
+                            metrics.count('index_misses')
+                        slots.acquire()
+                        if stopped():
+                            slots.release()
+                            break
+                        future = self._thread_pool.submit(hash_task, match.path)
+                        future.add_done_callback(lambda future, match=match: on_hashed(match, future))
+                except Exception as e:
+                    logger.error(f"Ошибка обхода {root_dir}: {e}")
+                # Время обхода включает ожидание свободных мест в конвейере
+                metrics.add_stage('walk', time.perf_counter() - started, time.thread_time() - cpu_started)
+
+        def coordinate():
+            try:
+                walk = profiler.wrap(produce) if profiler is not None else produce
+                producers = [threading.Thread(target=walk, args=(root_dir, matches), name='filefinder-walker', daemon=True)
+                             for root_dir, matches in walks]
+                for producer in producers:
+                    producer.start()
+                for producer in producers:
+                    producer.join()
+                # Дожидаемся всех задач в работе, чтобы конец проверки шел после их результатов
+                for _ in range(self.max_pending):
+                    slots.acquire()
+                for _ in range(self.max_pending):
+                    slots.release()
+            finally:
+                results.put(_DONE)
+
+        threading.Thread(target=coordinate, name='filefinder-scan', daemon=True).start()
+        cheats = 0
+        try:
+            while True:
+                finding = results.get()
+                if finding is _DONE:
+                    break
+                if finding.verdict:
+                    cheats += 1
+                    metrics.mark_verdict()
+                yield finding
+                if max_cheats and cheats >= max_cheats:
+                    metrics.stop('cheat_limit')
+                    break
+                if cancelled():
+                    break
+        finally:
+            if cancel is not None and cancel.is_set():
+                metrics.stop('cancelled')
+            stop.set()
+            if self.index is not None:
+                self.index.flush()
+                if prune:
+                    metrics.count('index_pruned', self.index.prune())
+            metrics.finish(progress.entries)
+            logger.info(f"Метрики проверки: {metrics.summary()}")
+
+    def close(self):
+        """Остановить пулы. Повторная проверка создаст их заново."""
+        with self._lock:
+            if self._thread_pool is not None:
+                self._thread_pool.shutdown(wait=False, cancel_futures=True)
+                self._thread_pool = None
+            if self._process_pool is not None:
+                self._process_pool.shutdown(wait=False, cancel_futures=True)
+                self._process_pool = None
@@ -0,0 +1,157 @@
+from array import array
+
+from .walker import FILE
+
+# Колонки, по которым можно сортировать результаты
+SORT_COLUMNS = ('kind', 'path', 'rule', 'hidden')
+
+
+class Result:
+    """Строка результатов: путь, вид, сработавшее правило и признак скрытости.
+
+    Хранится без словаря атрибутов и без готовой строки для показа:
+    текст строки собирается только для видимых в окне записей.
+    """
+
+    __slots__ = ('path', 'kind', 'rule', 'hidden', 'verdict')
+
+    def __init__(self, path, kind, rule, hidden, verdict):
+        self.path = path
+        self.kind = kind
+        self.rule = rule
+        self.hidden = hidden
+        self.verdict = verdict
+
+    @property
+    def is_file(self):
+        return self.kind == FILE
+
+    @property
+    def match(self):
+        """Что сработало: вердикт анализа, а без него - правило имени."""
+        return self.verdict or self.rule or ''
+
+
+def _sort_key(column, record):
+    if column == 'kind':
+        return (record.kind, record.path.lower())
+    if column == 'rule':
+        return (record.match.lower(), record.path.lower())
+    if column == 'hidden':
+        return (not record.hidden, record.path.lower())
+    return record.path.lower()
+
+
+class ResultModel:
+    """Все результаты проверки и их текущее представление: фильтр и порядок.
+
+    Записи добавляются в конец и изредка удаляются (при наблюдении за
+    изменениями); представление - массив номеров записей,
+    поэтому сортировка и фильтр не трогают сами записи и не требуют
+    повторной проверки. Ключи сортировки считаются один раз на запись,
+    новые записи досортировываются при следующем чтении. Работает в
+    одном потоке (главном потоке Tk).
+    """
+
+    def __init__(self):
+        self.records = []
+        self.view = array('I')
+        self.sort_column = None
+        self.reverse = False
+        self.text = ''
+        self.cheats_only = False
+        self._keys = []
+        self._unsorted = False
+
+    def clear(self):
+        self.records = []
+        self.view = array('I')
+        self._keys = []
+        self._unsorted = False
+
+    def add(self, findings):
+        """Добавить находки. Возвращает число записей, попавших в представление."""
+        start = len(self.records)
+        self.records.extend([Result(finding.path, finding.kind, finding.keyword, bool(finding.hidden), finding.verdict)
+                             for finding in findings])
+        if self._filtered:
+            added = [index for index in range(start, len(self.records)) if self._matches(self.records[index])]
+        else:
+            added = range(start, len(self.records))
+        if self.sort_column is not None:
+            self._keys.extend(_sort_key(self.sort_column, record) for record in self.records[start:])
+        if self.sort_column is not None or self.reverse:
+            self._unsorted = self._unsorted or bool(added)
+        self.view.extend(added)
+        return len(added)
+
+    def remove(self, paths):
+        """Убрать записи с путями из paths. Возвращает число убранных записей."""
+        paths = set(paths)
+        keep = [index for index, record in enumerate(self.records) if record.path not in paths]
+        removed = len(self.records) - len(keep)
+        if removed:
+            self.records = [self.records[index] for index in keep]
+            if self._keys:
+                self._keys = [self._keys[index] for index in keep]
+            self.set_filter(self.text, self.cheats_only)
+        return removed
+
+    def set_filter(self, text='', cheats_only=False):
+        """Показать только записи, где text встречается в пути или правиле."""
+        self.text = text.strip().lower()
+        self.cheats_only = cheats_only
+        if self._filtered:
+            self.view = array('I', [index for index, record in enumerate(self.records) if self._matches(record)])
+        else:
+            self.view = array('I', range(len(self.records)))
+        self._unsorted = self.sort_column is not None or self.reverse
+
+    def sort(self, column, reverse=False):
+        """Упорядочить представление по колонке из SORT_COLUMNS, None - в порядке находок."""
+        if column is not None and column not in SORT_COLUMNS:
+            raise ValueError(f"Неизвестная колонка '{column}'")
+        if column != self.sort_column:
+            self._keys = [_sort_key(column, record) for record in self.records] if column is not None else []
+        self.sort_column = column
+        self.reverse = reverse
+        self._unsorted = True
+
+    @property
+    def _filtered(self):
+        return bool(self.text) or self.cheats_only
+
+    def _matches(self, record):
+        if self.cheats_only and not record.verdict:
+            return False
+        if self.text:
+            return self.text in record.path.lower() or self.text in record.match.lower()
+        return True
+
+    def _ensure_sorted(self):
+        if self._unsorted:
+            # Почти упорядоченный массив с новыми записями в хвосте timsort досортировывает быстро
+            key = self._keys.__getitem__ if self.sort_column is not None else None
+            self.view = array('I', sorted(self.view, key=key, reverse=self.reverse))
+            self._unsorted = False
+
+    def __len__(self):
+        return len(self.view)
+
+    def __getitem__(self, position):
+        self._ensure_sorted()
+        return self.records[self.view[position]]
+
+    def rows(self, start, stop):
+        """Записи представления с позиции start до stop."""
+        self._ensure_sorted()
+        records = self.records
+        return [records[index] for index in self.view[start:stop]]
+
+    def position(self, record):
+        """Позиция записи в представлении или None, если она отфильтрована."""
+        self._ensure_sorted()
+        for position, index in enumerate(self.view):
+            if self.records[index] is record:
+                return position
+        return None
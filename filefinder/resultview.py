@@ -0,0 +1,189 @@
+import tkinter as tk
+from tkinter import ttk
+
+ROW_HEIGHT = 20  # Высота строки таблицы в пикселях
+HEADING_HEIGHT = 24  # Высота заголовков, пока ее нельзя измерить
+
+# Колонки таблицы: имя, заголовок, ширина, растягивается ли
+COLUMNS = (
+    ('kind', "Тип", 70, False),
+    ('path', "Путь", 420, True),
+    ('rule', "Совпадение", 150, False),
+    ('hidden', "Скрытый", 70, False),
+)
+
+
+def row_values(record):
+    """Текст колонок для записи ResultModel."""
+    return ("Файл" if record.is_file else "Папка", record.path, record.match, "да" if record.hidden else "")
+
+
+class VirtualResults:
+    """Таблица результатов, в которой созданы только видимые строки.
+
+    Treeview содержит столько элементов, сколько строк помещается в окне;
+    при прокрутке меняется только их текст. Позицию прокрутки и выделение
+    таблица хранит сама, в терминах ResultModel, поэтому число найденных
+    записей не влияет ни на память Tk, ни на скорость прокрутки.
+    Клик по заголовку сортирует по колонке, повторный - в обратном порядке.
+    """
+
+    def __init__(self, parent, model, on_select=None):
+        self.model = model
+        self.on_select = on_select
+        self.top = 0
+        self.visible = 1
+        self.selected = None
+        self._heading_height = None
+
+        style = ttk.Style(parent)
+        style.configure('Results.Treeview', rowheight=ROW_HEIGHT)
+        self.frame = tk.Frame(parent)
+        self.scrollbar = tk.Scrollbar(self.frame, command=self._on_scrollbar)
+        self.scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
+        self.xscrollbar = tk.Scrollbar(self.frame, orient=tk.HORIZONTAL)
+        self.xscrollbar.pack(side=tk.BOTTOM, fill=tk.X)
+        self.tree = ttk.Treeview(self.frame, columns=[name for name, _, _, _ in COLUMNS], show='headings',
+                                 selectmode='browse', style='Results.Treeview',
+                                 xscrollcommand=self.xscrollbar.set)
+        self.tree.pack(fill=tk.BOTH, expand=True)
+        self.xscrollbar.config(command=self.tree.xview)
+        for name, heading, width, stretch in COLUMNS:
+            self.tree.heading(name, text=heading, command=lambda column=name: self.sort_by(column))
+            self.tree.column(name, width=width, stretch=stretch, anchor=tk.W)
+
+        self.tree.bind('<Configure>', self._on_configure)
+        self.tree.bind('<<TreeviewSelect>>', self._on_tree_select)
+        self.tree.bind('<MouseWheel>', self._on_wheel)
+        self.tree.bind('<Button-4>', lambda event: self.scroll(-3))
+        self.tree.bind('<Button-5>', lambda event: self.scroll(3))
+        self.tree.bind('<Up>', lambda event: self._move(-1))
+        self.tree.bind('<Down>', lambda event: self._move(1))
+        self.tree.bind('<Prior>', lambda event: self._move(-self.visible))
+        self.tree.bind('<Next>', lambda event: self._move(self.visible))
+        self.tree.bind('<Home>', lambda event: self._move(-len(self.model)))
+        self.tree.bind('<End>', lambda event: self._move(len(self.model)))
+
+    def pack(self, **kwargs):
+        self.frame.pack(**kwargs)
+
+    def bind(self, sequence, func):
+        self.tree.bind(sequence, func, add='+')
+
+    def clear(self):
+        """Очистить модель и таблицу перед новой проверкой."""
+        self.model.clear()
+        self.top = 0
+        self.selected = None
+        self.refresh()
+
+    def refresh(self):
+        """Перерисовать видимые строки, например после добавления записей в модель."""
+        total = len(self.model)
+        self.top = max(0, min(self.top, total - self.visible))
+        rows = self.model.rows(self.top, self.top + self.visible)
+        items = self.tree.get_children()
+        for slot in range(len(items), len(rows)):
+            self.tree.insert('', tk.END, iid=str(slot))
+        if len(items) > len(rows):
+            self.tree.delete(*items[len(rows):])
+        selected_slot = None
+        for slot, record in enumerate(rows):
+            self.tree.item(str(slot), values=row_values(record))
+            if record is self.selected:
+                selected_slot = str(slot)
+        if selected_slot is not None:
+            self.tree.selection_set(selected_slot)
+        elif self.tree.selection():
+            self.tree.selection_remove(*self.tree.selection())
+        if total:
+            self.scrollbar.set(self.top / total, min(1.0, (self.top + self.visible) / total))
+        else:
+            self.scrollbar.set(0.0, 1.0)
+
+    def update(self, removed_paths, findings):
+        """Убрать записи с путями removed_paths, добавить findings и перерисовать таблицу."""
+        self.model.remove(removed_paths)
+        self.model.add(findings)
+        self._keep_selection_visible()
+
+    def set_filter(self, text, cheats_only):
+        self.model.set_filter(text, cheats_only)
+        self._keep_selection_visible()
+
+    def sort_by(self, column):
+        reverse = not self.model.reverse if self.model.sort_column == column else False
+        self.model.sort(column, reverse)
+        for name, heading, _, _ in COLUMNS:
+            mark = (" ▼" if reverse else " ▲") if name == column else ""
+            self.tree.heading(name, text=heading + mark)
+        self._keep_selection_visible()
+
+    def scroll(self, delta):
+        self.top += delta
+        self.refresh()
+        return 'break'
+
+    def _keep_selection_visible(self):
+        position = self.model.position(self.selected) if self.selected is not None else None
+        if position is None:
+            self.selected = None
+            self.top = 0
+        elif not self.top <= position < self.top + self.visible:
+            self.top = max(0, position - self.visible // 2)
+        self.refresh()
+        if self.on_select:
+            self.on_select(self.selected)
+
+    def _on_scrollbar(self, action, amount, unit=None):
+        total = len(self.model)
+        if action == 'moveto':
+            self.top = int(float(amount) * total)
+        elif action == 'scroll':
+            self.top += int(amount) * (self.visible if unit == 'pages' else 1)
+        self.refresh()
+
+    def _on_wheel(self, event):
+        # На Windows шаг колеса - 120, на macOS - единицы
+        step = event.delta // 120 if abs(event.delta) >= 120 else event.delta
+        return self.scroll(-3 * step)
+
+    def _on_configure(self, event):
+        items = self.tree.get_children()
+        if self._heading_height is None and items:
+            box = self.tree.bbox(items[0])
+            if box:
+                self._heading_height = box[1]
+        heading = self._heading_height if self._heading_height is not None else HEADING_HEIGHT
+        visible = max(1, (event.height - heading) // ROW_HEIGHT)
+        if visible != self.visible:
+            self.visible = visible
+            self.refresh()
+
+    def _on_tree_select(self, event):
+        selection = self.tree.selection()
+        if not selection:
+            return
+        position = self.top + int(selection[0])
+        if position < len(self.model):
+            self.selected = self.model[position]
+            if self.on_select:
+                self.on_select(self.selected)
+
+    def _move(self, delta):
+        """Сдвинуть выделение клавишами, прокручивая таблицу у ее краев."""
+        total = len(self.model)
+        if not total:
+            return 'break'
+        selection = self.tree.selection()
+        position = self.top + int(selection[0]) + delta if selection else self.top
+        position = max(0, min(position, total - 1))
+        if position < self.top:
+            self.top = position
+        elif position >= self.top + self.visible:
+            self.top = position - self.visible + 1
+        self.selected = self.model[position]
+        self.refresh()
+        if self.on_select:
+            self.on_select(self.selected)
+        return 'break'
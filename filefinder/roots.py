@@ -0,0 +1,108 @@
+import os
+import string
+import logging
+from collections import namedtuple
+
+logger = logging.getLogger(__name__)
+
+# Найденная игровая папка: путь и лаунчер, которому она принадлежит
+GameRoot = namedtuple('GameRoot', ['path', 'launcher'])
+
+# Папки лаунчеров относительно %APPDATA% (Windows) или домашней папки
+_APPDATA_ROOTS = [
+    ('.minecraft', 'Minecraft'),
+    ('.tlauncher', 'TLauncher'),
+    (os.path.join('PrismLauncher', 'instances'), 'Prism Launcher'),
+    (os.path.join('PolyMC', 'instances'), 'PolyMC'),
+    (os.path.join('MultiMC', 'instances'), 'MultiMC'),
+    (os.path.join('gdlauncher_next', 'instances'), 'GDLauncher'),
+    (os.path.join('.feather', 'instances'), 'Feather'),
+    (os.path.join('com.modrinth.theseus', 'profiles'), 'Modrinth'),
+]
+_HOME_ROOTS = [
+    ('.minecraft', 'Minecraft'),
+    ('.tlauncher', 'TLauncher'),
+    ('.lunarclient', 'Lunar Client'),
+    (os.path.join('curseforge', 'minecraft', 'Instances'), 'CurseForge'),
+    (os.path.join('Documents', 'Curseforge', 'Minecraft', 'Instances'), 'CurseForge'),
+    (os.path.join('Library', 'Application Support', 'minecraft'), 'Minecraft'),
+    (os.path.join('Library', 'Application Support', 'PrismLauncher', 'instances'), 'Prism Launcher'),
+    (os.path.join('.local', 'share', 'PrismLauncher', 'instances'), 'Prism Launcher'),
+    (os.path.join('.local', 'share', 'PolyMC', 'instances'), 'PolyMC'),
+    (os.path.join('.local', 'share', 'multimc', 'instances'), 'MultiMC'),
+    (os.path.join('.local', 'share', 'ModrinthApp', 'profiles'), 'Modrinth'),
+    (os.path.join('.var', 'app', 'org.prismlauncher.PrismLauncher', 'data', 'PrismLauncher', 'instances'), 'Prism Launcher'),
+]
+# Типичные места переносных лаунчеров в корне других дисков
+_DRIVE_ROOTS = [
+    ('.minecraft', 'Minecraft'),
+    (os.path.join('Games', '.minecraft'), 'Minecraft'),
+    (os.path.join('Minecraft', '.minecraft'), 'Minecraft'),
+    (os.path.join('MultiMC', 'instances'), 'MultiMC'),
+    (os.path.join('PrismLauncher', 'instances'), 'Prism Launcher'),
+    (os.path.join('TLauncher', '.minecraft'), 'TLauncher'),
+]
+
+
+def find_minecraft_directory():
+    """Найти директорию .minecraft стандартного лаунчера."""
+    appdata = os.getenv('APPDATA')
+    if os.name == 'nt' and appdata:
+        return os.path.join(appdata, '.minecraft')
+    home_dir = os.path.expanduser("~")
+    if os.name == 'nt':
+        return os.path.join(home_dir, 'AppData', 'Roaming', '.minecraft')
+    return os.path.join(home_dir, '.minecraft')
+
+
+def _windows_drives():
+    """Корни существующих дисков Windows, кроме системного."""
+    system_drive = (os.getenv('SystemDrive') or 'C:').upper()
+    for letter in string.ascii_uppercase:
+        drive = f"{letter}:"
+        if drive != system_drive and os.path.isdir(drive + os.sep):
+            yield drive + os.sep
+
+
+def candidate_roots():
+    """Все места, где могут лежать игровые папки, без проверки существования."""
+    home_dir = os.path.expanduser("~")
+    candidates = [(find_minecraft_directory(), 'Minecraft')]
+    appdata = os.getenv('APPDATA')
+    if appdata:
+        candidates += [(os.path.join(appdata, path), launcher) for path, launcher in _APPDATA_ROOTS]
+    candidates += [(os.path.join(home_dir, path), launcher) for path, launcher in _HOME_ROOTS]
+    if os.name == 'nt':
+        for drive in _windows_drives():
+            candidates += [(os.path.join(drive, path), launcher) for path, launcher in _DRIVE_ROOTS]
+    return candidates
+
+
+def discover_roots(extra=()):
+    """Существующие игровые папки всех лаунчеров без повторов и вложенных друг в друга.
+
+    extra - дополнительные пути, указанные пользователем.
+    """
+    return merge_roots([(path, 'custom') for path in extra] + candidate_roots())
+
+
+def merge_roots(candidates):
+    """Оставить из пар (путь, лаунчер) существующие папки без повторов и вложенных друг в друга."""
+    found = {}
+    for path, launcher in candidates:
+        try:
+            if not os.path.isdir(path):
+                continue
+            real = os.path.normcase(os.path.realpath(path))
+        except OSError:
+            continue
+        found.setdefault(real, GameRoot(path, launcher))
+
+    # Папка внутри уже найденной будет пройдена при ее обходе
+    roots = []
+    for real in sorted(found, key=len):
+        if not any(real.startswith(os.path.join(parent, '')) for parent, _ in roots):
+            roots.append((real, found[real]))
+        else:
+            logger.debug(f"{real} уже входит в другую игровую папку")
+    return [root for _, root in roots]
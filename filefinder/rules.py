@@ -0,0 +1,287 @@
+import re
+import fnmatch
+import hashlib
+
+from .matcher import KeywordMatcher
+
+# Префиксы типов правил; строка без префикса - подстрока, как раньше
+REGEX = 're:'
+GLOB = 'glob:'
+EXTENSION = 'ext:'
+PATH = 'path:'
+
+# Короче этого обязательная подстрока почти не отсеивает имена: правило проверяется всегда
+MIN_LITERAL = 3
+_REGEX_SPECIAL = set('.^$*+?{}[]\\|()')
+_REGEX_ESCAPED_LITERALS = set('.^$*+?{}[]\\|()-/ _\'"#&~=!<>,:;@%')
+# Экранирования с аргументом фиксированной длины: \x61, \u0061, \U00000061
+_ESCAPE_ARGUMENT_SIZES = {'x': 2, 'u': 4, 'U': 8}
+
+
+class NameRules:
+    """Правила для имен файлов, папок и записей .jar.
+
+    Строка правила задает его тип префиксом:
+      "xray"               - подстрока в имени (автомат Ахо–Корасик);
+      "re:^wwe[-_ ]"       - регулярное выражение, ищется в любом месте имени;
+      "glob:wwe-*.jar"     - шаблон для всего имени;
+      "ext:.exe"           - расширение, в том числе составное (.tar.gz);
+      "path:config/xray"   - подряд идущие компоненты пути.
+    Каждый тип компилируется в одну структуру: подстроки - в общий автомат,
+    расширения - в словарь, пути - в дерево компонентов. Для регулярных
+    выражений и шаблонов в общий автомат собираются их обязательные подстроки,
+    и проверяются только правила, чья подстрока нашлась в имени. Поэтому имя
+    проверяется за один проход на тип, сколько бы правил ни было. Регистр не
+    учитывается.
+    Нумерованные обратные ссылки (\\1) в регулярных выражениях не поддерживаются.
+    """
+
+    def __init__(self, rules):
+        self.rules = tuple(dict.fromkeys(rule.strip() for rule in rules if rule and rule.strip()))
+        self.fingerprint = hashlib.sha1('\n'.join(sorted(self.rules)).encode('utf-8')).hexdigest()
+        keywords = []
+        regexes = []
+        globs = []
+        self._extensions = {}
+        self._paths = {}
+        for rule in self.rules:
+            if rule.startswith(REGEX):
+                source = rule[len(REGEX):]
+                regexes.append((rule, source, _regex_literal(source)))
+            elif rule.startswith(GLOB):
+                pattern = rule[len(GLOB):].lower()
+                globs.append((rule, fnmatch.translate(pattern), _glob_literal(pattern)))
+            elif rule.startswith(EXTENSION):
+                extension = rule[len(EXTENSION):].lower()
+                self._extensions.setdefault(extension if extension.startswith('.') else '.' + extension, rule)
+            elif rule.startswith(PATH):
+                self._add_path(rule)
+            else:
+                keywords.append(rule)
+        self._keywords = KeywordMatcher(keywords)
+        self._regex = _PatternSet(regexes, anchored=False)
+        self._glob = _PatternSet(globs, anchored=True)
+
+    def _add_path(self, rule):
+        components = [part for part in rule[len(PATH):].lower().replace('\\', '/').split('/') if part]
+        if not components:
+            raise ValueError(f"Пустое правило пути '{rule}'")
+        node = self._paths
+        for component in components:
+            node = node.setdefault(component, {})
+        node.setdefault(None, rule)
+
+    def search(self, name):
+        """Первое сработавшее правило для имени или None. Правила путей здесь не участвуют."""
+        keyword = self._keywords.search(name)
+        if keyword:
+            return keyword
+        name = name.lower()
+        if self._extensions:
+            dot = name.find('.')
+            while dot >= 0:
+                rule = self._extensions.get(name[dot:])
+                if rule:
+                    return rule
+                dot = name.find('.', dot + 1)
+        if self._regex:
+            rule = self._regex.search(name)
+            if rule:
+                return rule
+        if self._glob:
+            return self._glob.search(name)
+        return None
+
+    def step(self, states, name):
+        """Перейти по дереву правил путей на следующий компонент name.
+
+        states - состояния для родительской папки (() для корня обхода).
+        Возвращает (сработавшее правило или None, состояния для этого
+        компонента). Число состояний ограничено длиной самого длинного правила.
+        """
+        if not self._paths:
+            return None, ()
+        name = name.lower()
+        rule = None
+        following = []
+        for node in states + (self._paths,):
+            nxt = node.get(name)
+            if nxt is not None:
+                if rule is None:
+                    rule = nxt.get(None)
+                following.append(nxt)
+        return rule, tuple(following)
+
+    def search_path(self, path):
+        """Проверка пути с разделителями / целиком: имя и все компоненты."""
+        rule = self.search(path)
+        if rule or not self._paths:
+            return rule
+        states = ()
+        for component in path.split('/'):
+            if component:
+                rule, states = self.step(states, component)
+                if rule:
+                    return rule
+        return None
+
+    @property
+    def has_paths(self):
+        """Есть ли правила путей: без них обходу не нужно хранить состояния."""
+        return bool(self._paths)
+
+    def __bool__(self):
+        return bool(self.rules)
+
+    def __len__(self):
+        return len(self.rules)
+
+
+class _PatternSet:
+    """Регулярные выражения с отбором кандидатов по обязательной подстроке.
+
+    Выражения без подходящей подстроки объединяются в одну альтернативу,
+    которая проверяется для каждого имени. Если объединить их нельзя
+    (глобальные флаги вроде (?i), одинаковые имена групп), они
+    проверяются по одному.
+    """
+
+    def __init__(self, entries, anchored):
+        self._anchored = anchored
+        self._by_literal = {}
+        always = []
+        for rule, source, literal in entries:
+            try:
+                pattern = re.compile(source, re.IGNORECASE | re.DOTALL)
+            except re.error as e:
+                raise ValueError(f"Некорректное правило '{rule}': {e}")
+            if literal and len(literal) >= MIN_LITERAL:
+                self._by_literal.setdefault(literal, []).append((rule, pattern))
+            else:
+                always.append((rule, source, pattern))
+        self._filter = KeywordMatcher(self._by_literal)
+        self._always = None
+        self._always_rules = {}
+        self._always_each = ()
+        if always:
+            parts = []
+            group = 1
+            for rule, source, pattern in always:
+                parts.append(f"({source})")
+                self._always_rules[group] = rule
+                group += pattern.groups + 1
+            try:
+                self._always = re.compile('|'.join(parts), re.IGNORECASE | re.DOTALL)
+            except re.error:
+                self._always_rules = {}
+                self._always_each = tuple((rule, pattern) for rule, _, pattern in always)
+
+    def _test(self, pattern, name):
+        return pattern.match(name) if self._anchored else pattern.search(name)
+
+    def search(self, name):
+        """Первое сработавшее правило для имени в нижнем регистре или None."""
+        if self._filter:
+            for literal in self._filter.findall(name):
+                for rule, pattern in self._by_literal[literal]:
+                    if self._test(pattern, name):
+                        return rule
+        if self._always is not None:
+            match = self._test(self._always, name)
+            if match:
+                return self._always_rules[match.lastindex]
+        for rule, pattern in self._always_each:
+            if self._test(pattern, name):
+                return rule
+        return None
+
+    def __bool__(self):
+        return bool(self._by_literal) or self._always is not None or bool(self._always_each)
+
+
+def _glob_literal(pattern):
+    """Самая длинная подстрока шаблона без подстановочных знаков."""
+    return max(re.split(r'\*|\?|\[[^\]]*\]?', pattern), key=len, default='')
+
+
+def _regex_literal(source):
+    """Самая длинная подстрока, без которой регулярное выражение не совпадет.
+
+    Разбор намеренно осторожный: группы, классы символов и необязательные
+    символы прерывают подстроку, альтернатива на верхнем уровне отменяет ее.
+    """
+    best = ''
+    run = ''
+    i = 0
+    while i < len(source):
+        char = source[i]
+        if char == '|':
+            return ''
+        if char == '\\' and i + 1 < len(source):
+            escaped = source[i + 1]
+            i += 2
+            if escaped in _REGEX_ESCAPED_LITERALS:
+                run += escaped
+            else:
+                # Классы (\d, \b), коды символов (\x61, \N{...}) и ссылки прерывают подстроку
+                best, run = max(best, run, key=len), ''
+                i = _skip_escape_argument(source, i, escaped)
+            continue
+        if char in '*?{':
+            # Предыдущий символ необязателен
+            run = run[:-1]
+            best, run = max(best, run, key=len), ''
+            if char == '{':
+                i = source.find('}', i) + 1 or len(source)
+                continue
+        elif char in '([':
+            best, run = max(best, run, key=len), ''
+            i = _skip_group(source, i)
+            continue
+        elif char in _REGEX_SPECIAL:
+            best, run = max(best, run, key=len), ''
+        else:
+            run += char
+        i += 1
+    return max(best, run, key=len).lower()
+
+
+def _skip_escape_argument(source, i, escaped):
+    """Позиция после аргумента экранирования \\<escaped>, который начинается в i."""
+    if escaped in _ESCAPE_ARGUMENT_SIZES:
+        return min(i + _ESCAPE_ARGUMENT_SIZES[escaped], len(source))
+    if escaped == 'N' and source.startswith('{', i):
+        return source.find('}', i) + 1 or len(source)
+    if escaped.isdigit():
+        # Восьмеричный код (\012) или ссылка на группу (\12): не больше двух цифр после первой
+        j = i
+        while j < len(source) and j < i + 2 and source[j].isdigit():
+            j += 1
+        return j
+    return i
+
+
+def _skip_group(source, i):
+    """Позиция после группы (...) или класса [...], начинающихся в i."""
+    closing = ')' if source[i] == '(' else ']'
+    depth = 0
+    j = i
+    while j < len(source):
+        char = source[j]
+        if char == '\\':
+            j += 2
+            continue
+        if closing == ']':
+            if char == ']' and j > i + 1 and not (j == i + 2 and source[i + 1] == '^'):
+                return j + 1
+        elif char == '[':
+            j = _skip_group(source, j)
+            continue
+        elif char == '(':
+            depth += 1
+        elif char == ')':
+            depth -= 1
+            if depth == 0:
+                return j + 1
+        j += 1
+    return len(source)
@@ -0,0 +1,161 @@
+import os
+import sys
+import json
+import pickle
+import hashlib
+import logging
+
+from . import hashes
+from .analysis import ANALYZER_VERSION, analyzer_code_version, code_version
+from .hashes import DigestSet, parse_digests
+from .matcher import KeywordMatcher, signature_version
+from .rules import NameRules
+
+logger = logging.getLogger(__name__)
+
+# Версия формата файла базы сигнатур (ключ "format")
+FORMAT_VERSION = 1
+# Версия формата скомпилированного кеша. Правки KeywordMatcher, NameRules, DigestSet и SignatureSet
+# сбрасывают кеш и без ее смены: хеш их кода входит в source_key
+CACHE_FORMAT = b'FFSIGCACHE5\n'
+
+# Встроенные сигнатуры читов. Типы правил для имен - см. NameRules; короткие слова
+# ограничены началом слова, чтобы "rage" не срабатывало на storage, а "wwe" - на чужие имена
+FILE_KEYWORDS = [
+    'xray', 'impact', 'meteorclient', 'fullbright', 'freecam',
+    'aristois', 'auto aim', 'chestesp', 'trajectory preview',
+    'x-ray', 'baritone', 'fabritone', 'entity outliner',
+    r're:(?<![a-z])wwe', 'matix', 'enemyz', 'noplayerdamage',
+    'detection', 'player highlighter'
+]
+FOLDER_KEYWORDS = ['impact', 'cheat', 'hacks', 'aristois', 'meteorclient', 'hack']
+BLACKLISTED_FOLDERS = ['grossjava9hacks']
+JAR_MEMBER_KEYWORDS = ["xray", "baritone", "meteorclient", "aristois", "killaura", r"re:(?<![a-z])rage", "antiafk", "autototem", "autoeat", "wallhack"]
+CONTENT_SIGNATURES = [
+    "class xray", "baritone", "meteorclient", "aristois",
+    "modded client", "freecam", "aimbot", "esp", "wallhack"
+]
+# В классах и описаниях модов короткие сигнатуры вроде "esp" дают ложные срабатывания
+JAR_CONTENT_SIGNATURES = ["baritone", "meteorclient", "aristois", "killaura", "wallhack", "freecam", "aimbot"]
+
+# Ключи файла сигнатур и соответствующие встроенные списки
+SECTIONS = {
+    'files': FILE_KEYWORDS,
+    'folders': FOLDER_KEYWORDS,
+    'blacklisted_folders': BLACKLISTED_FOLDERS,
+    'jar_members': JAR_MEMBER_KEYWORDS,
+    'content': CONTENT_SIGNATURES,
+    'jar_content': JAR_CONTENT_SIGNATURES,
+}
+# Разделы с hex-хешами файлов: встроенных нет
+HASH_SECTIONS = ('known_good', 'known_cheat')
+
+
+class SignatureSet:
+    """Скомпилированный набор сигнатур для всех проверок."""
+
+    def __init__(self, files, folders, blacklisted_folders, jar_members, content, jar_content,
+                 known_good=None, known_cheat=None, release=None):
+        self.file_matcher = NameRules(files)
+        self.folder_matcher = NameRules(folders)
+        self.blacklisted_folders = [folder.lower() for folder in blacklisted_folders]
+        self.jar_member_matcher = NameRules(jar_members)
+        self.content_matcher = KeywordMatcher(content, chunks=True)
+        self.jar_content_matcher = KeywordMatcher(jar_content, chunks=True)
+        self.known_good = known_good if known_good is not None else DigestSet()
+        self.known_cheat = known_cheat if known_cheat is not None else DigestSet()
+        # Версия баз сигнатур (ключ "version"): для людей, в истории и пакетах рядом с version
+        self.release = release
+        # Все, от чего зависят вердикты анализа содержимого: ее смена сбрасывает индекс проверки
+        self.analysis_version = hashlib.sha1('\n'.join([
+            ANALYZER_VERSION, analyzer_code_version(),
+            signature_version(self.jar_member_matcher, self.content_matcher, self.jar_content_matcher),
+            self.known_good.fingerprint, self.known_cheat.fingerprint,
+        ]).encode('ascii')).hexdigest()
+        # Версия всего набора, включая правила имен файлов и папок: по ней сравниваются запуски
+        self.version = hashlib.sha1('\n'.join([
+            self.analysis_version, signature_version(self.file_matcher, self.folder_matcher),
+            *self.blacklisted_folders,
+        ]).encode('utf-8')).hexdigest()
+
+    @classmethod
+    def load(cls, paths=(), include_builtin=True, known_good_paths=(), known_cheat_paths=()):
+        """Набор из встроенных сигнатур и файлов базы сигнатур.
+
+        База - JSON с ключами из SECTIONS и HASH_SECTIONS, а также "format"
+        (версия формата) и "version" (версия самой базы, попадает в release). known_good_paths и
+        known_cheat_paths - текстовые списки хешей, как для DigestSet.load.
+        """
+        sections = {key: list(values) if include_builtin else [] for key, values in SECTIONS.items()}
+        digests = {key: [] for key in HASH_SECTIONS}
+        releases = []
+        for path in paths:
+            with open(path, 'r', encoding='utf-8') as file:
+                data = json.load(file)
+            file_format = data.pop('format', FORMAT_VERSION)
+            if not isinstance(file_format, int) or file_format > FORMAT_VERSION:
+                raise ValueError(f"Неподдерживаемый формат базы сигнатур {file_format!r} в {path}")
+            release = data.pop('version', None)
+            if release is not None:
+                logger.info(f"База сигнатур {path}: версия {release}")
+                releases.append(str(release))
+            for key, values in data.items():
+                if key in digests:
+                    digests[key].extend(parse_digests(values, f"{path}:{key}"))
+                elif key in sections:
+                    sections[key].extend(values)
+                else:
+                    raise ValueError(f"Неизвестный раздел сигнатур '{key}' в {path}")
+        for key, hash_paths in (('known_good', known_good_paths), ('known_cheat', known_cheat_paths)):
+            for path in hash_paths:
+                with open(path, 'r', encoding='utf-8') as file:
+                    digests[key].extend(parse_digests(file, path))
+        return cls(**sections, known_good=DigestSet(digests['known_good']),
+                   known_cheat=DigestSet(digests['known_cheat']), release=', '.join(releases) or None)
+
+    @classmethod
+    def load_cached(cls, cache_path, paths=(), include_builtin=True, known_good_paths=(), known_cheat_paths=()):
+        """То же, что load, но через скомпилированный кеш в cache_path.
+
+        Кеш помечен хешем исходных файлов и кода сигнатур и пересобирается,
+        только если они изменились. В кеше лежат автоматы для имен и исходные
+        тексты выражений для содержимого; выражения компилируются при первом
+        поиске под блокировкой, так что набор готов к проверке из любого потока.
+        """
+        key = source_key(paths, include_builtin, known_good_paths, known_cheat_paths)
+        header = CACHE_FORMAT + key
+        try:
+            with open(cache_path, 'rb') as file:
+                if file.read(len(header)) == header:
+                    return pickle.load(file)
+            logger.info(f"Кеш сигнатур {cache_path} устарел, пересборка")
+        except FileNotFoundError:
+            pass
+        except Exception as e:
+            logger.error(f"Ошибка чтения кеша сигнатур {cache_path}: {e}")
+
+        signatures = cls.load(paths, include_builtin, known_good_paths, known_cheat_paths)
+        temp_path = f"{cache_path}.tmp"
+        try:
+            with open(temp_path, 'wb') as file:
+                file.write(header)
+                pickle.dump(signatures, file, pickle.HIGHEST_PROTOCOL)
+            os.replace(temp_path, cache_path)
+        except Exception as e:
+            logger.error(f"Ошибка записи кеша сигнатур {cache_path}: {e}")
+        return signatures
+
+
+def source_key(paths=(), include_builtin=True, known_good_paths=(), known_cheat_paths=()):
+    """Хеш всех источников набора сигнатур и кода, который их компилирует: по нему проверяется актуальность кеша."""
+    digest = hashlib.sha1(ANALYZER_VERSION.encode('ascii'))
+    digest.update(analyzer_code_version().encode('ascii'))
+    digest.update(code_version(sys.modules[__name__], hashes).encode('ascii'))
+    if include_builtin:
+        digest.update(json.dumps(SECTIONS, sort_keys=True).encode('utf-8'))
+    for kind, kind_paths in (('db', paths), ('good', known_good_paths), ('cheat', known_cheat_paths)):
+        for path in kind_paths:
+            digest.update(f"\0{kind}\0".encode('ascii'))
+            with open(path, 'rb') as file:
+                digest.update(file.read())
+    return digest.hexdigest().encode('ascii') + b'\n'
@@ -0,0 +1,288 @@
+import os
+import time
+import heapq
+import stat
+import logging
+import threading
+from collections import namedtuple
+
+logger = logging.getLogger(__name__)
+
+FILE = 'file'
+FOLDER = 'folder'
+
+# Совпадение, найденное при обходе: путь, тип (FILE или FOLDER), сработавшая сигнатура,
+# признак скрытости, для файлов еще размер и mtime для индекса проверки, и корень обхода.
+Match = namedtuple('Match', ['path', 'kind', 'keyword', 'hidden', 'size', 'mtime_ns', 'root'])
+
+# Уровни очередности обхода: папки меньшего уровня обходятся раньше
+LEVEL_FIRST = 0
+LEVEL_RECENT = 1
+LEVEL_NORMAL = 2
+LEVEL_DEFERRED = 3
+SKIP = None  # Папка не обходится (но сама проверяется по имени)
+
+# Где читы лежат чаще всего
+DEFAULT_FIRST = ('mods', 'coremods', 'jarmods', 'versions', 'config')
+# Громоздкие и малоопасные папки: assets/objects - десятки тысяч файлов с хешами вместо имен
+DEFAULT_DEFER = ('assets', 'saves', 'logs', 'crash-reports', 'screenshots', 'resourcepacks', 'backups')
+RECENT_DAYS = 3  # Папки, измененные за столько дней, обходятся раньше остальных обычных
+
+
+class ScanPolicy:
+    """Очередность обхода: рискованные папки первыми, громоздкие малоопасные - в конце или никогда.
+
+    Папки задаются именем или последними компонентами пути ('assets/objects')
+    и совпадают на любой глубине. Уровень папки наследуется содержимым, пока
+    вложенная папка не совпадет с другим правилом. Обычные папки, измененные
+    за последние recent_days дней, идут сразу после первоочередных. Внутри
+    уровня обход идет в ширину, поэтому mods во всех экземплярах лаунчера
+    находятся раньше глубоких обычных папок, а файлы одной папки выдаются
+    от новых к старым.
+    """
+
+    def __init__(self, first=DEFAULT_FIRST, defer=DEFAULT_DEFER, skip=(), recent_days=RECENT_DAYS):
+        self._rules = {}  # последний компонент -> [(предшествующие компоненты, уровень)]
+        # При равной длине правил пропуск важнее очередности
+        for level, paths in ((SKIP, skip), (LEVEL_FIRST, first), (LEVEL_DEFERRED, defer)):
+            for path in paths:
+                components = tuple(component.lower() for component in path.replace('\\', '/').split('/') if component)
+                if components:
+                    self._rules.setdefault(components[-1], []).append((components[:-1], level))
+        for entries in self._rules.values():
+            # Более длинное правило точнее: проверяется первым
+            entries.sort(key=lambda entry: -len(entry[0]))
+        self.recent_seconds = recent_days * 86400 if recent_days else None
+
+    def level(self, components, parent_level, entry=None):
+        """Уровень папки по компонентам пути от корня обхода в нижнем регистре; SKIP - не обходить.
+
+        entry - DirEntry папки, его время изменения нужно только обычным папкам.
+        """
+        for prefix, level in self._rules.get(components[-1], ()):
+            if not prefix or components[-len(prefix) - 1:-1] == prefix:
+                return level
+        level = LEVEL_NORMAL if parent_level == LEVEL_RECENT else parent_level
+        if level == LEVEL_NORMAL and entry is not None and self.recent_seconds:
+            try:
+                if time.time() - entry.stat(follow_symlinks=False).st_mtime < self.recent_seconds:
+                    return LEVEL_RECENT
+            except OSError:
+                pass
+        return level
+
+    def path_level(self, components):
+        """Уровень папки по всей цепочке ее компонентов (без учета времени изменения)."""
+        level = LEVEL_NORMAL
+        for depth in range(1, len(components) + 1):
+            level = self.level(components[:depth], level)
+            if level is SKIP:
+                break
+        return level
+
+
+def is_hidden_entry(entry):
+    """Проверка DirEntry на скрытость без лишнего обращения к диску."""
+    if os.name == 'nt':
+        # На Windows атрибуты уже получены вместе с листингом каталога
+        try:
+            return bool(entry.stat(follow_symlinks=False).st_file_attributes & 0x2)
+        except (AttributeError, OSError):
+            return False
+    return entry.name.startswith('.')
+
+
+def _is_hidden_path(name, stat_result):
+    """То же, что is_hidden_entry, для пути с уже полученным stat."""
+    if os.name == 'nt':
+        return bool(getattr(stat_result, 'st_file_attributes', 0) & 0x2)
+    return name.startswith('.')
+
+
+def path_states(root_dir, dirpath, file_matcher, folder_matcher, blacklisted_folders=(), policy=None):
+    """Состояния правил путей для содержимого папки dirpath внутри root_dir.
+
+    Возвращает (состояния файлов, состояния папок) - то же, что обход
+    накопил бы, дойдя до dirpath от корня, или None, если обход до
+    содержимого dirpath не дошел бы: она лежит вне root_dir, внутри папки
+    из черного списка или сама либо ее предок пропускается политикой policy.
+    """
+    relative = os.path.relpath(dirpath, root_dir)
+    if relative == os.curdir:
+        return (), ()
+    if relative == os.pardir or relative.startswith(os.pardir + os.sep) or os.path.isabs(relative):
+        return None
+    blacklisted_folders = {folder.lower() for folder in blacklisted_folders}
+    track_paths = file_matcher.has_paths or folder_matcher.has_paths
+    file_states = folder_states = ()
+    components = tuple(component.lower() for component in relative.split(os.sep))
+    if policy is not None and policy.path_level(components) is SKIP:
+        return None
+    for name_lower in components:
+        if name_lower in blacklisted_folders:
+            return None
+        if track_paths:
+            folder_states = folder_matcher.step(folder_states, name_lower)[1]
+            file_states = file_matcher.step(file_states, name_lower)[1]
+    return file_states, folder_states
+
+
+def match_path(root_dir, path, file_matcher, folder_matcher, blacklisted_folders=(), analyze_extensions=(),
+               policy=None):
+    """Сопоставить один путь внутри root_dir так же, как это сделал бы scan_tree с политикой policy.
+
+    Возвращает Match или None, если путь не совпал, исчез или лежит в
+    папке из черного списка либо в папке, которую policy не обходит.
+    Нужна для проверки отдельных изменившихся путей.
+    """
+    parent, name = os.path.split(path)
+    states = path_states(root_dir, parent, file_matcher, folder_matcher, blacklisted_folders, policy)
+    if states is None or not name:
+        return None
+    file_states, folder_states = states
+    try:
+        stat_result = os.stat(path, follow_symlinks=False)
+    except OSError:
+        return None
+    name_lower = name.lower()
+    track_paths = file_matcher.has_paths or folder_matcher.has_paths
+    if stat.S_ISDIR(stat_result.st_mode):
+        if name_lower in {folder.lower() for folder in blacklisted_folders}:
+            return None
+        keyword = folder_matcher.search(name_lower)
+        if not keyword and track_paths:
+            keyword = folder_matcher.step(folder_states, name_lower)[0]
+        if keyword:
+            return Match(path, FOLDER, keyword, _is_hidden_path(name, stat_result), 0, 0, root_dir)
+        return None
+    keyword = file_matcher.search(name_lower)
+    if not keyword and track_paths:
+        keyword = file_matcher.step(file_states, name_lower)[0]
+    analyze_extensions = tuple(extension.lower() for extension in analyze_extensions)
+    if keyword or (analyze_extensions and name_lower.endswith(analyze_extensions)):
+        try:
+            # Как и обход, для ссылок на файлы берем размер и время самого файла
+            target = os.stat(path)
+            size, mtime_ns = target.st_size, target.st_mtime_ns
+        except OSError:
+            size, mtime_ns = -1, 0
+        return Match(path, FILE, keyword, _is_hidden_path(name, stat_result), size, mtime_ns, root_dir)
+    return None
+
+
+class WalkProgress:
+    """Счетчик просмотренных элементов, общий для нескольких обходов и читаемый из другого потока."""
+
+    __slots__ = ('entries', '_lock')
+
+    def __init__(self):
+        self.entries = 0
+        self._lock = threading.Lock()
+
+    def add(self, count):
+        with self._lock:
+            self.entries += count
+
+
+def scan_tree(root_dir, file_matcher, folder_matcher, blacklisted_folders=(), progress=None,
+              analyze_extensions=(), start=None, policy=None, stop=None):
+    """Один проход по дереву: совпадения по именам файлов и папок.
+
+    file_matcher и folder_matcher - скомпилированные NameRules; правила путей
+    сопоставляются с компонентами пути относительно root_dir.
+    Папки из черного списка отсекаются вместе с поддеревом прямо во время обхода.
+    Файлы с расширениями из analyze_extensions возвращаются всегда, даже без
+    совпадения по имени (keyword=None), чтобы проверить их содержимое.
+    Совпадения возвращаются по мере нахождения. Если передан progress
+    (WalkProgress), после каждой папки в нем обновляется число элементов.
+    start - необязательная папка внутри root_dir: обходится только ее
+    содержимое, а правила путей по-прежнему считаются от root_dir.
+    policy - необязательная ScanPolicy; без нее обход идет в глубину в
+    порядке листинга. stop - необязательная функция без аргументов: обход
+    прекращается, как только она вернет True; проверяется перед каждой папкой.
+    """
+    states = path_states(root_dir, start, file_matcher, folder_matcher, blacklisted_folders) if start else ((), ())
+    if states is None:
+        return
+    components = ()
+    level = LEVEL_NORMAL
+    if start and policy is not None:
+        components = tuple(component.lower() for component in os.path.relpath(start, root_dir).split(os.sep)
+                           if component != os.curdir)
+        level = policy.path_level(components) if components else LEVEL_NORMAL
+        if level is SKIP:
+            return
+    blacklisted_folders = {folder.lower() for folder in blacklisted_folders}
+    analyze_extensions = tuple(extension.lower() for extension in analyze_extensions)
+
+    track_paths = file_matcher.has_paths or folder_matcher.has_paths
+
+    # Вместе с папкой хранятся состояния правил путей для ее содержимого, а с политикой -
+    # и ее место в очереди: (уровень, глубина, номер) - в куче, без политики - в стеке
+    pending = [(level, len(components), 0, start or root_dir, *states, components)]
+    order = 0
+    while pending:
+        if stop is not None and stop():
+            return
+        if policy is not None:
+            level, depth, _, dirpath, file_states, folder_states, components = heapq.heappop(pending)
+        else:
+            level, depth, _, dirpath, file_states, folder_states, components = pending.pop()
+        files = []
+        count = 0
+        try:
+            with os.scandir(dirpath) as it:
+                for entry in it:
+                    count += 1
+                    name_lower = entry.name.lower()
+                    try:
+                        is_dir = entry.is_dir()
+                    except OSError:
+                        is_dir = False
+
+                    if is_dir:
+                        if name_lower in blacklisted_folders:
+                            continue
+                        keyword = folder_matcher.search(name_lower)
+                        child_file_states = child_folder_states = ()
+                        if track_paths:
+                            path_keyword, child_folder_states = folder_matcher.step(folder_states, name_lower)
+                            keyword = keyword or path_keyword
+                            child_file_states = file_matcher.step(file_states, name_lower)[1]
+                        if keyword:
+                            yield Match(entry.path, FOLDER, keyword, is_hidden_entry(entry), 0, 0, root_dir)
+                        # Как и os.walk, не заходим в символические ссылки на папки
+                        if entry.is_symlink():
+                            continue
+                        order += 1
+                        if policy is None:
+                            pending.append((level, depth + 1, order, entry.path, child_file_states,
+                                            child_folder_states, components))
+                            continue
+                        child_components = components + (name_lower,)
+                        child_level = policy.level(child_components, level, entry)
+                        if child_level is not SKIP:
+                            heapq.heappush(pending, (child_level, depth + 1, order, entry.path, child_file_states,
+                                                     child_folder_states, child_components))
+                    else:
+                        keyword = file_matcher.search(name_lower)
+                        if not keyword and track_paths:
+                            keyword = file_matcher.step(file_states, name_lower)[0]
+                        if keyword or (analyze_extensions and name_lower.endswith(analyze_extensions)):
+                            try:
+                                stat_result = entry.stat()
+                                size, mtime_ns = stat_result.st_size, stat_result.st_mtime_ns
+                            except OSError:
+                                size, mtime_ns = -1, 0
+                            match = Match(entry.path, FILE, keyword, is_hidden_entry(entry), size, mtime_ns, root_dir)
+                            if policy is None:
+                                yield match
+                            else:
+                                files.append(match)
+        except OSError as e:
+            logger.debug(f"Пропущена папка {dirpath}: {e}")
+        if files:
+            files.sort(key=lambda match: match.mtime_ns, reverse=True)
+            yield from files
+        if progress is not None:
+            progress.add(count)
@@ -0,0 +1,437 @@
+import os
+import sys
+import time
+import errno
+import select
+import struct
+import logging
+from collections import namedtuple
+
+from .walker import SKIP
+
+logger = logging.getLogger(__name__)
+
+# Событие наблюдения: 'added', 'removed' или 'changed' и находка (для 'removed' - прежняя)
+WatchEvent = namedtuple('WatchEvent', ['action', 'finding'])
+
+QUIET_SECONDS = 0.5  # Пауза без событий, после которой пачка изменений проверяется
+MAX_DELAY_SECONDS = 5.0  # Дольше пачка не копится даже при непрерывной записи
+MAX_BATCH_PATHS = 256  # Пачка с большим числом путей сворачивается до общих папок
+POLL_INTERVAL = 2.0  # Период опроса дерева, когда уведомления недоступны
+WAIT_SECONDS = 0.5  # Как часто цикл наблюдения проверяет флаг отмены
+
+# Флаги inotify из <sys/inotify.h>
+IN_CLOSE_WRITE = 0x00000008
+IN_MOVED_FROM = 0x00000040
+IN_MOVED_TO = 0x00000080
+IN_CREATE = 0x00000100
+IN_DELETE = 0x00000200
+IN_DELETE_SELF = 0x00000400
+IN_MOVE_SELF = 0x00000800
+IN_Q_OVERFLOW = 0x00004000
+IN_IGNORED = 0x00008000
+IN_ONLYDIR = 0x01000000
+IN_ISDIR = 0x40000000
+IN_NONBLOCK = 0o4000
+IN_CLOEXEC = 0o2000000
+
+# Файл интересен после закрытия на запись, а не на каждый write: запись сборки модов дает одно событие на файл
+_WATCH_MASK = (IN_CLOSE_WRITE | IN_MOVED_FROM | IN_MOVED_TO | IN_CREATE | IN_DELETE | IN_DELETE_SELF
+               | IN_MOVE_SELF | IN_ONLYDIR)
+_EVENT = struct.Struct('iIII')
+_READ_SIZE = 64 * 1024
+
+
+def _is_under(path, paths):
+    """Лежит ли path в одном из paths (или совпадает с ним)."""
+    while True:
+        if path in paths:
+            return True
+        parent = os.path.dirname(path)
+        if parent == path:
+            return False
+        path = parent
+
+
+def _skipped(policy, roots, path):
+    """Не обходит ли политика папку path (или одного из ее предков внутри корня)."""
+    if policy is None:
+        return False
+    for root_dir in roots:
+        if path != root_dir and _is_under(path, {root_dir}):
+            components = tuple(component.lower() for component in os.path.relpath(path, root_dir).split(os.sep))
+            return policy.path_level(components) is SKIP
+    return False
+
+
+class InotifyWatcher:
+    """Наблюдение через inotify (Linux): по наблюдению на каждую папку под корнями.
+
+    Работает через ctypes, без сторонних пакетов. Новые папки берутся под
+    наблюдение по мере появления, переименованные и удаленные снимаются.
+    При переполнении очереди ядра возвращаются сами корни: их проверят целиком.
+    Папки, которые не обходит policy (ScanPolicy), под наблюдение не берутся.
+    """
+
+    def __init__(self, roots, blacklisted_folders=(), policy=None):
+        import ctypes
+        self._ctypes = ctypes
+        self._libc = ctypes.CDLL(None, use_errno=True)
+        if not hasattr(self._libc, 'inotify_init1'):
+            raise OSError(errno.ENOSYS, "inotify недоступен")
+        self.roots = list(roots)
+        self._blacklisted = {folder.lower() for folder in blacklisted_folders}
+        self._policy = policy
+        self._paths = {}  # дескриптор наблюдения -> папка
+        self._descriptors = {}  # папка -> дескриптор наблюдения
+        self._fd = self._libc.inotify_init1(IN_NONBLOCK | IN_CLOEXEC)
+        if self._fd < 0:
+            error = ctypes.get_errno()
+            raise OSError(error, os.strerror(error))
+        try:
+            for root_dir in self.roots:
+                self._add_tree(root_dir)
+        except OSError:
+            self.close()
+            raise
+        logger.info(f"inotify: наблюдений {len(self._paths)}")
+
+    def _add_tree(self, top):
+        stack = [top]
+        while stack:
+            dirpath = stack.pop()
+            if _skipped(self._policy, self.roots, dirpath):
+                continue
+            descriptor = self._libc.inotify_add_watch(self._fd, os.fsencode(dirpath), _WATCH_MASK)
+            if descriptor < 0:
+                error = self._ctypes.get_errno()
+                if error == errno.ENOSPC:
+                    raise OSError(error, "исчерпан лимит наблюдений inotify (fs.inotify.max_user_watches)")
+                logger.debug(f"Наблюдение за {dirpath} не поставлено: {os.strerror(error)}")
+                continue
+            self._paths[descriptor] = dirpath
+            self._descriptors[dirpath] = descriptor
+            try:
+                with os.scandir(dirpath) as it:
+                    for entry in it:
+                        if entry.is_dir(follow_symlinks=False) and entry.name.lower() not in self._blacklisted:
+                            stack.append(entry.path)
+            except OSError as e:
+                logger.debug(f"Пропущена папка {dirpath}: {e}")
+
+    def _remove_tree(self, top):
+        for dirpath in [dirpath for dirpath in self._descriptors if _is_under(dirpath, {top})]:
+            descriptor = self._descriptors.pop(dirpath)
+            self._paths.pop(descriptor, None)
+            self._libc.inotify_rm_watch(self._fd, descriptor)
+
+    def read(self, timeout):
+        """Пути, изменившиеся за время ожидания (не дольше timeout секунд)."""
+        ready, _, _ = select.select([self._fd], [], [], timeout)
+        if not ready:
+            return []
+        changed = []
+        while True:
+            try:
+                data = os.read(self._fd, _READ_SIZE)
+            except BlockingIOError:
+                break
+            offset = 0
+            while offset + _EVENT.size <= len(data):
+                descriptor, mask, _, length = _EVENT.unpack_from(data, offset)
+                offset += _EVENT.size
+                name = os.fsdecode(data[offset:offset + length].rstrip(b'\0'))
+                offset += length
+                changed.extend(self._handle(descriptor, mask, name))
+        return changed
+
+    def _handle(self, descriptor, mask, name):
+        if mask & IN_Q_OVERFLOW:
+            logger.warning("Очередь inotify переполнена, папки будут проверены заново")
+            return self.roots
+        directory = self._paths.get(descriptor)
+        if directory is None:
+            return ()
+        if mask & IN_IGNORED:
+            # Ядро сняло наблюдение: папка удалена
+            del self._paths[descriptor]
+            if self._descriptors.get(directory) == descriptor:
+                del self._descriptors[directory]
+            return ()
+        if mask & (IN_DELETE_SELF | IN_MOVE_SELF):
+            # О самой папке сообщит наблюдение родителя
+            return ()
+        path = os.path.join(directory, name) if name else directory
+        if mask & IN_ISDIR:
+            if mask & IN_MOVED_FROM:
+                self._remove_tree(path)
+            elif mask & (IN_CREATE | IN_MOVED_TO) and name.lower() not in self._blacklisted:
+                try:
+                    self._add_tree(path)
+                except OSError as e:
+                    logger.error(f"Ошибка наблюдения за {path}: {e}")
+        return (path,)
+
+    def close(self):
+        if self._fd >= 0:
+            os.close(self._fd)
+            self._fd = -1
+
+
+class PollingWatcher:
+    """Запасное наблюдение без уведомлений: периодическое сравнение снимков дерева.
+
+    Папка перечитывается, только если изменилось ее время изменения (оно
+    меняется при создании, удалении и переименовании записей). Время и
+    размер сверяются только у файлов, для имени которых track возвращает
+    истину: изменение содержимого остальных файлов на проверку не влияет.
+    Папки, которые не обходит policy (ScanPolicy), не опрашиваются.
+    """
+
+    def __init__(self, roots, blacklisted_folders=(), interval=POLL_INTERVAL, track=None, policy=None):
+        self.roots = list(roots)
+        self.interval = interval
+        self._blacklisted = {folder.lower() for folder in blacklisted_folders}
+        self._policy = policy
+        self._track = track or (lambda name: True)
+        self._dirs = {}  # папка -> (mtime_ns, {имя: (папка ли, (mtime_ns, size) или None)})
+        for root_dir in self.roots:
+            self._add_tree(root_dir)
+        self._next_poll = time.monotonic() + interval
+        logger.info(f"Опрос изменений: папок {len(self._dirs)}, раз в {interval} с")
+
+    def _list(self, dirpath):
+        entries = {}
+        with os.scandir(dirpath) as it:
+            for entry in it:
+                try:
+                    if entry.is_dir(follow_symlinks=False):
+                        if entry.name.lower() not in self._blacklisted:
+                            entries[entry.name] = (True, None)
+                    elif self._track(entry.name):
+                        stat_result = entry.stat()
+                        entries[entry.name] = (False, (stat_result.st_mtime_ns, stat_result.st_size))
+                    else:
+                        entries[entry.name] = (False, None)
+                except OSError:
+                    entries[entry.name] = (False, None)
+        return entries
+
+    def _add_tree(self, top):
+        stack = [top]
+        while stack:
+            dirpath = stack.pop()
+            if _skipped(self._policy, self.roots, dirpath):
+                continue
+            try:
+                mtime_ns = os.stat(dirpath).st_mtime_ns
+                entries = self._list(dirpath)
+            except OSError as e:
+                logger.debug(f"Пропущена папка {dirpath}: {e}")
+                continue
+            self._dirs[dirpath] = (mtime_ns, entries)
+            stack.extend(os.path.join(dirpath, name) for name, (is_dir, _) in entries.items() if is_dir)
+
+    def _remove_tree(self, top):
+        for dirpath in [dirpath for dirpath in self._dirs if _is_under(dirpath, {top})]:
+            del self._dirs[dirpath]
+
+    def read(self, timeout):
+        """Пути, изменившиеся с прошлого опроса; ждет до следующего опроса не дольше timeout секунд."""
+        wait = self._next_poll - time.monotonic()
+        if wait > timeout:
+            time.sleep(timeout)
+            return []
+        if wait > 0:
+            time.sleep(wait)
+        self._next_poll = time.monotonic() + self.interval
+        changed = []
+        for dirpath in list(self._dirs):
+            snapshot = self._dirs.get(dirpath)
+            if snapshot is None:
+                continue
+            mtime_ns, entries = snapshot
+            try:
+                current_mtime = os.stat(dirpath).st_mtime_ns
+            except OSError:
+                # Об исчезнувшей папке сообщит ее родитель
+                continue
+            if current_mtime == mtime_ns:
+                for name, (is_dir, signature) in entries.items():
+                    if signature is None:
+                        continue
+                    path = os.path.join(dirpath, name)
+                    try:
+                        stat_result = os.stat(path)
+                    except OSError:
+                        continue
+                    current = (stat_result.st_mtime_ns, stat_result.st_size)
+                    if current != signature:
+                        entries[name] = (is_dir, current)
+                        changed.append(path)
+                continue
+            try:
+                current_entries = self._list(dirpath)
+            except OSError:
+                continue
+            self._dirs[dirpath] = (current_mtime, current_entries)
+            for name in entries.keys() | current_entries.keys():
+                before, after = entries.get(name), current_entries.get(name)
+                if before == after:
+                    continue
+                path = os.path.join(dirpath, name)
+                changed.append(path)
+                if before is not None and before[0]:
+                    self._remove_tree(path)
+                if after is not None and after[0]:
+                    self._add_tree(path)
+        return changed
+
+    def close(self):
+        self._dirs.clear()
+
+
+def open_watcher(roots, blacklisted_folders=(), track=None, polling=False, policy=None):
+    """Наблюдение за деревьями roots: inotify там, где он есть, иначе опрос."""
+    if not polling and sys.platform.startswith('linux'):
+        try:
+            return InotifyWatcher(roots, blacklisted_folders, policy)
+        except OSError as e:
+            logger.error(f"inotify недоступен, изменения будут отслеживаться опросом: {e}")
+    return PollingWatcher(roots, blacklisted_folders, track=track, policy=policy)
+
+
+class Coalescer:
+    """Собирает изменившиеся пути в пачки: ждет паузы в событиях, но не дольше max_delay.
+
+    Повторные события одного пути схлопываются, пути внутри попавшей в
+    пачку папки отбрасываются. Если путей больше max_paths (установка
+    сборки модов, распаковка архива), они сворачиваются до родительских
+    папок (не выше roots), которые затем проверяются целиком.
+    """
+
+    def __init__(self, roots=(), quiet=QUIET_SECONDS, max_delay=MAX_DELAY_SECONDS, max_paths=MAX_BATCH_PATHS,
+                 clock=time.monotonic):
+        self.roots = set(roots)
+        self.quiet = quiet
+        self.max_delay = max_delay
+        self.max_paths = max_paths
+        self._clock = clock
+        self._pending = set()
+        self._first = None
+        self._last = None
+        self.events = 0
+
+    def add(self, paths):
+        if not paths:
+            return
+        now = self._clock()
+        if self._first is None:
+            self._first = now
+        self._last = now
+        self._pending.update(paths)
+        self.events += len(paths)
+
+    def timeout(self):
+        """Сколько секунд осталось до готовности пачки; None, если она пуста."""
+        if not self._pending:
+            return None
+        deadline = min(self._last + self.quiet, self._first + self.max_delay)
+        return max(0.0, deadline - self._clock())
+
+    def ready(self):
+        return self.timeout() == 0.0
+
+    def take(self):
+        """Забрать пачку: отсортированный список путей без вложенных друг в друга."""
+        paths = self._collapse(self._pending)
+        while len(paths) > self.max_paths:
+            parents = {path if path in self.roots else os.path.dirname(path) for path in paths}
+            if len(parents) == len(paths):
+                break
+            paths = self._collapse(parents)
+        logger.debug(f"Пачка изменений: событий {self.events}, путей {len(paths)}")
+        self._pending = set()
+        self._first = self._last = None
+        self.events = 0
+        return paths
+
+    @staticmethod
+    def _collapse(paths):
+        return sorted(path for path in paths
+                      if os.path.dirname(path) == path or not _is_under(os.path.dirname(path), paths))
+
+
+class WatchSession:
+    """Наблюдение за корнями после полной проверки с находками в памяти.
+
+    start() проверяет корни целиком и запоминает находки, watch() ждет
+    изменений и перепроверяет только изменившиеся пути, возвращая
+    разницу с тем, что было известно: новые, исчезнувшие и сменившие
+    вердикт находки. Наблюдение ставится до полной проверки, поэтому
+    изменения во время нее не теряются.
+    """
+
+    def __init__(self, scanner, roots, watcher=None, coalescer=None, polling=False):
+        self.scanner = scanner
+        self.roots = list(roots)
+        self.findings = {}  # путь -> Finding
+        self.coalescer = coalescer or Coalescer(self.roots)
+        self._watcher = watcher
+        self._polling = polling
+
+    def _track(self, name):
+        name = name.lower()
+        return bool(self.scanner.file_matcher.search(name)) or name.endswith(tuple(self.scanner.analyze_extensions))
+
+    def start(self, cancel=None, progress=None):
+        """Полная проверка, с которой начинается наблюдение. Находки возвращаются по мере готовности."""
+        if self._watcher is None:
+            self._watcher = open_watcher(self.roots, self.scanner.blacklisted_folders, self._track, self._polling,
+                                         self.scanner.policy)
+        for finding in self.scanner.scan_roots(self.roots, cancel, progress):
+            self.findings[finding.path] = finding
+            yield finding
+
+    def watch(self, cancel):
+        """Списки WatchEvent по мере изменений, пока не установлен cancel (threading.Event)."""
+        while not cancel.is_set():
+            timeout = self.coalescer.timeout()
+            self.coalescer.add(self._watcher.read(WAIT_SECONDS if timeout is None else min(timeout, WAIT_SECONDS)))
+            if self.coalescer.ready():
+                events = self.apply(self.coalescer.take(), cancel)
+                if events:
+                    yield events
+
+    def _root_of(self, path):
+        for root_dir in self.roots:
+            if _is_under(path, {root_dir}):
+                return root_dir
+        return None
+
+    def apply(self, paths, cancel=None):
+        """Перепроверить пути (файлы и папки целиком) и обновить находки. Возвращает список WatchEvent."""
+        paths = set(paths)
+        changes = [(self._root_of(path), path) for path in paths]
+        changes = [(root_dir, path) for root_dir, path in changes if root_dir is not None]
+        if not changes:
+            return []
+        fresh = {finding.path: finding for finding in self.scanner.scan_changes(changes, cancel)}
+        if cancel is not None and cancel.is_set():
+            # Проверка прервана: неполный результат не должен выглядеть как исчезнувшие находки
+            return []
+        events = []
+        for path, finding in fresh.items():
+            before = self.findings.get(path)
+            if before is None:
+                events.append(WatchEvent('added', finding))
+            elif before.verdict != finding.verdict or before.keyword != finding.keyword:
+                events.append(WatchEvent('changed', finding))
+            self.findings[path] = finding
+        for path in [path for path in self.findings if path not in fresh and _is_under(path, paths)]:
+            events.append(WatchEvent('removed', self.findings.pop(path)))
+        return events
+
+    def close(self):
+        if self._watcher is not None:
+            self._watcher.close()
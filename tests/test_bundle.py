@@ -0,0 +1,74 @@
+import os
+
+import pytest
+
+from filefinder.aggregate import FleetReport, SpaceSaving
+from filefinder.bundle import BundleError, read_bundle, write_bundle
+from filefinder.pipeline import Finding
+from filefinder.walker import FILE
+
+KEY = b'test-key'
+
+
+def write(tmp_path, name='pc.ffb', verdict='baritone'):
+    root = str(tmp_path / '.minecraft')
+    os.makedirs(os.path.join(root, 'mods'), exist_ok=True)
+    path = os.path.join(root, 'mods', 'x.jar')
+    with open(path, 'wb') as file:
+        file.write(b'jar bytes')
+    finding = Finding(path, FILE, None, False, verdict, root)
+    return write_bundle(str(tmp_path / name), KEY, [finding], [root], 'v1', 1.5, machine='pc', release='2026.10')
+
+
+def test_roundtrip(tmp_path):
+    bundle = read_bundle(write(tmp_path), KEY)
+    assert bundle.machine == 'pc'
+    assert (bundle.signature_version, bundle.signature_release) == ('v1', '2026.10')
+    [finding] = bundle.findings
+    assert finding.path == '.minecraft/mods/x.jar'
+    assert finding.verdict == 'baritone'
+    assert len(finding.digest) == 32
+
+
+def test_tampered_bundle_rejected(tmp_path):
+    path = write(tmp_path)
+    with open(path, 'r+b') as file:
+        file.seek(-1, os.SEEK_END)
+        last = file.read(1)
+        file.seek(-1, os.SEEK_END)
+        file.write(bytes([last[0] ^ 1]))
+    with pytest.raises(BundleError):
+        read_bundle(path, KEY)
+
+
+def test_wrong_key_rejected(tmp_path):
+    with pytest.raises(BundleError):
+        read_bundle(write(tmp_path), b'other-key')
+
+
+def test_fleet_report_skips_rejected(tmp_path):
+    write(tmp_path, 'a.ffb')
+    write(tmp_path, 'b.ffb')
+    with open(tmp_path / 'c.ffb', 'wb') as file:
+        file.write(b'garbage')
+    report = FleetReport().add_directory(str(tmp_path), KEY)
+    summary = report.summary()
+    assert (summary['bundles'], summary['rejected'], summary['machines_with_cheats']) == (2, 1, 2)
+    assert summary['top_cheat_hashes'][0]['machines'] == 2
+
+
+def test_space_saving_keeps_heavy_hitters():
+    counter = SpaceSaving(capacity=10)
+    for number in range(2000):
+        counter.add('hot' if number % 3 == 0 else f"cold{number}")
+    top = counter.top(1)[0]
+    assert top.item == 'hot'
+    assert top.count - top.error <= 667 <= top.count
+    assert len(counter) == 10
+
+
+def test_finding_digest_used_without_reading(tmp_path):
+    root = str(tmp_path / '.minecraft')
+    finding = Finding(os.path.join(root, 'mods', 'gone.jar'), FILE, 'xray', False, None, root, 'ab' * 16)
+    path = write_bundle(str(tmp_path / 'pc.ffb'), KEY, [finding], [root], 'v1', 1.0, machine='pc')
+    assert read_bundle(path, KEY).findings[0].digest == 'ab' * 16
@@ -0,0 +1,55 @@
+import json
+import zipfile
+
+from filefinder.cli import EXIT_CHEATS, EXIT_CLEAN, EXIT_ERROR, main
+
+OPTIONS = ['--no-index', '--no-history', '-p', '0', '-w', '2']
+
+
+def run(capsys, *argv):
+    code = main(['scan', *argv, *OPTIONS])
+    return code, capsys.readouterr().out
+
+
+def records(out):
+    return [json.loads(line) for line in out.splitlines()]
+
+
+def test_clean_tree_exits_zero(tmp_path, capsys):
+    (tmp_path / 'mods').mkdir()
+    (tmp_path / 'mods' / 'sodium.txt').write_bytes(b'clean')
+    assert run(capsys, str(tmp_path)) == (EXIT_CLEAN, '')
+
+
+def test_name_match_without_verdict_is_not_a_cheat(tmp_path, capsys):
+    (tmp_path / 'xray.txt').write_bytes(b'clean')
+    code, out = run(capsys, str(tmp_path))
+    [record] = records(out)
+    assert code == EXIT_CLEAN
+    assert (record['keyword'], record['verdict'], record['cheat']) == ('xray', None, False)
+    assert record['root'] == str(tmp_path)
+
+
+def test_cheat_is_reported_as_ndjson(tmp_path, capsys):
+    with zipfile.ZipFile(tmp_path / 'mod.jar', 'w') as jar:
+        jar.writestr('a/KillAura.class', b'x')
+    code, out = run(capsys, str(tmp_path))
+    [record] = records(out)
+    assert code == EXIT_CHEATS
+    assert record['path'] == str(tmp_path / 'mod.jar')
+    assert (record['verdict'], record['cheat']) == ('killaura', True)
+
+
+def test_json_format_is_one_document(tmp_path, capsys):
+    (tmp_path / 'xray.txt').write_bytes(b'clean')
+    code, out = run(capsys, str(tmp_path), '-f', 'json')
+    report = json.loads(out)
+    assert code == EXIT_CLEAN
+    assert report['roots'] == [str(tmp_path)] and len(report['findings']) == 1
+
+
+def test_missing_root_is_an_error(tmp_path, capsys):
+    (tmp_path / 'xray.txt').write_bytes(b'clean')
+    code, out = run(capsys, str(tmp_path), str(tmp_path / 'missing'))
+    assert code == EXIT_ERROR
+    assert len(records(out)) == 1
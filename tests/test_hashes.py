@@ -0,0 +1,39 @@
+from filefinder.content import file_digest
+from filefinder.hashes import DigestSet, parse_digests
+from tests.test_pipeline import make_scanner, scan, write
+
+
+def test_digest_set_lookup_and_fingerprint():
+    digests = [bytes([number]) * 16 for number in (3, 1, 2, 1)]
+    known = DigestSet(digests)
+    assert len(known) == 3
+    assert bytes([2]) * 16 in known and bytes([4]) * 16 not in known
+    assert known.fingerprint == DigestSet(reversed(digests)).fingerprint
+    assert not DigestSet()
+
+
+def test_parse_digests_skips_comments_and_bad_lines():
+    lines = ['# known good', f"{'ab' * 16}  # sodium.jar", 'not hex', 'abcd', '']
+    assert parse_digests(lines, 'list.txt') == [bytes.fromhex('ab' * 16)]
+
+
+def test_known_lists_decide_without_analysis(tmp_path):
+    cheat = write(str(tmp_path / 'mods' / 'xray-a.txt'), b'renamed cheat, no signature')
+    good = write(str(tmp_path / 'mods' / 'xray-b.txt'), b'whitelisted baritone docs')
+    scanner = make_scanner(known_good=DigestSet([file_digest(good)]), known_cheat=DigestSet([file_digest(cheat)]))
+    assert scan(scanner, tmp_path) == {
+        'mods/xray-a.txt': f"hash:{file_digest(cheat).hex()}",
+        'mods/xray-b.txt': None,
+    }
+    counters = scanner.metrics.summary()['counters']
+    assert (counters['known_cheat'], counters['known_good']) == (1, 1)
+    assert scanner.metrics.tasks['analyze'] == 0
+
+
+def test_duplicates_analyzed_once(tmp_path):
+    for name in ('xray-a.txt', 'xray-b.txt', 'xray-c.txt'):
+        write(str(tmp_path / name), b'uses baritone')
+    scanner = make_scanner()
+    assert set(scan(scanner, tmp_path).values()) == {'baritone'}
+    assert scanner.metrics.tasks['analyze'] == 1
+    assert scanner.metrics.summary()['counters']['duplicates'] == 2
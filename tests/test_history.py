@@ -0,0 +1,73 @@
+import sqlite3
+
+from filefinder.history import HistoryStore, open_history
+from filefinder.pipeline import Finding
+from filefinder.walker import FILE, FOLDER
+
+
+def finding(path, verdict=None, kind=FILE):
+    return Finding(path, kind, 'xray', False, verdict, '/game')
+
+
+def record(store, findings, cancelled=False):
+    return store.record('2026-10-18 10:00:00', '2026-10-18 10:01:00', 60.0, 'v1', ['/game'], findings,
+                        cancelled=cancelled, release='2026.10')
+
+
+def test_runs_and_findings_are_paged(tmp_path):
+    store = HistoryStore(str(tmp_path / 'history.sqlite3'))
+    ids = [record(store, [finding(f"/game/{run}/{number}") for number in range(5)]) for run in range(7)]
+    assert store.count() == 7
+    first = store.runs(limit=3)
+    second = store.runs(first[-1].id, limit=3)
+    last = store.runs(second[-1].id, limit=3)
+    assert [run.id for run in first + second + last] == ids[::-1]
+    assert first[0].roots == ['/game'] and first[0].signature_release == '2026.10'
+    page = store.findings(ids[0], offset=2, limit=2)
+    assert [stored.path for stored in page] == ['/game/0/2', '/game/0/3']
+    store.close()
+
+
+def test_counts_and_changes_skip_cancelled_runs(tmp_path):
+    store = HistoryStore(str(tmp_path / 'history.sqlite3'))
+    base = record(store, [finding('/game/a.jar'), finding('/game/b.jar', 'baritone'), finding('/game/hacks', kind=FOLDER)])
+    record(store, [], cancelled=True)
+    latest = record(store, [finding('/game/a.jar', 'xray'), finding('/game/c.jar')])
+    run = store.run(base)
+    assert (run.files, run.folders, run.cheats) == (2, 1, 1)
+    changes = store.changes(latest)
+    assert changes.previous_id == base
+    assert [stored.path for stored in changes.added] == ['/game/c.jar']
+    assert [stored.path for stored in changes.removed] == ['/game/b.jar', '/game/hacks']
+    assert [(stored.path, stored.verdict) for stored in changes.changed] == [('/game/a.jar', 'xray')]
+    store.close()
+
+
+def test_old_journal_gets_release_column(tmp_path):
+    path = str(tmp_path / 'history.sqlite3')
+    conn = sqlite3.connect(path)
+    conn.execute("CREATE TABLE runs (id INTEGER PRIMARY KEY AUTOINCREMENT, started TEXT NOT NULL, "
+                 "finished TEXT NOT NULL, seconds REAL NOT NULL, signature_version TEXT, roots TEXT NOT NULL, "
+                 "files INTEGER NOT NULL, folders INTEGER NOT NULL, cheats INTEGER NOT NULL, "
+                 "cancelled INTEGER NOT NULL, metrics TEXT)")
+    conn.commit()
+    conn.close()
+    store = HistoryStore(path)
+    assert store.run(record(store, [])).signature_release == '2026.10'
+    store.close()
+
+
+def test_text_history_imported_once(tmp_path):
+    legacy = tmp_path / 'check_history.txt'
+    legacy.write_text("Запусков: 4\nПоследний запуск: 2026-01-02 03:04:05\nОбнаружено файлов: 3\n"
+                      "Обнаружено папок: 1\nОбнаружено читов: 2\nВремя проверки: 1.00 с\n", encoding='utf-8')
+    store = open_history(str(tmp_path / 'history.sqlite3'), str(legacy))
+    [run] = store.runs()
+    assert (run.started, run.files, run.folders, run.cheats, run.roots, run.cancelled) == (
+        '2026-01-02 03:04:05', 3, 1, 2, [], True)
+    assert not legacy.exists() and (tmp_path / 'check_history.txt.imported').exists()
+    store.close()
+    store = open_history(str(tmp_path / 'history.sqlite3'), str(legacy))
+    assert store.count() == 1
+    assert store.changes(record(store, [finding('/game/a.jar')])).previous_id is None
+    store.close()
@@ -0,0 +1,57 @@
+import io
+import zipfile
+
+from filefinder.jar import InflateBudget, JarInspector
+from filefinder.matcher import KeywordMatcher
+from filefinder.rules import NameRules
+
+
+def jar_bytes(members):
+    buffer = io.BytesIO()
+    with zipfile.ZipFile(buffer, 'w', zipfile.ZIP_DEFLATED) as jar:
+        for name, data in members.items():
+            jar.writestr(name, data)
+    return buffer.getvalue()
+
+
+def write_jar(tmp_path, members):
+    path = tmp_path / 'mod.jar'
+    path.write_bytes(jar_bytes(members))
+    return str(path)
+
+
+def inspector(**kwargs):
+    return JarInspector(NameRules(['killaura']), KeywordMatcher(['baritone'], chunks=True), **kwargs)
+
+
+def nested(depth, members):
+    for level in range(depth):
+        members = {f"META-INF/jars/level{level}.jar": jar_bytes(members), 'fabric.mod.json': b'{}'}
+    return members
+
+
+def test_member_names_found_in_nested_jars(tmp_path):
+    path = write_jar(tmp_path, nested(2, {'a/KillAura.class': b'x'}))
+    assert inspector().inspect(path) == 'killaura'
+
+
+def test_nested_content_respects_depth_limit(tmp_path):
+    path = write_jar(tmp_path, nested(2, {'baritone.txt': b'x', 'fabric.mod.json': b'{"id": "baritone"}'}))
+    assert inspector().inspect(path) == 'baritone'
+    assert inspector(max_depth=1).inspect(path) is None
+
+
+def test_metadata_checked_before_classes(tmp_path):
+    path = write_jar(tmp_path, {'fabric.mod.json': b'{"id": "baritone"}', 'net/example/Mod.class': b'clean'})
+    assert inspector().inspect(path) == 'baritone'
+
+
+def test_nested_jar_over_budget_is_skipped(tmp_path):
+    inner = jar_bytes({'fabric.mod.json': b'{"id": "baritone"}' + b' ' * 4096})
+    path = write_jar(tmp_path, {'META-INF/jars/inner.jar': inner, 'fabric.mod.json': b'{}'})
+    budget = InflateBudget(len(inner) - 1)
+    assert inspector().inspect(path, budget) is None
+    assert budget.exhausted
+    budget = InflateBudget(1 << 20)
+    assert inspector().inspect(path, budget) == 'baritone'
+    assert not budget.exhausted and budget.used >= len(inner)
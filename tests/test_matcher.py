@@ -0,0 +1,69 @@
+import io
+import pickle
+
+from filefinder.classfile import scan_class
+from filefinder.matcher import KeywordMatcher
+
+
+def test_search_case_insensitive_str_and_bytes():
+    matcher = KeywordMatcher(['Baritone', 'xray'])
+    assert matcher.search('MyBARITONEmod') == 'baritone'
+    assert matcher.search(b'..XRAY..') == 'xray'
+    assert matcher.search('clean') is None
+
+
+def test_feed_carries_state_across_chunks():
+    matcher = KeywordMatcher(['killaura'])
+    signature, state = matcher.feed(b'xxkill')
+    assert signature is None
+    assert matcher.feed(b'auraxx', state)[0] == 'killaura'
+
+
+def test_findall_overlapping():
+    matcher = KeywordMatcher(['he', 'she', 'hers'])
+    assert matcher.findall('ushers') == ['she', 'he', 'hers']
+
+
+def test_search_chunk_finds_across_boundaries():
+    matcher = KeywordMatcher(['killaura', 'esp', 'Baritone'])
+    data = b'x' * 100 + b'KillAura' + b'y' * 100
+    for size in (1, 3, 7, 50, len(data)):
+        signature, tail = None, b''
+        for start in range(0, len(data), size):
+            signature, tail = matcher.search_chunk(memoryview(data)[start:start + size], tail)
+            if signature:
+                break
+        assert signature == 'killaura', size
+
+
+def test_search_chunk_agrees_with_automaton():
+    matcher = KeywordMatcher(['he', 'hers', 'his', 'she', 'x-ray', 'класс'])
+    for text in ['ushers', 'HIS', 'no match', 'an X-RAY mod', 'мой класс', 'h e']:
+        data = text.encode('utf-8')
+        assert (matcher.search_chunk(data)[0] is None) == (matcher.search(data) is None), text
+
+
+def test_search_chunk_empty_matcher():
+    assert KeywordMatcher([]).search_chunk(b'anything') == (None, b'')
+
+
+def class_file(*strings):
+    pool = b''.join(b'\x01' + len(data).to_bytes(2, 'big') + data for data in strings)
+    return b'\xca\xfe\xba\xbe\x00\x00\x00\x34' + (len(strings) + 1).to_bytes(2, 'big') + pool + b'\x00' * 8
+
+
+def test_scan_class_checks_each_constant_separately():
+    matcher = KeywordMatcher(['killaura'])
+    assert scan_class(io.BytesIO(class_file(b'net/KillAura', b'x')), matcher) == 'killaura'
+    assert scan_class(io.BytesIO(class_file(b'kill', b'aura')), matcher) is None
+
+
+def test_pickle_keeps_only_what_is_built():
+    content = pickle.loads(pickle.dumps(KeywordMatcher(['Baritone', 'xray'], chunks=True)))
+    assert content._tables is None and content._source
+    assert content.search_chunk(b'.. XRAY ..')[0] == 'xray'
+    assert content.search('baritone') == 'baritone'
+    names = pickle.loads(pickle.dumps(KeywordMatcher(['killaura'])))
+    assert names._tables is not None and names._source is None
+    assert names.search('KillAura.jar') == 'killaura'
+    assert names.search_chunk(b'killaura')[0] == 'killaura'
@@ -0,0 +1,64 @@
+import os
+
+import pytest
+
+from filefinder.metrics import SLOWEST_FILES, Profiler, ScanMetrics, format_summary
+
+
+def test_summary_totals_and_slowest_files():
+    metrics = ScanMetrics()
+    for number in range(SLOWEST_FILES + 5):
+        metrics.add_stage('analyze', number / 10, number / 20, f"file{number}")
+    metrics.add_stage('walk', 1.0, 0.5)
+    metrics.add_bytes(read=100, inflated=300)
+    metrics.count('index_hits', 3)
+    metrics.count('index_misses')
+    metrics.finish(files_walked=42)
+    summary = metrics.summary()
+    assert summary['files_walked'] == 42
+    assert (summary['bytes_read'], summary['bytes_inflated']) == (100, 300)
+    assert summary['stages']['analyze']['tasks'] == SLOWEST_FILES + 5
+    assert summary['stages']['walk'] == {'wall_seconds': 1.0, 'cpu_seconds': 0.5, 'tasks': 1}
+    assert summary['index_hit_rate'] == 0.75
+    slowest = [item['path'] for item in summary['slowest']]
+    assert slowest == [f"file{number}" for number in range(SLOWEST_FILES + 4, 4, -1)]
+    assert metrics.summary()['wall_seconds'] == summary['wall_seconds']
+
+
+def test_first_verdict_and_stop_reason_keep_the_first():
+    metrics = ScanMetrics()
+    assert metrics.summary()['first_verdict_seconds'] is None
+    metrics.mark_verdict()
+    first = metrics.first_verdict
+    metrics.mark_verdict()
+    metrics.stop('cheat_limit')
+    metrics.stop('cancelled')
+    assert metrics.first_verdict == first
+    assert metrics.summary()['stop_reason'] == 'cheat_limit'
+
+
+def test_format_summary_reads_stored_dict():
+    metrics = ScanMetrics()
+    metrics.add_stage('analyze', 2.5, 1.0, 'mods/slow.jar')
+    metrics.count('duplicates', 2)
+    metrics.stop('time_budget')
+    metrics.finish(files_walked=7)
+    text = format_summary(metrics.summary())
+    assert "Просмотрено элементов: 7" in text
+    assert "повторов 2" in text
+    assert "истекло отведенное время" in text
+    assert "2.50 с - mods/slow.jar" in text
+    assert "Индекс проверки" not in text
+
+
+def test_profiler_rejects_unknown_mode(tmp_path):
+    with pytest.raises(ValueError):
+        Profiler('perf', str(tmp_path))
+
+
+def test_cprofile_merges_thread_profiles(tmp_path):
+    profiler = Profiler('cprofile', str(tmp_path)).start()
+    assert profiler.wrap(sum)([1, 2]) == 3
+    profile = profiler.stop()
+    assert profile['mode'] == 'cprofile'
+    assert os.path.exists(profile['report']) and os.path.exists(profile['pstats'])
@@ -0,0 +1,180 @@
+import os
+import zipfile
+import threading
+
+from filefinder.analysis import Analyzer
+from filefinder.content import file_digest
+from filefinder.index import ScanIndex
+from filefinder.matcher import KeywordMatcher
+from filefinder.pipeline import Scanner
+from filefinder.rules import NameRules
+from filefinder.walker import ScanPolicy, WalkProgress
+from tests.test_matcher import class_file
+
+
+def make_scanner(index=None, **kwargs):
+    analyzer = Analyzer(NameRules(['killaura']), KeywordMatcher(['baritone'], chunks=True),
+                        KeywordMatcher(['baritone'], chunks=True))
+    return Scanner(analyzer, NameRules(['xray', 'cheat']), NameRules(['hacks']), index=index, threads=2,
+                   processes=0, analyze_extensions=('.jar',), **kwargs)
+
+
+def write(path, data):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, 'wb') as file:
+        file.write(data)
+    return path
+
+
+def write_jar(path, members):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with zipfile.ZipFile(path, 'w') as jar:
+        for name, data in members.items():
+            jar.writestr(name, data)
+    return path
+
+
+def scan(scanner, root):
+    try:
+        return {os.path.relpath(finding.path, root).replace(os.sep, '/'): finding.verdict
+                for finding in scanner.scan(str(root))}
+    finally:
+        scanner.close()
+
+
+def test_names_content_and_jars(tmp_path):
+    write(str(tmp_path / 'mods' / 'xray.txt'), b'uses baritone here')
+    write(str(tmp_path / 'mods' / 'cheat.txt'), b'clean text')
+    write_jar(str(tmp_path / 'mods' / 'plain.jar'), {'a/KillAura.class': b'x'})
+    write_jar(str(tmp_path / 'mods' / 'clean.jar'), {'fabric.mod.json': b'{}'})
+    os.makedirs(tmp_path / 'hacks')
+    assert scan(make_scanner(), tmp_path) == {
+        'mods/xray.txt': 'baritone',
+        'mods/cheat.txt': None,
+        'mods/plain.jar': 'killaura',
+        'hacks': 'hacks',
+    }
+
+
+def test_index_reuses_verdicts(tmp_path):
+    root = tmp_path / 'root'
+    write(str(root / 'xray.txt'), b'baritone')
+    index = ScanIndex(str(tmp_path / 'index.sqlite3'), 'v1')
+    scanner = make_scanner(index)
+    assert scan(scanner, root) == {'xray.txt': 'baritone'}
+    assert scan(scanner, root) == {'xray.txt': 'baritone'}
+    assert scanner.metrics.summary()['counters'].get('index_hits') == 1
+    index.close()
+
+
+def test_failed_analysis_is_not_indexed(tmp_path):
+    root = tmp_path / 'root'
+    write(str(root / 'mods' / 'broken.jar'), b'PK\x03\x04 not a zip')
+    write(str(root / 'mods' / 'copy.jar'), b'PK\x03\x04 not a zip')
+    index = ScanIndex(str(tmp_path / 'index.sqlite3'), 'v1')
+    scanner = make_scanner(index)
+    assert scan(scanner, root) == {}
+    assert scanner.metrics.summary()['counters']['incomplete'] >= 1
+    for name in ('broken.jar', 'copy.jar'):
+        assert index.lookup(str(root / 'mods' / name), *stat_key(root / 'mods' / name)) is None
+    scan(scanner, root)
+    assert scanner.metrics.summary()['counters']['index_hits'] == 0
+    index.close()
+
+
+def test_exhausted_inflate_budget_is_incomplete(tmp_path):
+    path = write_jar(str(tmp_path / 'big.jar'), {'a.class': b'\0' * 4096 + b'baritone'})
+    analyzer = make_scanner().analyzer
+    analyzer.jar.max_inflate = 1024
+    analysis = analyzer.analyze_measured(path)
+    assert analysis.verdict is None and analysis.incomplete
+    analyzer.jar.max_inflate = 1 << 20
+    analysis = analyzer.analyze_measured(path)
+    assert analysis.verdict == 'baritone' and not analysis.incomplete
+
+
+def test_budget_charges_only_read_class_bytes(tmp_path):
+    members = {f"{name}.class": class_file(b'clean') + b'\0' * (256 * 1024) for name in 'abcd'}
+    path = write_jar(str(tmp_path / 'classes.jar'), members)
+    analyzer = make_scanner().analyzer
+    analyzer.jar.max_inflate = 512 * 1024
+    analysis = analyzer.analyze_measured(path)
+    assert analysis.verdict is None and not analysis.incomplete
+    assert analysis.inflated < 4 * 256 * 1024
+
+
+def test_index_prunes_missing_files(tmp_path):
+    root = tmp_path / 'root'
+    path = write(str(root / 'xray.txt'), b'baritone')
+    index = ScanIndex(str(tmp_path / 'index.sqlite3'), 'v1')
+    scanner = make_scanner(index)
+    scan(scanner, root)
+    os.remove(path)
+    assert scan(scanner, root) == {}
+    assert scanner.metrics.summary()['counters']['index_pruned'] == 1
+    index.close()
+
+
+def stat_key(path):
+    stat_result = os.stat(path)
+    return stat_result.st_size, stat_result.st_mtime_ns
+
+
+class CancelAfterFirstFolder(WalkProgress):
+    __slots__ = ('cancel',)
+
+    def add(self, count):
+        super().add(count)
+        self.cancel.set()
+
+
+def test_cancel_stops_walk_without_matches(tmp_path):
+    for number in range(20):
+        write(str(tmp_path / f"d{number}" / 'clean.txt'), b'data')
+    progress = CancelAfterFirstFolder()
+    progress.cancel = threading.Event()
+    scanner = make_scanner()
+    try:
+        assert list(scanner.scan(str(tmp_path), progress.cancel, progress)) == []
+    finally:
+        scanner.close()
+    assert progress.entries == 20
+
+
+def test_dedup_keeps_analysis_kinds_apart(tmp_path):
+    jar = write_jar(str(tmp_path / 'mods' / 'plain.jar'), {'a/KillAura.class': b'x'})
+    with open(jar, 'rb') as file:
+        write(str(tmp_path / 'mods' / 'xray.txt'), file.read())
+    assert scan(make_scanner(), tmp_path) == {'mods/plain.jar': 'killaura', 'mods/xray.txt': None}
+
+
+def test_metrics_count_hash_and_analysis_reads(tmp_path):
+    write(str(tmp_path / 'xray.txt'), b'clean' * 200)
+    scanner = make_scanner()
+    scan(scanner, tmp_path)
+    assert scanner.metrics.bytes_read == 2 * 1000
+
+
+def test_scan_changes_skips_policy_folders(tmp_path):
+    skipped = write(str(tmp_path / 'assets' / 'objects' / 'ab' / 'xray.txt'), b'data')
+    kept = write(str(tmp_path / 'mods' / 'xray.txt'), b'data')
+    scanner = make_scanner(policy=ScanPolicy(skip=['assets/objects'], recent_days=0))
+    try:
+        changes = [(str(tmp_path), skipped), (str(tmp_path), os.path.dirname(skipped)), (str(tmp_path), kept)]
+        assert [finding.path for finding in scanner.scan_changes(changes)] == [kept]
+    finally:
+        scanner.close()
+
+
+def test_findings_carry_content_digest(tmp_path):
+    path = write(str(tmp_path / 'mods' / 'xray.txt'), b'data')
+    index = ScanIndex(str(tmp_path / 'index.sqlite3'), 'v1')
+    for _ in range(2):
+        scanner = make_scanner(index=index)
+        try:
+            [finding] = scanner.scan(str(tmp_path / 'mods'))
+        finally:
+            scanner.close()
+        assert finding.digest == file_digest(path).hex()
+    assert scanner.metrics.counters['index_hits'] == 1
+    index.close()
@@ -0,0 +1,65 @@
+import pytest
+
+from filefinder.pipeline import Finding
+from filefinder.results import ResultModel
+from filefinder.walker import FILE, FOLDER
+
+
+def finding(path, keyword='xray', verdict=None, kind=FILE, hidden=False):
+    return Finding(path, kind, keyword, hidden, verdict, '/game')
+
+
+def paths(model):
+    return [record.path for record in model.rows(0, len(model))]
+
+
+def make_model():
+    model = ResultModel()
+    model.add([finding('/game/b.jar', verdict='baritone'), finding('/game/A.jar', hidden=True),
+               finding('/game/hacks', keyword='hack', kind=FOLDER)])
+    return model
+
+
+def test_sort_and_reverse_keep_records():
+    model = make_model()
+    records = list(model.records)
+    model.sort('path')
+    assert paths(model) == ['/game/A.jar', '/game/b.jar', '/game/hacks']
+    model.sort('rule', reverse=True)
+    assert paths(model) == ['/game/A.jar', '/game/hacks', '/game/b.jar']
+    model.sort('hidden')
+    assert model[0].path == '/game/A.jar'
+    model.sort(None, reverse=True)
+    assert paths(model) == ['/game/hacks', '/game/A.jar', '/game/b.jar']
+    assert model.records == records
+    with pytest.raises(ValueError):
+        model.sort('size')
+
+
+def test_new_records_merge_into_sorted_filtered_view():
+    model = make_model()
+    model.sort('path')
+    model.set_filter('jar')
+    assert paths(model) == ['/game/A.jar', '/game/b.jar']
+    assert model.add([finding('/game/0.jar'), finding('/game/cheats')]) == 1
+    assert paths(model) == ['/game/0.jar', '/game/A.jar', '/game/b.jar']
+    model.set_filter('', cheats_only=True)
+    assert paths(model) == ['/game/b.jar']
+    model.set_filter('BARITONE')
+    assert paths(model) == ['/game/b.jar']
+
+
+def test_remove_and_position():
+    model = make_model()
+    model.sort('path')
+    record = model.records[2]
+    assert model.position(record) == 2
+    assert model.remove(['/game/A.jar', '/game/missing']) == 1
+    assert paths(model) == ['/game/b.jar', '/game/hacks']
+    assert model.position(record) == 1
+    model.set_filter('jar')
+    assert model.position(record) is None
+    model.clear()
+    assert len(model) == 0
+    assert model.add([finding('/game/z.jar'), finding('/game/cheats'), finding('/game/c.jar')]) == 2
+    assert paths(model) == ['/game/c.jar', '/game/z.jar']
@@ -0,0 +1,45 @@
+import os
+
+import pytest
+
+from filefinder import roots
+from filefinder.roots import GameRoot, discover_roots, merge_roots
+
+
+def test_merge_roots_drops_missing_duplicate_and_nested(tmp_path):
+    game = tmp_path / '.minecraft'
+    (game / 'versions').mkdir(parents=True)
+    (tmp_path / 'prism' / 'instances').mkdir(parents=True)
+    merged = merge_roots([
+        (str(game / 'versions'), 'custom'),
+        (str(game), 'Minecraft'),
+        (str(game) + os.sep, 'TLauncher'),
+        (str(tmp_path / 'missing'), 'MultiMC'),
+        (str(tmp_path / 'prism' / 'instances'), 'Prism Launcher'),
+    ])
+    assert merged == [GameRoot(str(game), 'Minecraft'), GameRoot(str(tmp_path / 'prism' / 'instances'), 'Prism Launcher')]
+
+
+@pytest.mark.skipif(os.name == 'nt', reason="символические ссылки требуют прав администратора")
+def test_merge_roots_follows_symlinks(tmp_path):
+    (tmp_path / 'real').mkdir()
+    os.symlink(tmp_path / 'real', tmp_path / 'link')
+    assert len(merge_roots([(str(tmp_path / 'link'), 'custom'), (str(tmp_path / 'real'), 'Minecraft')])) == 1
+
+
+def test_discover_roots_puts_user_paths_first(tmp_path, monkeypatch):
+    (tmp_path / '.minecraft').mkdir()
+    (tmp_path / 'custom').mkdir()
+    monkeypatch.setattr(roots, 'candidate_roots', lambda: [(str(tmp_path / '.minecraft'), 'Minecraft'),
+                                                           (str(tmp_path / 'custom'), 'Minecraft')])
+    assert discover_roots([str(tmp_path / 'custom')]) == [GameRoot(str(tmp_path / 'custom'), 'custom'),
+                                                          GameRoot(str(tmp_path / '.minecraft'), 'Minecraft')]
+
+
+@pytest.mark.skipif(os.name == 'nt', reason="на Windows папка .minecraft берется из APPDATA")
+def test_candidate_roots_cover_home_launchers(tmp_path, monkeypatch):
+    monkeypatch.setenv('HOME', str(tmp_path))
+    monkeypatch.delenv('APPDATA', raising=False)
+    candidates = dict(roots.candidate_roots())
+    assert candidates[str(tmp_path / '.minecraft')] == 'Minecraft'
+    assert candidates[os.path.join(str(tmp_path), '.local', 'share', 'PrismLauncher', 'instances')] == 'Prism Launcher'
@@ -0,0 +1,63 @@
+import pytest
+
+from filefinder.rules import NameRules, _glob_literal, _regex_literal
+
+
+@pytest.mark.parametrize('rule, name, expected', [
+    ('xray', 'my-XRAY-mod.jar', True),
+    (r're:(?<![a-z])rage', 'rage.class', True),
+    (r're:(?<![a-z])rage', 'storage.class', False),
+    ('glob:wwe-*.jar', 'wwe-client.jar', True),
+    ('glob:wwe-*.jar', 'my-wwe-client.jar', False),
+    ('ext:.exe', 'Setup.EXE', True),
+    ('ext:tar.gz', 'pack.tar.gz', True),
+    ('ext:.gz', 'pack.tar', False),
+    (r're:\x61bcdef', 'abcdef', True),
+    ('re:(?i)ab', 'xAB', True),
+])
+def test_rule_types(rule, name, expected):
+    assert NameRules([rule]).search(name) == (rule if expected else None)
+
+
+def test_search_path_components():
+    rules = NameRules(['path:config/xray'])
+    assert rules.search_path('a/config/xray/b.txt') == 'path:config/xray'
+    assert rules.search_path('a/config/other/xray') is None
+
+
+def test_invalid_regex_is_value_error():
+    with pytest.raises(ValueError):
+        NameRules(['re:(unclosed'])
+
+
+def test_empty_path_rule_is_value_error():
+    with pytest.raises(ValueError):
+        NameRules(['path:/'])
+
+
+@pytest.mark.parametrize('source, literal', [
+    ('^wwe[-_ ]', 'wwe'),
+    ('foo.*barbaz', 'barbaz'),
+    ('ab?cdef', 'cdef'),
+    (r'kill\.aura', 'kill.aura'),
+    ('a|b', ''),
+    ('(?:xray)client', 'client'),
+    (r'\x61bcdef', 'bcdef'),
+    (r'ab\u0063defg', 'defg'),
+    (r'\N{LATIN SMALL LETTER A}bcde', 'bcde'),
+    (r'(a)\1xyz', 'xyz'),
+    (r'\d+client', 'client'),
+])
+def test_regex_literal(source, literal):
+    assert _regex_literal(source) == literal
+
+
+def test_glob_literal():
+    assert _glob_literal('wwe-*client?.jar') == 'client'
+
+
+def test_rules_that_cannot_be_joined():
+    rules = NameRules(['re:(?P<x>ab)', 're:(?P<x>cd)', 're:(?i)ef'])
+    assert rules.search('zcd') == 're:(?P<x>cd)'
+    assert rules.search('ef') == 're:(?i)ef'
+    assert rules.search('zz') is None
@@ -0,0 +1,77 @@
+import json
+
+import pytest
+
+from filefinder import signatures
+from filefinder.signatures import SignatureSet
+
+
+def test_cache_roundtrip_is_complete(tmp_path):
+    cache = str(tmp_path / 'signatures.cache')
+    built = SignatureSet.load_cached(cache)
+    cached = SignatureSet.load_cached(cache)
+    assert cached is not built and cached.version == built.version
+    assert 'content_matcher' in vars(cached) and 'jar_member_matcher' in vars(cached)
+    assert cached.jar_member_matcher.search_path('modules/RageBot.class') == built.jar_member_matcher.search_path(
+        'modules/RageBot.class')
+
+
+def test_cache_key_follows_code(monkeypatch):
+    key = signatures.source_key()
+    monkeypatch.setattr(signatures, 'analyzer_code_version', lambda: 'changed')
+    assert signatures.source_key() != key
+
+
+def write_db(tmp_path, name='signatures.json', **sections):
+    path = tmp_path / name
+    path.write_text(json.dumps(sections), encoding='utf-8')
+    return str(path)
+
+
+def test_json_database_extends_builtin(tmp_path):
+    path = write_db(tmp_path, format=1, version='2026.10', files=['glob:*.exe'], content=['SecretClient'],
+                    known_cheat=['ab' * 16])
+    loaded = SignatureSet.load([path])
+    assert loaded.release == '2026.10'
+    assert loaded.file_matcher.search('client.exe') == 'glob:*.exe'
+    assert loaded.file_matcher.search('xray.jar') == 'xray'
+    assert loaded.content_matcher.search_chunk(b'.. secretclient ..')[0] == 'secretclient'
+    assert bytes.fromhex('ab' * 16) in loaded.known_cheat
+
+
+def test_json_database_rejects_unknown_input(tmp_path):
+    with pytest.raises(ValueError):
+        SignatureSet.load([write_db(tmp_path, format=99)])
+    with pytest.raises(ValueError):
+        SignatureSet.load([write_db(tmp_path, cheats=['x'])])
+
+
+def test_versions_cover_every_section(tmp_path):
+    base = SignatureSet.load([write_db(tmp_path, content=['a'])])
+    renamed = SignatureSet.load([write_db(tmp_path, content=['a'], files=['b'])])
+    assert renamed.version != base.version
+    assert renamed.analysis_version == base.analysis_version
+    blacklisted = SignatureSet.load([write_db(tmp_path, content=['a'], blacklisted_folders=['b'])])
+    assert blacklisted.version != base.version
+    content = SignatureSet.load([write_db(tmp_path, content=['b'])])
+    assert content.analysis_version != base.analysis_version
+
+
+def test_cache_rebuilt_when_database_changes(tmp_path):
+    cache = str(tmp_path / 'signatures.cache')
+    path = write_db(tmp_path, version='1', content=['first'])
+    assert SignatureSet.load_cached(cache, [path]).release == '1'
+    path = write_db(tmp_path, version='2', content=['second'])
+    cached = SignatureSet.load_cached(cache, [path])
+    assert cached.release == '2'
+    assert cached.content_matcher.search_chunk(b'second')[0] == 'second'
+    assert cached.content_matcher.search_chunk(b'first')[0] is None
+
+
+def test_damaged_cache_is_rebuilt(tmp_path):
+    cache = tmp_path / 'signatures.cache'
+    SignatureSet.load_cached(str(cache))
+    data = cache.read_bytes()
+    cache.write_bytes(data[:len(data) // 2])
+    assert SignatureSet.load_cached(str(cache)).content_matcher.search_chunk(b'baritone')[0] == 'baritone'
+    assert cache.read_bytes() == data
@@ -0,0 +1,88 @@
+import os
+
+from filefinder.rules import NameRules
+from filefinder.walker import FILE, FOLDER, ScanPolicy, WalkProgress, match_path, scan_tree
+
+
+def make_tree(root, paths):
+    for path in paths:
+        full = os.path.join(root, *path.split('/'))
+        if path.endswith('/'):
+            os.makedirs(full, exist_ok=True)
+        else:
+            os.makedirs(os.path.dirname(full), exist_ok=True)
+            with open(full, 'wb') as file:
+                file.write(b'data')
+
+
+def found(root, files, folders, **kwargs):
+    return {(os.path.relpath(match.path, root).replace(os.sep, '/'), match.kind, match.keyword)
+            for match in scan_tree(str(root), NameRules(files), NameRules(folders), **kwargs)}
+
+
+def test_files_and_folders_by_name(tmp_path):
+    make_tree(tmp_path, ['mods/xray-mod.txt', 'mods/clean.txt', 'hacks/readme.txt', 'config/other.txt'])
+    assert found(tmp_path, ['xray'], ['hacks']) == {
+        ('mods/xray-mod.txt', FILE, 'xray'),
+        ('hacks', FOLDER, 'hacks'),
+    }
+
+
+def test_blacklisted_folder_pruned_with_subtree(tmp_path):
+    make_tree(tmp_path, ['grossjava9hacks/xray.txt', 'mods/xray.txt'])
+    result = found(tmp_path, ['xray'], [], blacklisted_folders=['GrossJava9Hacks'])
+    assert result == {('mods/xray.txt', FILE, 'xray')}
+
+
+def test_analyze_extensions_returned_without_keyword(tmp_path):
+    make_tree(tmp_path, ['mods/plain.jar', 'mods/plain.txt'])
+    assert found(tmp_path, [], [], analyze_extensions=('.jar',)) == {('mods/plain.jar', FILE, None)}
+
+
+def test_path_rules_count_from_root(tmp_path):
+    make_tree(tmp_path, ['config/xray/a.txt', 'other/config/xray/b.txt', 'xray/c.txt'])
+    result = found(tmp_path, [], ['path:config/xray'])
+    assert result == {('config/xray', FOLDER, 'path:config/xray'), ('other/config/xray', FOLDER, 'path:config/xray')}
+
+
+def test_policy_skip_and_order(tmp_path):
+    make_tree(tmp_path, ['assets/objects/xray1.txt', 'zzz/xray2.txt', 'mods/xray3.txt', 'saves/xray4.txt'])
+    policy = ScanPolicy(skip=['assets/objects'], recent_days=0)
+    matches = list(scan_tree(str(tmp_path), NameRules(['xray']), NameRules([]), policy=policy))
+    names = [os.path.basename(match.path) for match in matches]
+    assert names == ['xray3.txt', 'xray2.txt', 'xray4.txt']
+
+
+def test_progress_counts_entries(tmp_path):
+    make_tree(tmp_path, ['a/1.txt', 'a/2.txt', 'b/'])
+    progress = WalkProgress()
+    list(scan_tree(str(tmp_path), NameRules([]), NameRules([]), progress=progress))
+    assert progress.entries == 4
+
+
+def test_match_path_agrees_with_walk(tmp_path):
+    make_tree(tmp_path, ['config/xray/a.txt', 'mods/xray.txt', 'mods/clean.txt'])
+    files, folders = NameRules(['xray']), NameRules(['path:config/xray'])
+    walked = {match.path: match.keyword for match in scan_tree(str(tmp_path), files, folders)}
+    for path in [tmp_path / 'config' / 'xray', tmp_path / 'mods' / 'xray.txt', tmp_path / 'mods' / 'clean.txt']:
+        match = match_path(str(tmp_path), str(path), files, folders)
+        assert (match.keyword if match else None) == walked.get(str(path))
+
+
+def test_match_path_respects_policy_skip(tmp_path):
+    make_tree(tmp_path, ['assets/objects/ab/xray.txt', 'assets/xray.txt', 'assets/objects/cheat/'])
+    files, folders = NameRules(['xray']), NameRules(['objects', 'cheat'])
+    policy = ScanPolicy(skip=['assets/objects'], recent_days=0)
+    walked = {match.path for match in scan_tree(str(tmp_path), files, folders, policy=policy)}
+    assert walked == {str(tmp_path / 'assets' / 'xray.txt'), str(tmp_path / 'assets' / 'objects')}
+    for path in [tmp_path / 'assets' / 'objects' / 'ab' / 'xray.txt', tmp_path / 'assets' / 'objects' / 'cheat',
+                 tmp_path / 'assets' / 'xray.txt', tmp_path / 'assets' / 'objects']:
+        match = match_path(str(tmp_path), str(path), files, folders, policy=policy)
+        assert (match is not None) == (str(path) in walked)
+
+
+def test_stop_is_checked_per_directory(tmp_path):
+    make_tree(tmp_path, [f"d{number}/xray-{number}.txt" for number in range(5)])
+    progress = WalkProgress()
+    assert found(tmp_path, ['xray'], [], progress=progress, stop=lambda: progress.entries > 0) == set()
+    assert progress.entries == 5
@@ -0,0 +1,138 @@
+import os
+import sys
+import threading
+
+import pytest
+
+from filefinder.walker import ScanPolicy
+from filefinder.watch import Coalescer, InotifyWatcher, PollingWatcher, WatchSession
+from tests.test_matcher import class_file
+from tests.test_pipeline import make_scanner, write, write_jar
+
+
+class Clock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+class ListWatcher:
+    """Наблюдение, отдающее заранее заданные пачки путей."""
+
+    def __init__(self, batches):
+        self.batches = list(batches)
+        self.closed = False
+
+    def read(self, timeout):
+        return self.batches.pop(0) if self.batches else []
+
+    def close(self):
+        self.closed = True
+
+
+def test_coalescer_waits_for_quiet_but_not_past_max_delay():
+    clock = Clock()
+    coalescer = Coalescer(quiet=1.0, max_delay=3.0, clock=clock)
+    assert coalescer.timeout() is None
+    coalescer.add(['/game/mods/a.jar'])
+    clock.now = 0.5
+    coalescer.add(['/game/mods/a.jar', '/game/mods/b.jar'])
+    assert coalescer.timeout() == 1.0 and not coalescer.ready()
+    for step in (1.2, 2.0, 2.8):
+        clock.now = step
+        coalescer.add(['/game/mods/c.jar'])
+    clock.now = 3.0
+    assert coalescer.ready()
+    assert coalescer.take() == ['/game/mods/a.jar', '/game/mods/b.jar', '/game/mods/c.jar']
+    assert coalescer.timeout() is None and coalescer.events == 0
+
+
+def test_coalescer_folds_large_batches_to_folders_within_roots():
+    coalescer = Coalescer(roots=['/game'], max_paths=2, clock=Clock())
+    coalescer.add(['/game/mods', '/game/mods/a.jar'])
+    assert coalescer.take() == ['/game/mods']
+    coalescer.add([f"/game/{folder}/{number}.jar" for folder in ('mods', 'config', 'saves') for number in range(3)])
+    assert coalescer.take() == ['/game']
+
+
+def test_polling_watcher_reports_tracked_changes(tmp_path):
+    root = str(tmp_path)
+    tracked = write(os.path.join(root, 'mods', 'a.jar'), b'one')
+    untracked = write(os.path.join(root, 'logs', 'latest.log'), b'one')
+    write(os.path.join(root, 'hacks', 'x.jar'), b'one')
+    watcher = PollingWatcher([root], blacklisted_folders=['HACKS'], interval=0, track=lambda name: name.endswith('.jar'))
+    assert watcher.read(0) == []
+    write(tracked, b'longer content')
+    write(untracked, b'longer content')
+    write(os.path.join(root, 'hacks', 'y.jar'), b'one')
+    assert watcher.read(0) == [tracked]
+    new_dir = os.path.join(root, 'mods', 'nested')
+    os.makedirs(new_dir)
+    assert watcher.read(0) == [new_dir]
+    new_file = write(os.path.join(new_dir, 'b.jar'), b'one')
+    assert watcher.read(0) == [new_file]
+    watcher.close()
+
+
+@pytest.mark.skipif(not sys.platform.startswith('linux'), reason="inotify есть только в Linux")
+def test_inotify_watcher_follows_new_folders(tmp_path):
+    root = str(tmp_path)
+    os.makedirs(os.path.join(root, 'hacks'))
+    watcher = InotifyWatcher([root], blacklisted_folders=['hacks'])
+    try:
+        nested = os.path.join(root, 'mods')
+        os.makedirs(nested)
+        assert watcher.read(1.0) == [nested]
+        path = write(os.path.join(nested, 'a.jar'), b'data')
+        write(os.path.join(root, 'hacks', 'x.jar'), b'data')
+        assert set(watcher.read(1.0)) == {path}
+    finally:
+        watcher.close()
+
+
+def test_watchers_leave_skipped_folders_alone(tmp_path):
+    root = str(tmp_path)
+    skipped = os.path.join(root, 'assets', 'objects')
+    os.makedirs(os.path.join(skipped, 'ab'))
+    policy = ScanPolicy(skip=['assets/objects'], recent_days=0)
+    watchers = [PollingWatcher([root], interval=0, policy=policy)]
+    if sys.platform.startswith('linux'):
+        watchers.append(InotifyWatcher([root], policy=policy))
+    try:
+        for watcher in watchers:
+            watched = watcher._dirs if isinstance(watcher, PollingWatcher) else watcher._descriptors
+            assert set(watched) == {root, os.path.join(root, 'assets')}
+        write(os.path.join(skipped, 'ab', 'xray.jar'), b'data')
+        for watcher in watchers:
+            assert watcher.read(0.2) == []
+    finally:
+        for watcher in watchers:
+            watcher.close()
+
+
+def test_watch_session_reports_differences(tmp_path):
+    root = str(tmp_path)
+    write(os.path.join(root, 'mods', 'xray.txt'), b'name only')
+    jar = write_jar(os.path.join(root, 'mods', 'tool.jar'), {'a.class': class_file(b'plain')})
+    session = WatchSession(make_scanner(), [root], watcher=ListWatcher([]))
+    assert {os.path.basename(finding.path) for finding in session.start()} == {'xray.txt'}
+
+    write_jar(jar, {'a.class': class_file(b'baritone')})
+    os.remove(os.path.join(root, 'mods', 'xray.txt'))
+    events = session.apply([jar, os.path.join(root, 'mods', 'xray.txt'), '/elsewhere/file.jar'])
+    assert sorted((event.action, os.path.basename(event.finding.path)) for event in events) == [
+        ('added', 'tool.jar'), ('removed', 'xray.txt')]
+
+    write_jar(jar, {'a.class': class_file(b'plain')})
+    cancel = threading.Event()
+    session.coalescer = Coalescer([root], quiet=0, clock=Clock())
+    session._watcher = ListWatcher([[jar]])
+    batches = session.watch(cancel)
+    [event] = next(batches)
+    assert (event.action, event.finding.path) == ('removed', jar)
+    cancel.set()
+    assert list(batches) == []
+    session.close()
+    assert session._watcher.closed